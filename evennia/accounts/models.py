@@ -148,6 +148,15 @@ class AccountDB(TypedObject, AbstractUser):
     def __repr__(self):
         return f"{self.name}(account#{self.dbid})"
 
+    def at_idmapper_evict(self):
+        """
+        Connected accounts are never evicted from the idmapper cache.
+
+        """
+        if self.db_is_connected:
+            return False
+        return super().at_idmapper_evict()
+
     # @property
     def __username_get(self):
         return self.username
@@ -30,9 +30,9 @@ command line. The processing of a command works as follows:
 import types
 from collections import defaultdict
 from copy import copy
-from itertools import chain
+from itertools import chain, count
 from traceback import format_exc
-from weakref import WeakValueDictionary
+from weakref import WeakValueDictionary, ref
 
 from django.conf import settings
 from django.utils.translation import gettext as _
@@ -45,11 +45,19 @@ from evennia.utils import logger, utils
 from evennia.utils.utils import string_suggestions
 
 _IN_GAME_ERRORS = settings.IN_GAME_ERRORS
+_CACHE_MERGED_CMDSETS = settings.COMMAND_CACHE_MERGED_CMDSETS
 
-__all__ = ("cmdhandler", "InterruptCommand")
+__all__ = ("cmdhandler", "InterruptCommand", "invalidate_cmdset_cache")
 _GA = object.__getattribute__
+_SA = object.__setattr__
 _CMDSET_MERGE_CACHE = WeakValueDictionary()
 
+# generation counters for the per-caller merged-cmdset cache. Every entity
+# contributing to a merge gets a new generation when its cmdsets, locks,
+# permissions or contents change, which invalidates all merges depending on it.
+_CMDSET_CACHE_COUNTER = count(1)
+_CMDSET_CACHE_EPOCH = 0
+
 # tracks recursive calls by each caller
 # to avoid infinite loops (commands calling themselves)
 _COMMAND_NESTING = defaultdict(lambda: 0)
@@ -279,7 +287,121 @@ class ErrorReported(Exception):
         self.raw_string = raw_string
 
 
-# Helper function
+# Helper functions
+
+
+def invalidate_cmdset_cache(obj=None):
+    """
+    Invalidate the cached cmdset-merges depending on an entity. This is called
+    automatically when cmdsets, locks, tags, permissions or contents change
+    (and when quelling), so it only needs to be called manually if a
+    `call`-lock depends on other state.
+
+    Args:
+        obj (Object, Account or Session, optional): The entity that changed. If
+            not given, all cached merges are invalidated.
+
+    """
+    global _CMDSET_CACHE_EPOCH
+    if obj is None:
+        _CMDSET_CACHE_EPOCH = next(_CMDSET_CACHE_COUNTER)
+        return
+    try:
+        _SA(obj, "_cmdset_cache_gen", next(_CMDSET_CACHE_COUNTER))
+    except (AttributeError, TypeError):
+        pass
+
+
+def _weakref(obj):
+    """
+    Get a weak reference to an entity, or None if there is no entity.
+
+    """
+    return None if obj is None else ref(obj)
+
+
+def _deref(wref):
+    """
+    Get the entity behind a weak reference, or None if it's gone.
+
+    """
+    return None if wref is None else wref()
+
+
+class _MergedCmdSetCache:
+    """
+    A merged cmdset cached on a caller, along with the entities the merge
+    depends on and their generation at the time of merging. The entities
+    are only weakly referenced, so the cache doesn't keep them in memory.
+
+    """
+
+    __slots__ = (
+        "epoch",
+        "callertype",
+        "session",
+        "account",
+        "obj",
+        "hook_objs",
+        "local_objs",
+        "gens",
+        "cmdset",
+    )
+
+    def __init__(self, callertype, session, account, obj, hook_objs, local_objs, cmdset):
+        self.epoch = _CMDSET_CACHE_EPOCH
+        self.callertype = callertype
+        self.session = _weakref(session)
+        self.account = _weakref(account)
+        self.obj = _weakref(obj)
+        self.hook_objs = tuple(ref(hook_obj) for hook_obj in hook_objs)
+        self.local_objs = tuple(ref(lobj) for lobj in local_objs)
+        self.gens = tuple(
+            getattr(dep, "_cmdset_cache_gen", 0) for dep in chain(hook_objs, local_objs)
+        )
+        self.cmdset = cmdset
+
+    def matches(self, callertype, session, account, obj):
+        """
+        Check if this cache was created for the given calling context.
+
+        """
+        return (
+            self.epoch == _CMDSET_CACHE_EPOCH
+            and self.callertype == callertype
+            and _deref(self.session) is session
+            and _deref(self.account) is account
+            and _deref(self.obj) is obj
+        )
+
+    def get_objs(self):
+        """
+        Get the entities the merge depends on.
+
+        Returns:
+            tuple or None: `(hook_objs, local_objs)`, or `None` if any of them
+                has since been removed from memory.
+
+        """
+        hook_objs = [wref() for wref in self.hook_objs]
+        local_objs = [wref() for wref in self.local_objs]
+        if None in hook_objs or None in local_objs:
+            return None
+        return hook_objs, local_objs
+
+    def is_current(self, hook_objs, local_objs):
+        """
+        Check that none of the entities the merge depends on has changed.
+
+        Args:
+            hook_objs (list): The entities gotten from `get_objs`.
+            local_objs (list): The local objects gotten from `get_objs`.
+
+        """
+        for dep, gen in zip(chain(hook_objs, local_objs), self.gens):
+            if getattr(dep, "_cmdset_cache_gen", 0) != gen:
+                return False
+        return True
 
 
 @inlineCallbacks
@@ -309,9 +431,34 @@ def get_and_merge_cmdsets(caller, session, account, obj, callertype, raw_string)
         Object's cmdset is merged last (and will thus take precedence
         over same-named and same-prio commands on Account and Session).
 
+        Unless `settings.COMMAND_CACHE_MERGED_CMDSETS` is unset, the merged
+        cmdset is cached on the caller and re-used until one of the entities
+        contributing to it changes (see `invalidate_cmdset_cache`).
+
     """
+    # entities contributing to this merge, for the merged-cmdset cache
+    hook_objs = []
+    local_objs = []
+    # the at_cmdset_get hooks called so far, so they are only called once each
+    hooked = set()
+    local_hooked = set()
+
     try:
 
+        def _call_local_hook(lobj):
+            """
+            Helper-method; call the at_cmdset_get hook on a local object.
+
+            """
+            if id(lobj) in local_hooked:
+                return
+            local_hooked.add(id(lobj))
+            try:
+                # call hook in case we need to do dynamic changing to cmdset
+                _GA(lobj, "at_cmdset_get")(caller=caller)
+            except Exception:
+                logger.log_trace()
+
         @inlineCallbacks
         def _get_local_obj_cmdsets(obj):
             """
@@ -332,12 +479,9 @@ def get_and_merge_cmdsets(caller, session, account, obj, callertype, raw_string)
                         location.contents_get(exclude=obj) + obj.contents_get() + [location]
                     )
                     local_objlist = [o for o in local_objlist if not o._is_deleted]
+                    local_objs.extend(local_objlist)
                     for lobj in local_objlist:
-                        try:
-                            # call hook in case we need to do dynamic changing to cmdset
-                            _GA(lobj, "at_cmdset_get")(caller=caller)
-                        except Exception:
-                            logger.log_trace()
+                        _call_local_hook(lobj)
                     # the call-type lock is checked here, it makes sure an account
                     # is not seeing e.g. the commands on a fellow account (which is why
                     # the no_superuser_bypass must be True)
@@ -372,8 +516,11 @@ def get_and_merge_cmdsets(caller, session, account, obj, callertype, raw_string)
             hooks safely. Returns the stack and the valid options.
 
             """
+            hook_objs.append(obj)
             try:
-                yield obj.at_cmdset_get()
+                if id(obj) not in hooked:
+                    hooked.add(id(obj))
+                    yield obj.at_cmdset_get()
             except Exception:
                 _msg_err(caller, _ERROR_CMDSETS)
                 raise ErrorReported(raw_string)
@@ -382,6 +529,24 @@ def get_and_merge_cmdsets(caller, session, account, obj, callertype, raw_string)
             except AttributeError:
                 returnValue(((None, None, None), []))
 
+        cache = (
+            _GA(caller, "__dict__").get("_merged_cmdset_cache") if _CACHE_MERGED_CMDSETS else None
+        )
+        if cache and cache.matches(callertype, session, account, obj):
+            cached_objs = cache.get_objs()
+            if cached_objs:
+                # the at_cmdset_get hooks may still change cmdsets on the fly (which
+                # invalidates the cache), so they must be called also for a cached
+                # merge. They are not called again if we need to re-merge below.
+                cached_hook_objs, cached_local_objs = cached_objs
+                for hook_obj in cached_hook_objs:
+                    yield _get_cmdsets(hook_obj)
+                for lobj in cached_local_objs:
+                    _call_local_hook(lobj)
+                if cache.is_current(cached_hook_objs, cached_local_objs):
+                    returnValue(cache.cmdset)
+                del hook_objs[:]
+
         local_obj_cmdsets = []
         if callertype == "session":
             # we are calling the command from the session level
@@ -477,6 +642,18 @@ def get_and_merge_cmdsets(caller, session, account, obj, callertype, raw_string)
             cmdset = None
         for cset in (cset for cset in local_obj_cmdsets if cset):
             cset.duplicates = cset.old_duplicates
+
+        if _CACHE_MERGED_CMDSETS:
+            if cmdset and not any(cset.key == "_CMDSET_ERROR" for cset in cmdsets):
+                cache = _MergedCmdSetCache(
+                    callertype, session, account, obj, hook_objs, local_objs, cmdset
+                )
+            else:
+                cache = None
+            try:
+                _SA(caller, "_merged_cmdset_cache", cache)
+            except (AttributeError, TypeError):
+                pass
         # important - this syncs the CmdSetHandler's .current field with the
         # true current cmdset!
         # TODO - removed because this causes cmdset overlaps across sessions/accounts
@@ -46,6 +46,34 @@ def create_match(cmdname, string, cmdobj, raw_cmdname):
     return (cmdname, args, cmdobj, cmdlen, mratio, raw_cmdname)
 
 
+def _get_candidates(search_string, cmdset, include_prefixes):
+    """
+    Get the commands in cmdset that could match the search string. This uses
+    the cmdset's key-index to avoid testing every command in the set.
+
+    Args:
+        search_string (str): Lower-case input string.
+        cmdset (CmdSet): The cmdset to pick Commands from.
+        include_prefixes (bool): If the index should include prefixes or not.
+
+    Returns:
+        candidates (iterable): Commands to match against, in cmdset order.
+
+    """
+    try:
+        lengths, keymap, unindexed = cmdset.get_match_index(include_prefixes=include_prefixes)
+    except AttributeError:
+        # not a CmdSet - check all commands
+        return cmdset
+    positions = set(unindexed)
+    maxlen = len(search_string)
+    for length in lengths:
+        if length <= maxlen:
+            positions.update(keymap.get(search_string[:length], ()))
+    commands = cmdset.commands
+    return [commands[pos] for pos in sorted(positions)]
+
+
 def build_matches(raw_string, cmdset, include_prefixes=False):
     """
     Build match tuples by matching raw_string against available commands.
@@ -67,7 +95,7 @@ def build_matches(raw_string, cmdset, include_prefixes=False):
         if not include_prefixes and len(raw_string) > 1:
             raw_string = raw_string.lstrip(_CMD_IGNORE_PREFIXES)
         search_string = raw_string.lower()
-        for cmd in cmdset:
+        for cmd in _get_candidates(search_string, cmdset, include_prefixes):
             cmdname, raw_cmdname = cmd.match(search_string, include_prefixes=include_prefixes)
             if cmdname:
                 matches.append(create_match(cmdname, raw_string, cmd, raw_cmdname))
@@ -26,6 +26,8 @@ Set theory.
     to affect the low-priority cmdset.  Ex: A1,A3 + B1,B2,B4,B5 = B2,B4,B5
 
 """
+from collections import defaultdict
+from operator import is_
 from weakref import WeakKeyDictionary
 
 from django.utils.translation import gettext as _
@@ -34,6 +36,8 @@ from evennia.utils.utils import inherits_from, is_iter
 
 __all__ = ("CmdSet",)
 
+_COMMAND_CLASS = None
+
 
 class _CmdSetMeta(type):
     """
@@ -219,6 +223,8 @@ class CmdSet(object, metaclass=_CmdSetMeta):
         # this is set only on merged sets, in cmdhandler.py, in order to
         # track, list and debug mergers correctly.
         self.merged_from = []
+        # lookup-index for the command parser, see get_match_index
+        self._match_index = None
 
         # initialize system
         self.at_cmdset_creation()
@@ -562,6 +568,7 @@ class CmdSet(object, metaclass=_CmdSetMeta):
             # extra run to make sure to avoid doublets
             commands = list(set(commands))
         self.commands = commands
+        self._match_index = None
 
     def remove(self, cmd):
         """
@@ -591,6 +598,7 @@ class CmdSet(object, metaclass=_CmdSetMeta):
                 pass
         else:
             self.commands = [oldcmd for oldcmd in self.commands if oldcmd != cmd]
+        self._match_index = None
 
     def get(self, cmd):
         """
@@ -644,6 +652,64 @@ class CmdSet(object, metaclass=_CmdSetMeta):
         """
         return self.system_commands
 
+    def get_match_index(self, include_prefixes=True):
+        """
+        Get an index of the commands in this cmdset, for quickly finding the
+        commands that could match an input string without having to test every
+        command. The index is built on first use and re-used until the
+        commands of the cmdset, or their keys/aliases (see `Command.set_key`
+        and `Command.set_aliases`), change.
+
+        Args:
+            include_prefixes (bool, optional): If unset, index the command
+                keys/aliases with `settings.CMD_IGNORE_PREFIXES` stripped.
+
+        Returns:
+            tuple: `(lengths, keymap, unindexed)`, where `keymap` maps each
+                key/alias to the positions of the commands having it in
+                `.commands`, `lengths` are all key/alias lengths in descending
+                order and `unindexed` are the positions of commands with a custom
+                `match` method (these must always be checked).
+
+        Notes:
+            A command can only match if one of its keys/aliases is a prefix of
+            the (lower-case) input, so looking up each prefix of the input with a
+            length in `lengths` gives all possible candidates.
+
+        """
+        global _COMMAND_CLASS
+        if not _COMMAND_CLASS:
+            from evennia.commands.command import Command as _COMMAND_CLASS
+
+        commands = self.commands
+        # each command gets new _keyaliases whenever its key/aliases change
+        keyaliases = [cmd._keyaliases for cmd in commands]
+        match_index = getattr(self, "_match_index", None)
+        if (
+            not match_index
+            or match_index[0] is not commands
+            or len(match_index[1]) != len(keyaliases)
+            or not all(map(is_, match_index[1], keyaliases))
+        ):
+            # (re)build the index if commands or their keys/aliases were changed
+            match_index = (commands, keyaliases, {})
+            self._match_index = match_index
+        index = match_index[2].get(include_prefixes)
+        if index is None:
+            keymap = defaultdict(list)
+            unindexed = []
+            for pos, cmd in enumerate(commands):
+                if type(cmd).match is not _COMMAND_CLASS.match:
+                    unindexed.append(pos)
+                    continue
+                keys = cmd._keyaliases if include_prefixes else cmd._noprefix_aliases
+                for key in keys:
+                    keymap[key].append(pos)
+            lengths = tuple(sorted(set(len(key) for key in keymap), reverse=True))
+            index = (lengths, dict(keymap), tuple(unindexed))
+            match_index[2][include_prefixes] = index
+        return index
+
     def make_unique(self, caller):
         """
         Remove duplicate command-keys (unsafe)
@@ -82,6 +82,7 @@ _CACHED_CMDSETS = {}
 _CMDSET_PATHS = utils.make_iter(settings.CMDSET_PATHS)
 _IN_GAME_ERRORS = settings.IN_GAME_ERRORS
 _CMDSET_FALLBACKS = settings.CMDSET_FALLBACKS
+_INVALIDATE_CMDSET_CACHE = None
 
 
 # Output strings
@@ -378,6 +379,12 @@ class CmdSetHandler(object):
             to the central `cmdhandler.get_and_merge_cmdsets()`!
 
         """
+        global _INVALIDATE_CMDSET_CACHE
+        if not _INVALIDATE_CMDSET_CACHE:
+            from evennia.commands.cmdhandler import (
+                invalidate_cmdset_cache as _INVALIDATE_CMDSET_CACHE,
+            )
+
         if init_mode:
             # reimport all persistent cmdsets
             storage = self.obj.cmdset_storage
@@ -423,6 +430,8 @@ class CmdSetHandler(object):
                 continue
             self.mergetype_stack.append(new_current.actual_mergetype)
         self.current = new_current
+        # make sure the cmdhandler re-merges cmdsets involving this object
+        _INVALIDATE_CMDSET_CACHE(self.obj)
 
     def add(self, cmdset, emit_to_obj=None, persistent=False, default_cmdset=False, **kwargs):
         """
@@ -22,6 +22,7 @@ import time
 from codecs import lookup as codecs_lookup
 
 from django.conf import settings
+from evennia.commands.cmdhandler import invalidate_cmdset_cache
 from evennia.server.sessionhandler import SESSIONS
 from evennia.utils import create, logger, search, utils
 
@@ -986,7 +987,10 @@ class CmdQuell(COMMAND_DEFAULT_CLASS):
                 # the lock caches (otherwise the superuser status change
                 # won't be visible until repuppet)
                 char.locks.reset()
+                invalidate_cmdset_cache(char)
         account.locks.reset()
+        # quelling changes the outcome of perm() call-locks
+        invalidate_cmdset_cache(account)
 
     def func(self):
         """Perform the command"""
@@ -55,6 +55,25 @@ class HelpCategory:
         return hash(id(self))
 
 
+class _ReadableKeys:
+    """
+    The keys and aliases of the commands a caller can read, for use with
+    `CmdHelp.strip_cmd_prefix`. Access is only checked for the commands
+    with a key or alias that is actually looked up.
+
+    """
+
+    def __init__(self, cmds, can_read):
+        self.cmds_by_key = defaultdict(list)
+        for cmd in cmds:
+            for key in cmd._keyaliases:
+                self.cmds_by_key[key].append(cmd)
+        self.can_read = can_read
+
+    def __contains__(self, key):
+        return any(self.can_read(cmd) for cmd in self.cmds_by_key.get(key, ()))
+
+
 class CmdHelp(COMMAND_DEFAULT_CLASS):
     """
     Get help.
@@ -391,9 +410,11 @@ class CmdHelp(COMMAND_DEFAULT_CLASS):
 
         Args:
             caller (Object or Account): The user of the Command.
-            mode (str): One of 'list' or 'query', where the first means we are collecting to view
-                the help index and the second because of wanting to search for a specific help
-                entry/cmd to read. This determines which access should be checked.
+            mode (str): One of 'list', 'query' or 'all', where the first means we are collecting
+                to view the help index and the second because of wanting to search for a specific
+                help entry/cmd to read. This determines which access should be checked. With 'all',
+                no access is checked (not even the 'cmd' lock); this is used for searching, where
+                access is only checked for the matches.
 
         Returns:
             tuple: A tuple of three dicts containing the different types of help entries
@@ -408,7 +429,10 @@ class CmdHelp(COMMAND_DEFAULT_CLASS):
         cmdset.make_unique(caller)
         # retrieve all available commands and database / file-help topics.
         # also check the 'cmd:' lock here
-        cmd_help_topics = [cmd for cmd in cmdset if cmd and cmd.access(caller, "cmd")]
+        if mode == "all":
+            cmd_help_topics = [cmd for cmd in cmdset if cmd]
+        else:
+            cmd_help_topics = [cmd for cmd in cmdset if cmd and cmd.access(caller, "cmd")]
         # get all file-based help entries, checking perms
         file_help_topics = {topic.key.lower().strip(): topic for topic in FILE_HELP_ENTRIES.all()}
         # get db-based help entries, checking perms
@@ -430,6 +454,11 @@ class CmdHelp(COMMAND_DEFAULT_CLASS):
                 for key, entry in file_help_topics.items()
                 if self.can_list_topic(entry, caller)
             }
+        elif mode == "all":
+            cmd_help_topics = {
+                cmd.auto_help_display_key if hasattr(cmd, "auto_help_display_key") else cmd.key: cmd
+                for cmd in cmd_help_topics
+            }
         else:
             # query - check the read lock on entries
             cmd_help_topics = {
@@ -450,7 +479,7 @@ class CmdHelp(COMMAND_DEFAULT_CLASS):
 
         return cmd_help_topics, db_help_topics, file_help_topics
 
-    def do_search(self, query, entries, search_fields=None):
+    def do_search(self, query, entries, search_fields=None, access_check=None):
         """
         Perform a help-query search, default using Lunr search engine.
 
@@ -459,6 +488,8 @@ class CmdHelp(COMMAND_DEFAULT_CLASS):
             entries (list): All possibilities. A mix of commands, HelpEntries and FileHelpEntries.
             search_fields (list): A list of dicts defining how Lunr will find the
                 search data on the elements. If not given, will use a default.
+            access_check (callable, optional): If given, called with each match
+                to check if it should be included. See `help_search_with_index`.
 
         Returns:
             tuple: A tuple (match, suggestions).
@@ -479,7 +510,11 @@ class CmdHelp(COMMAND_DEFAULT_CLASS):
             # return of this will either be a HelpCategory, a Command or a
             # HelpEntry/FileHelpEntry.
             matches, suggestions = help_search_with_index(
-                match_query, entries, suggestion_maxnum=self.suggestion_maxnum, fields=search_fields
+                match_query,
+                entries,
+                suggestion_maxnum=self.suggestion_maxnum,
+                fields=search_fields,
+                access_check=access_check,
             )
             if matches:
                 match = matches[0]
@@ -571,32 +606,49 @@ class CmdHelp(COMMAND_DEFAULT_CLASS):
 
             return
 
-        # search for a specific entry. We need to check for 'read' access here before
-        # building the set of possibilities.
-        cmd_help_topics, db_help_topics, file_help_topics = self.collect_topics(
-            caller, mode="query"
-        )
+        # search for a specific entry. The search index is built from all possibilities
+        # (so it can be reused by everyone with the same commands) and 'read' access is
+        # only checked for the matches.
+        cmd_help_topics, db_help_topics, file_help_topics = self.collect_topics(caller, mode="all")
 
-        # get a collection of all keys + aliases to be able to strip prefixes like @
-        key_and_aliases = set(chain(*(cmd._keyaliases for cmd in cmd_help_topics.values())))
+        readable = {}
 
-        # db-help topics takes priority over file-help
-        file_db_help_topics = {**file_help_topics, **db_help_topics}
+        def _can_read(topic):
+            """Check (and remember) if caller may read topic"""
+            key = id(topic)
+            if key not in readable:
+                if isinstance(topic, HelpCategory):
+                    readable[key] = any(
+                        _can_read(cat_topic) for cat_topic in topics_by_category[topic.key]
+                    )
+                elif inherits_from(topic, "evennia.commands.command.Command"):
+                    readable[key] = topic.access(caller, "cmd") and self.can_read_topic(
+                        topic, caller
+                    )
+                else:
+                    readable[key] = self.can_read_topic(topic, caller)
+            return readable[key]
 
-        # commands take priority over the other types
-        all_topics = {**file_db_help_topics, **cmd_help_topics}
+        # get a collection of all keys + aliases to be able to strip prefixes like @
+        key_and_aliases = _ReadableKeys(cmd_help_topics.values(), _can_read)
 
-        # get all categories
-        all_categories = list(
-            set(HelpCategory(topic.help_category) for topic in all_topics.values())
+        # commands take priority over db-help topics, which take priority over
+        # file-help (the last entry with a given key is the one searched).
+        all_topics = list(
+            chain(file_help_topics.values(), db_help_topics.values(), cmd_help_topics.values())
         )
 
-        # all available help options - will be searched in order. We also check # the
-        # read-permission here.
-        entries = list(all_topics.values()) + all_categories
+        # get all categories
+        topics_by_category = defaultdict(list)
+        for topic in all_topics:
+            topics_by_category[topic.help_category].append(topic)
+        all_categories = [HelpCategory(category) for category in topics_by_category]
+
+        # all available help options - will be searched in order.
+        entries = all_topics + all_categories
 
         # lunr search fields/boosts
-        match, suggestions = self.do_search(query, entries)
+        match, suggestions = self.do_search(query, entries, access_check=_can_read)
 
         if not match:
             # no topic matches found. Only give suggestions.
@@ -617,6 +669,7 @@ class CmdHelp(COMMAND_DEFAULT_CLASS):
                         entries,
                         suggestion_maxnum=self.suggestion_maxnum,
                         fields=search_fields,
+                        access_check=_can_read,
                     )
                     if suggestions:
                         help_text += (
@@ -643,13 +696,17 @@ class CmdHelp(COMMAND_DEFAULT_CLASS):
             category = match.key
             category_lower = category.lower()
             cmds_in_category = [
-                key for key, cmd in cmd_help_topics.items() if category_lower == cmd.help_category
-            ]
-            topics_in_category = [
                 key
-                for key, topic in file_db_help_topics.items()
-                if category_lower == topic.help_category
+                for key, cmd in cmd_help_topics.items()
+                if category_lower == cmd.help_category and _can_read(cmd)
             ]
+            # db-help topics takes priority over file-help
+            file_db_help_topics = {
+                key: topic
+                for key, topic in chain(file_help_topics.items(), db_help_topics.items())
+                if category_lower == topic.help_category and _can_read(topic)
+            }
+            topics_in_category = list(file_db_help_topics)
             output = self.format_help_index(
                 {category: cmds_in_category},
                 {category: topics_in_category},
@@ -19,7 +19,7 @@ from django.conf import settings
 from evennia.accounts.models import AccountDB
 from evennia.scripts.taskhandler import TaskHandlerTask
 from evennia.server.sessionhandler import SESSIONS
-from evennia.utils import gametime, logger, search, utils
+from evennia.utils import ansi, gametime, logger, search, utils
 from evennia.utils.eveditor import EvEditor
 from evennia.utils.evmenu import ask_yes_no
 from evennia.utils.evtable import EvTable
@@ -761,6 +761,10 @@ class CmdServerLoad(COMMAND_DEFAULT_CLASS):
     non-persistent storage schemes. The total amount of cached objects
     are displayed plus a breakdown of database object types.
 
+    The |wANSI parse cache|n holds strings already converted from Evennia
+    color markup, for every combination of client capabilities. Note that
+    this shows the cache of the Server process; the Portal keeps its own.
+
     The |wflushmem|n switch allows to flush the object cache. Please
     note that due to how Python's memory management works, releasing
     caches may not show you a lower Residual/Virtual memory footprint,
@@ -900,6 +904,21 @@ class CmdServerLoad(COMMAND_DEFAULT_CLASS):
 
         string += "\n|w Entity idmapper cache:|n %i items\n%s" % (total_num, memtable)
 
+        # ansi parse-cache statistics
+        ansistats = ansi.parse_cache_stats()
+        nlookups = ansistats["hits"] + ansistats["misses"]
+        string += (
+            "\n|w ANSI parse cache:|n %i/%i items, %i hits (%.2f%%), %i misses, %i evictions"
+            % (
+                ansistats["size"],
+                ansistats["max_size"],
+                ansistats["hits"],
+                ansistats["hits"] / nlookups * 100 if nlookups else 0,
+                ansistats["misses"],
+                ansistats["evictions"],
+            )
+        )
+
         # return to caller
         self.caller.msg(string)
 
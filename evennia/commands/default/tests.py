@@ -194,6 +194,33 @@ class TestHelp(BaseEvenniaCommandTest):
         )
         self.call(help_module.CmdHelp(), "testhelp", "Help for testhelp", cmdset=CharacterCmdSet())
 
+    def test_help_read_lock(self):
+        create.create_help_entry("secret", "Secret text", category="General", locks="read:false()")
+        self.call(
+            help_module.CmdHelp(),
+            "secret",
+            "No help found\n\nThere is no help topic matching 'secret'.",
+            cmdset=CharacterCmdSet(),
+        )
+        # a db entry is found if a command with the same key can't be read
+        create.create_help_entry("look", "Look entry text", category="General")
+        with patch.object(general.CmdLook, "auto_help", False):
+            self.call(
+                help_module.CmdHelp(),
+                "look",
+                "Help for look\n\nLook entry text",
+                cmdset=CharacterCmdSet(),
+            )
+
+    def test_help_access_checks(self):
+        cmdset = CharacterCmdSet()
+        with patch.object(
+            help_module.CmdHelp, "can_read_topic", autospec=True, return_value=True
+        ) as mock_can_read:
+            self.call(help_module.CmdHelp(), "look", "Help for look", cmdset=cmdset)
+        # read-access is only checked for the matches, not for every command
+        self.assertLess(mock_can_read.call_count, len(cmdset.commands) // 4)
+
     @parameterized.expand(
         [
             (
@@ -991,6 +991,7 @@ class TestOptionTransferReplace(TestCase):
 import sys
 
 from evennia.commands import cmdhandler
+from twisted.internet.defer import inlineCallbacks
 from twisted.trial.unittest import TestCase as TwistedTestCase
 
 
@@ -1093,6 +1094,77 @@ class TestGetAndMergeCmdSets(TwistedTestCase, BaseEvenniaTest):
         deferred.addCallback(_callback)
         return deferred
 
+    @inlineCallbacks
+    def test_merge_cache(self):
+        self.set_cmdsets(self.obj1, self.cmdset_c)
+        cmdset1 = yield cmdhandler.get_and_merge_cmdsets(
+            self.obj1, None, None, self.obj1, "object", ""
+        )
+        cmdset2 = yield cmdhandler.get_and_merge_cmdsets(
+            self.obj1, None, None, self.obj1, "object", ""
+        )
+        # unchanged state re-uses the cached merge
+        self.assertIs(cmdset1, cmdset2)
+        self.assertFalse(cmdset1.get("d"))
+
+        # changing the caller's cmdsets invalidates the cache
+        self.obj1.cmdset.add(self.cmdset_a)
+        cmdset3 = yield cmdhandler.get_and_merge_cmdsets(
+            self.obj1, None, None, self.obj1, "object", ""
+        )
+        self.assertTrue(cmdset3.get("d"))
+        self.obj1.cmdset.remove("A")
+        cmdset4 = yield cmdhandler.get_and_merge_cmdsets(
+            self.obj1, None, None, self.obj1, "object", ""
+        )
+        self.assertFalse(cmdset4.get("d"))
+
+        # an object with a cmdset entering the room invalidates the cache
+        self.obj2.location = None
+        self.set_cmdsets(self.obj2, self.cmdset_d)
+        cmdset5 = yield cmdhandler.get_and_merge_cmdsets(
+            self.obj1, None, None, self.obj1, "object", ""
+        )
+        self.assertFalse(cmdset5.get("d"))
+        self.obj2.location = self.room1
+        cmdset6 = yield cmdhandler.get_and_merge_cmdsets(
+            self.obj1, None, None, self.obj1, "object", ""
+        )
+        self.assertTrue(cmdset6.get("d"))
+
+        # locking the object's cmdset away invalidates the cache
+        self.obj2.locks.add("call:false()")
+        cmdset7 = yield cmdhandler.get_and_merge_cmdsets(
+            self.obj1, None, None, self.obj1, "object", ""
+        )
+        self.assertFalse(cmdset7.get("d"))
+
+        # tagging the caller invalidates the cache
+        self.obj2.locks.add("call:tag(vip)")
+        cmdset8 = yield cmdhandler.get_and_merge_cmdsets(
+            self.obj1, None, None, self.obj1, "object", ""
+        )
+        self.assertFalse(cmdset8.get("d"))
+        self.obj1.tags.add("vip")
+        cmdset9 = yield cmdhandler.get_and_merge_cmdsets(
+            self.obj1, None, None, self.obj1, "object", ""
+        )
+        self.assertTrue(cmdset9.get("d"))
+
+    @inlineCallbacks
+    def test_merge_cache_hooks(self):
+        self.set_cmdsets(self.obj1, self.cmdset_c)
+        self.set_cmdsets(self.obj2, self.cmdset_d)
+        hook_calls = []
+        self.patch(self.obj2, "at_cmdset_get", lambda **kwargs: hook_calls.append(kwargs))
+        yield cmdhandler.get_and_merge_cmdsets(self.obj1, None, None, self.obj1, "object", "")
+        yield cmdhandler.get_and_merge_cmdsets(self.obj1, None, None, self.obj1, "object", "")
+        self.assertEqual(len(hook_calls), 2)
+        # re-merging after a change doesn't call the hooks again
+        self.obj1.cmdset.add(self.cmdset_a)
+        yield cmdhandler.get_and_merge_cmdsets(self.obj1, None, None, self.obj1, "object", "")
+        self.assertEqual(len(hook_calls), 3)
+
     def test_command_replace_different_aliases(self):
         cmdset_ee = _CmdSetEe_Ef()
         self.assertEqual(len(cmdset_ee.commands), 1)
@@ -1190,6 +1262,86 @@ class TestCmdParser(TestCase):
         )
 
 
+class _CmdSetLarge(CmdSet):
+    key = "large_cmdset"
+
+    def at_cmdset_creation(self):
+        for num in range(500):
+            self.add(
+                type(
+                    f"_CmdLarge{num}",
+                    (AccessableCommand,),
+                    {"key": f"cmd{num}", "aliases": [f"@alias{num}", f"multi word {num}"]},
+                )
+            )
+        self.add(_CmdTest1)
+
+
+class TestCmdParserLargeCmdSet(TestCase):
+    """
+    Test the indexed command-matching against a large cmdset.
+
+    """
+
+    def _linear_matches(self, raw_string, cmdset, include_prefixes=False):
+        "The original, non-indexed version of build_matches, for comparison"
+        matches = []
+        if not include_prefixes and len(raw_string) > 1:
+            raw_string = raw_string.lstrip(cmdparser._CMD_IGNORE_PREFIXES)
+        search_string = raw_string.lower()
+        for cmd in cmdset:
+            cmdname, raw_cmdname = cmd.match(search_string, include_prefixes=include_prefixes)
+            if cmdname:
+                matches.append(cmdparser.create_match(cmdname, raw_string, cmd, raw_cmdname))
+        return matches
+
+    def test_build_matches(self):
+        cmdset = _CmdSetLarge()
+        for raw_string in (
+            "cmd1",
+            "cmd12 with args",
+            "@alias499 foo",
+            "alias7",
+            "multi word 42 and more",
+            "multi word",
+            "test1hello",
+            "nomatch here",
+            "",
+        ):
+            for include_prefixes in (True, False):
+                self.assertEqual(
+                    cmdparser.build_matches(raw_string, cmdset, include_prefixes=include_prefixes),
+                    self._linear_matches(raw_string, cmdset, include_prefixes=include_prefixes),
+                )
+
+    def test_index_updates(self):
+        cmdset = _CmdSetLarge()
+        self.assertTrue(cmdparser.build_matches("cmd3", cmdset))
+        cmdset.remove("cmd3")
+        self.assertFalse(cmdparser.build_matches("cmd3", cmdset))
+        cmdset.add(_CmdTest4)
+        self.assertTrue(cmdparser.build_matches("test2", cmdset))
+        # changing the key/aliases of a command in the set updates the index
+        cmd = cmdset.get("cmd4")
+        cmd.set_key("renamed")
+        self.assertFalse(cmdparser.build_matches("cmd4", cmdset))
+        self.assertTrue(cmdparser.build_matches("renamed", cmdset))
+        cmd.set_aliases(["newalias"])
+        self.assertTrue(cmdparser.build_matches("newalias", cmdset))
+        # replacing a command in place updates the index
+        cmdset.commands[cmdset.commands.index(cmd)] = _CmdTest1()
+        self.assertFalse(cmdparser.build_matches("renamed", cmdset))
+
+    def test_candidates(self):
+        cmdset = _CmdSetLarge()
+        # only commands whose key/alias starts the input are matched against
+        candidates = cmdparser._get_candidates("cmd250 foo", cmdset, True)
+        self.assertEqual(sorted(cmd.key for cmd in candidates), ["cmd2", "cmd25", "cmd250"])
+        candidates = cmdparser._get_candidates("multi word 7", cmdset, True)
+        self.assertEqual([cmd.key for cmd in candidates], ["cmd7"])
+        self.assertFalse(cmdparser._get_candidates("nomatch", cmdset, True))
+
+
 class TestCmdSetNesting(BaseEvenniaTest):
     """
     Test 'nesting' of cmdsets by adding
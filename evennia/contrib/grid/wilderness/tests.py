@@ -163,3 +163,44 @@ class TestWilderness(BaseEvenniaTest):
         self.assertEqual(2, len(w.db.rooms))
         # and verify that obj1 is still at 1,1
         self.assertEqual(self.obj1.location, w.db.rooms[(1, 1)])
+
+    def test_get_objs_at_coordinates(self):
+        self.char1.sessions.add(1)
+        self.char2.sessions.add(1)
+        wilderness.create_wilderness()
+        w = self.get_wilderness_script()
+        wilderness.enter_wilderness(self.char1, coordinates=(1, 1))
+        wilderness.enter_wilderness(self.char2, coordinates=(1, 1))
+        self.assertEqual([self.char1, self.char2], w.get_objs_at_coordinates((1, 1)))
+
+        w.move_obj(self.char1, (2, 1))
+        self.assertEqual([self.char2], w.get_objs_at_coordinates((1, 1)))
+        self.assertEqual([self.char1], w.get_objs_at_coordinates((2, 1)))
+
+        # leaving the wilderness removes the object from the index
+        self.char2.move_to(self.room1, quiet=True)
+        self.assertEqual([], w.get_objs_at_coordinates((1, 1)))
+        self.assertNotIn((1, 1), w.ndb.coordinate_index)
+
+        # the index is rebuilt from itemcoordinates when needed
+        w.ndb.coordinate_index = None
+        self.assertEqual([self.char1], w.get_objs_at_coordinates((2, 1)))
+
+    def test_get_objs_in_range(self):
+        wilderness.create_wilderness()
+        w = self.get_wilderness_script()
+        wilderness.enter_wilderness(self.char1, coordinates=(5, 5))
+        wilderness.enter_wilderness(self.char2, coordinates=(7, 4))
+        wilderness.enter_wilderness(self.obj1, coordinates=(5, 5))
+
+        self.assertEqual({(5, 5): [self.char1, self.obj1]}, w.get_objs_in_range((5, 5), 1))
+        self.assertEqual(
+            {(5, 5): [self.char1, self.obj1], (7, 4): [self.char2]},
+            w.get_objs_in_range((5, 5), 2),
+        )
+        self.assertEqual({}, w.get_objs_in_range((0, 0), 3))
+        # large ranges scan the occupied coordinates instead of every tile
+        self.assertEqual(
+            {(5, 5): [self.char1, self.obj1], (7, 4): [self.char2]},
+            w.get_objs_in_range((0, 0), 1000),
+        )
@@ -253,13 +253,16 @@ class WildernessScript(DefaultScript):
         for coordinates, room in self.db.rooms.items():
             room.ndb.wildernessscript = self
             room.ndb.active_coordinates = coordinates
-        for item in self.db.itemcoordinates.keys():
+        itemcoordinates = self.db.itemcoordinates
+        for item in list(itemcoordinates.keys()):
             # Items deleted while in the wilderness can leave None-type 'ghosts'
             # These need to be cleaned up
             if item is None:
-                del self.db.itemcoordinates[item]
+                del itemcoordinates[item]
                 continue
             item.ndb.wilderness = self
+        # the coordinate index is rebuilt from itemcoordinates when next needed
+        self.ndb.coordinate_index = None
 
     def is_valid_coordinates(self, coordinates):
         """
@@ -288,26 +291,103 @@ class WildernessScript(DefaultScript):
         """
         return self.itemcoordinates[obj]
 
+    def _get_coordinate_index(self):
+        """
+        Get the index of which objects are at which coordinates. This is not
+        stored in the database but built from `itemcoordinates` the first
+        time it's needed.
+
+        Returns:
+            dict: `{(x, y): {Object: True, ...}}`, only for occupied
+                coordinates. A dict is used rather than a set to keep the
+                order objects arrived in.
+        """
+        index = self.ndb.coordinate_index
+        if index is None:
+            index = {}
+            for item, coordinates in self.itemcoordinates.items():
+                if item is not None:
+                    index.setdefault(coordinates, {})[item] = True
+            self.ndb.coordinate_index = index
+        return index
+
+    def _set_obj_coordinates(self, obj, coordinates):
+        """
+        Store the coordinates of obj, keeping the coordinate index in sync.
+        Use `move_obj` to actually move obj around in the wilderness.
+
+        Args:
+            obj (object): an object inside the wilderness
+            coordinates (tuple or None): tuple of (x, y), or None to remove
+                obj from the wilderness.
+
+        Returns:
+            tuple or None: the previous coordinates of obj, if any.
+        """
+        index = self._get_coordinate_index()
+        if coordinates is None:
+            old_coordinates = self.itemcoordinates.pop(obj, None)
+        else:
+            old_coordinates = self.itemcoordinates.get(obj)
+            if old_coordinates != coordinates:
+                self.itemcoordinates[obj] = coordinates
+
+        if old_coordinates != coordinates:
+            if old_coordinates is not None and (items := index.get(old_coordinates)):
+                items.pop(obj, None)
+                if not items:
+                    del index[old_coordinates]
+            if coordinates is not None:
+                index.setdefault(coordinates, {})[obj] = True
+        return old_coordinates
+
     def get_objs_at_coordinates(self, coordinates):
         """
         Returns a list of every object at certain coordinates.
 
-        Imeplementation detail: this uses a naive iteration through every
-        object inside the wilderness which could cause slow downs when there
-        are a lot of objects in the map.
-
         Args:
             coordinates (tuple): a coordinate tuple like (x, y)
 
         Returns:
             [Object, ]: list of Objects at coordinates
         """
-        result = [
-            item
-            for item, item_coords in self.itemcoordinates.items()
-            if item_coords == coordinates and item is not None
-        ]
-        return list(result)
+        return list(self._get_coordinate_index().get(coordinates, ()))
+
+    def get_objs_in_range(self, coordinates, distance):
+        """
+        Returns every object within a certain number of tiles of some
+        coordinates. Diagonal steps count as one tile, same as when moving
+        around the map, so this is a square around `coordinates`.
+
+        Args:
+            coordinates (tuple): a coordinate tuple like (x, y)
+            distance (int): how many tiles away from `coordinates` to look.
+
+        Returns:
+            dict: `{(x, y): [Object, ...]}` for every occupied coordinate
+                within range.
+        """
+        index = self._get_coordinate_index()
+        x, y = coordinates
+        width = 2 * distance + 1
+        if width * width < len(index):
+            # the area is small compared to the number of occupied tiles;
+            # look up each of its tiles
+            occupied = (
+                (tile, index.get(tile))
+                for tile in (
+                    (ix, iy)
+                    for ix in range(x - distance, x + distance + 1)
+                    for iy in range(y - distance, y + distance + 1)
+                )
+            )
+        else:
+            occupied = (
+                (tile, items)
+                for tile, items in index.items()
+                if abs(tile[0] - x) <= distance and abs(tile[1] - y) <= distance
+            )
+        return {tile: list(items) for tile, items in occupied if items}
 
     def move_obj(self, obj, new_coordinates):
         """
@@ -318,7 +398,7 @@ class WildernessScript(DefaultScript):
             new_coordinates (tuple): tuple of (x, y) where to move obj to.
         """
         # Update the position of this obj in the wilderness
-        self.itemcoordinates[obj] = new_coordinates
+        self._set_obj_coordinates(obj, new_coordinates)
         old_room = obj.location
 
         # Remove the obj's location. This is needed so that the object does not
@@ -479,7 +559,7 @@ class WildernessScript(DefaultScript):
             obj (object): the object that left
         """
         # Try removing the object from the coordinates system
-        if loc := self.db.itemcoordinates.pop(obj, None):
+        if loc := self._set_obj_coordinates(obj, None):
             # The object was removed successfully
             # Make sure there was a room at that location
             if room := self.db.rooms.get(loc):
@@ -551,7 +631,7 @@ class WildernessRoom(DefaultRoom):
             self.wilderness.move_obj(moved_obj, coordinates)
         else:
             # This object wasn't in the wilderness yet. Let's add it.
-            itemcoords[moved_obj] = self.coordinates
+            self.wilderness._set_obj_coordinates(moved_obj, self.coordinates)
 
     def at_object_leave(self, moved_obj, target_location, move_type="move", **kwargs):
         """
@@ -1259,6 +1259,7 @@ class TestMapStressTest(TestCase):
         [
             ((10, 10), 10**-3),
             ((20, 20), 10**-3),
+            ((100, 100), 10**-2),
         ]
     )
     def test_grid_pathfind(self, gridsize, max_time):
@@ -1330,6 +1331,57 @@ class TestMapStressTest(TestCase):
         #           f"slower than expected {max_time}s.")
 
 
+class TestPathfinder(TestCase):
+    """
+    Test the building, baking and caching of the pathfinding data.
+
+    """
+
+    def setUp(self):
+        self.map = xymap.XYMap({"map": MAP2}, Z="testpathfinder")
+        self.map.parse()
+
+    def test_route_cache(self):
+        self.map.max_cached_routes = 2
+        inode1, inode2, inode3 = (
+            self.map.get_node_from_coord(xy).node_index for xy in ((0, 1), (0, 3), (4, 0))
+        )
+        self.assertEqual(self.map.get_shortest_path((0, 1), (1, 0))[0], ["e", "s"])
+        self.map.get_shortest_path((0, 1), (3, 5))
+        self.map.get_shortest_path((0, 3), (3, 5))
+        self.assertEqual(list(self.map.pathfinding_routes), [inode1, inode2])
+
+        with mock.patch("evennia.contrib.grid.xyzgrid.xymap.dijkstra") as mock_dijkstra:
+            self.map.get_shortest_path((0, 1), (4, 0))
+            mock_dijkstra.assert_not_called()
+        self.assertEqual(list(self.map.pathfinding_routes), [inode2, inode1])
+
+        self.map.get_shortest_path((4, 0), (0, 1))
+        self.assertEqual(list(self.map.pathfinding_routes), [inode1, inode3])
+
+    def test_baked_graph(self):
+        self.map.calculate_path_matrix(force=True)
+        graph = self.map.pathfinding_graph
+
+        # load the baked graph without building it from the nodes
+        mapobj = xymap.XYMap({"map": MAP2}, Z="testpathfinder")
+        mapobj.parse()
+        for node in mapobj.node_index_map.values():
+            node.weights = {}
+        mapobj.calculate_path_matrix()
+        self.assertEqual((mapobj.pathfinding_graph != graph).nnz, 0)
+        self.assertEqual(
+            mapobj.get_shortest_path((0, 1), (3, 5))[0],
+            self.map.get_shortest_path((0, 1), (3, 5))[0],
+        )
+
+        # a changed map is not loaded from the baked graph
+        mapobj = xymap.XYMap({"map": MAP1}, Z="testpathfinder")
+        mapobj.parse()
+        mapobj.calculate_path_matrix()
+        self.assertEqual(mapobj.pathfinding_graph.shape, (4, 4))
+
+
 class TestXYZGrid(BaseEvenniaTest):
     """
     Test base grid class with a single map, including spawning objects.
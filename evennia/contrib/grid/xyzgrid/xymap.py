@@ -92,14 +92,14 @@ See `./example.py` for a full grid example.
 
 ----
 """
-import pickle
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from os import mkdir
 from os.path import isdir, isfile
 from os.path import join as pathjoin
+from zlib import crc32
 
 try:
-    from scipy import zeros
+    import numpy
     from scipy.sparse import csr_matrix
     from scipy.sparse.csgraph import dijkstra
 except ImportError as err:
@@ -175,6 +175,8 @@ class XYMap:
     """
     mapcorner_symbol = "+"
     max_pathfinding_length = 500
+    # how many route-trees (shortest routes from a given node) to keep cached
+    max_cached_routes = 100
     empty_symbol = " "
     # we normally only accept one single character for the legend key
     legend_key_exceptions = "\\"
@@ -242,14 +244,16 @@ class XYMap:
 
         # Dijkstra algorithm variables
         self.node_index_map = None
-        self.dist_matrix = None
-        self.pathfinding_routes = None
+        # sparse matrix of link weights between nodes
+        self.pathfinding_graph = None
+        # LRU cache of route-trees {start_node_index: predecessors}
+        self.pathfinding_routes = OrderedDict()
 
         self.pathfinder_baked_filename = None
         if Z:
             if not isdir(_CACHE_DIR):
                 mkdir(_CACHE_DIR)
-            self.pathfinder_baked_filename = pathjoin(_CACHE_DIR, f"{Z}.P")
+            self.pathfinder_baked_filename = pathjoin(_CACHE_DIR, f"{Z}.npy")
 
         # load data and parse it
         self.reload()
@@ -497,6 +501,8 @@ class XYMap:
         self.xygrid = xygrid
         self.XYgrid = XYgrid
         self.node_index_map = node_index_map
+        self.pathfinding_graph = None
+        self.pathfinding_routes = OrderedDict()
         self.symbol_map = symbol_map
 
         # build all links
@@ -598,56 +604,98 @@ class XYMap:
 
     def calculate_path_matrix(self, force=False):
         """
-        Solve the pathfinding problem using Dijkstra's algorithm. This will try to
-        load the solution from disk if possible.
+        Build the sparse graph of links between nodes used for pathfinding. This
+        will try to load the graph from disk if possible. Routes are not solved
+        until they are needed, see `get_shortest_path`.
 
         Args:
             force (bool, optional): If the cache should always be rebuilt.
 
+        Notes:
+            The baked graph is stored as a table of links, the first row being
+            `(nnodes, nlinks, checksum)` and each following row `(start, end, weight)`.
+            The file is memory-mapped when loading.
+
         """
+        nnodes = len(self.node_index_map)
+        checksum = crc32(self.mapstring.encode("utf-8"))
+        pathfinding_graph = None
+
         if not force and self.pathfinder_baked_filename and isfile(self.pathfinder_baked_filename):
-            # check if the solution for this grid was already solved previously.
+            # check if the graph for this grid was already built previously.
+            try:
+                links = numpy.load(self.pathfinder_baked_filename, mmap_mode="r")
+                if tuple(links[0]) == (nnodes, len(links) - 1, checksum):
+                    # this is important - it means the map hasn't changed so
+                    # we can re-use the stored data!
+                    pathfinding_graph = csr_matrix(
+                        (links[1:, 2], (links[1:, 0].astype(int), links[1:, 1].astype(int))),
+                        shape=(nnodes, nnodes),
+                    )
+            except Exception:
+                logger.log_trace()
+
+        if pathfinding_graph is None:
+            # build the graph straight from the links of each node
+            links = [(nnodes, 0, checksum)]
+            for inode, node in self.node_index_map.items():
+                links.extend(
+                    (inode, jnode, weight) for jnode, weight in node.weights.items() if weight
+                )
+            links = numpy.array(links, dtype=float)
+            links[0, 1] = len(links) - 1
+            pathfinding_graph = csr_matrix(
+                (links[1:, 2], (links[1:, 0].astype(int), links[1:, 1].astype(int))),
+                shape=(nnodes, nnodes),
+            )
 
-            mapstr, dist_matrix, pathfinding_routes = "", None, None
-            with open(self.pathfinder_baked_filename, "rb") as fil:
+            if self.pathfinder_baked_filename:
+                # try to cache the results
                 try:
-                    mapstr, dist_matrix, pathfinding_routes = pickle.load(fil)
-                except Exception:
+                    with open(self.pathfinder_baked_filename, "wb") as fil:
+                        numpy.save(fil, links)
+                except OSError:
                     logger.log_trace()
-            if (
-                mapstr == self.mapstring
-                and dist_matrix is not None
-                and pathfinding_routes is not None
-            ):
-                # this is important - it means the map hasn't changed so
-                # we can re-use the stored data!
-                self.dist_matrix = dist_matrix
-                self.pathfinding_routes = pathfinding_routes
-
-        # build a matrix representing the map graph, with 0s as impassable areas
 
-        nnodes = len(self.node_index_map)
-        pathfinding_graph = zeros((nnodes, nnodes))
-        for inode, node in self.node_index_map.items():
-            pathfinding_graph[inode, :] = node.linkweights(nnodes)
+        self.pathfinding_graph = pathfinding_graph
+        self.pathfinding_routes = OrderedDict()
+
+    def _get_routes_from(self, inode):
+        """
+        Get the shortest routes from a given node to all other nodes, using Dijkstra's
+        algorithm. Recently used results are cached.
 
-        # create a sparse matrix to represent link relationships from each node
-        pathfinding_matrix = csr_matrix(pathfinding_graph)
+        Args:
+            inode (int): The node-index of the start node.
 
-        # solve using Dijkstra's algorithm
-        self.dist_matrix, self.pathfinding_routes = dijkstra(
-            pathfinding_matrix,
+        Returns:
+            ndarray: For each node-index, the index of the previous node along the
+                shortest route from the start node. This is -9999 for the start node itself
+                and for nodes that can't be reached within `max_pathfinding_length`.
+
+        """
+        pathfinding_routes = self.pathfinding_routes
+        routes = pathfinding_routes.get(inode)
+        if routes is not None:
+            # mark as recently used
+            pathfinding_routes.move_to_end(inode)
+            return routes
+
+        if self.pathfinding_graph is None:
+            self.calculate_path_matrix()
+            pathfinding_routes = self.pathfinding_routes
+
+        _, routes = dijkstra(
+            self.pathfinding_graph,
             directed=True,
+            indices=inode,
             return_predecessors=True,
             limit=self.max_pathfinding_length,
         )
-
-        if self.pathfinder_baked_filename:
-            # try to cache the results
-            with open(self.pathfinder_baked_filename, "wb") as fil:
-                pickle.dump(
-                    (self.mapstring, self.dist_matrix, self.pathfinding_routes), fil, protocol=4
-                )
+        pathfinding_routes[inode] = routes
+        if len(pathfinding_routes) > self.max_cached_routes:
+            pathfinding_routes.popitem(last=False)
+        return routes
 
     def spawn_nodes(self, xy=("*", "*")):
         """
@@ -796,20 +844,17 @@ class XYMap:
                 f"{endnode}. They must both be MapNodes (not Links)"
             )
 
-        if self.pathfinding_routes is None:
-            self.calculate_path_matrix()
-
-        pathfinding_routes = self.pathfinding_routes
+        routes = self._get_routes_from(istartnode)
         node_index_map = self.node_index_map
 
         path = [endnode]
         directions = []
 
-        while pathfinding_routes[istartnode, inextnode] != -9999:
+        while routes[inextnode] != -9999:
             # the -9999 is set by algorithm for unreachable nodes or if trying
             # to go a node we are already at (the start node in this case since
             # we are working backwards).
-            inextnode = pathfinding_routes[istartnode, inextnode]
+            inextnode = int(routes[inextnode])
             nextnode = node_index_map[inextnode]
             shortest_route_to = nextnode.shortest_route_to_node[path[-1].node_index]
 
@@ -149,8 +149,10 @@ Extra Installation Instructions:
 
 """
 import re
+from bisect import bisect_left
 from collections import defaultdict
-from string import punctuation
+from itertools import islice
+from string import Formatter, punctuation
 
 import inflect
 from django.conf import settings
@@ -219,6 +221,13 @@ _RE_REF_LANG = re.compile(r"\{+\##([0-9]+)\}+")
 # this regex returns in groups (langname, say), where langname can be empty.
 _RE_LANGUAGE = re.compile(r"(?:\((\w+)\))*(\".+?\")")
 
+# the words of a sdesc/recog that a /ref can match (split the same way as \b does)
+_RE_WORD = re.compile(r"\w+", _RE_FLAGS)
+# splits the emote after a /ref into words, preserving punctuation
+_RE_WORD_SPLIT = re.compile(r"(\W)", _RE_FLAGS)
+
+_FORMATTER = Formatter()
+
 
 # the emote parser works in two steps:
 #  1) convert the incoming emote into an intermediary
@@ -243,6 +252,110 @@ class LanguageError(Exception):
     pass
 
 
+def _get_words(text):
+    """
+    Split a sdesc, recog or key into the words a /ref can match.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        tuple: A tuple `((word, index), ...)` with every word lower-cased and the
+            index where it starts in `text`.
+
+    """
+    return tuple((match.group().lower(), match.start()) for match in _RE_WORD.finditer(text))
+
+
+def _match_words(words, query):
+    """
+    Match a /ref against the words of a sdesc or recog. Every word of the /ref must be
+    the start of a word in the sdesc, in the same order, so `/tall man` matches
+    'a tall, old man'.
+
+    Args:
+        words (tuple): The words to match against, from `_get_words`.
+        query (list): The lower-case words of the /ref.
+
+    Returns:
+        tuple: A tuple `(nmatched, index)` where `nmatched` is how many words of
+            `query` (counted from the start) matched and `index` is where the match
+            starts in the sdesc/recog.
+
+    """
+    nmatched = 0
+    index = 0
+    nquery = len(query)
+    for word, windex in words:
+        if word.startswith(query[nmatched]):
+            if not nmatched:
+                index = windex
+            nmatched += 1
+            if nmatched == nquery:
+                break
+    return nmatched, index
+
+
+class _WordIndex:
+    """
+    Index of the words of all candidates of an emote, used for finding
+    the candidates matching each /ref.
+
+    """
+
+    def __init__(self, candidate_map):
+        """
+        Args:
+            candidate_map (list): A list of tuples `(obj, text, words)` where text is the
+                sdesc, recog or key referring to obj and words are its words as returned
+                from `_get_words`.
+
+        """
+        self.candidate_map = candidate_map
+        # {word: [icandidate, ...]}
+        self.index = defaultdict(list)
+        for icand, (_, _, words) in enumerate(candidate_map):
+            for word, _ in words:
+                self.index[word].append(icand)
+        self.words = sorted(self.index)
+
+    def match(self, query):
+        """
+        Find the candidates matching the most words of a /ref.
+
+        Args:
+            query (list): The lower-case words following the /ref marker.
+
+        Returns:
+            tuple: A tuple `(nmatched, matches)` where `nmatched` is the most words of
+                `query` any candidate matched and `matches` is a list of tuples
+                `(obj, text)` for all candidates matching that many words. The text
+                is the matched part of the candidate's sdesc/recog.
+
+        """
+        if not query:
+            return 0, []
+        # candidates must have a word starting with the first word of the /ref
+        first = query[0]
+        icands = set()
+        for word in islice(self.words, bisect_left(self.words, first), None):
+            if not word.startswith(first):
+                break
+            icands.update(self.index[word])
+
+        nbest = 0
+        matches = []
+        for icand in sorted(icands):
+            obj, text, words = self.candidate_map[icand]
+            nmatched, index = _match_words(words, query)
+            if nmatched > nbest:
+                nbest = nmatched
+                matches = []
+            if nmatched == nbest:
+                matches.append((obj, text[index:]))
+        return nbest, matches
+
+
 def _get_case_ref(string):
     """
     Helper function which parses capitalization and
@@ -378,14 +491,15 @@ def parse_sdescs_and_recogs(
         # check if sender has any recogs for obj and add
         if hasattr(sender, "recog"):
             if recog := sender.recog.get(obj):
-                candidate_map.append((obj, recog))
+                candidate_map.append((obj, recog, sender.recog.get_words(obj)))
         # check if obj has an sdesc and add
         if hasattr(obj, "sdesc"):
-            candidate_map.append((obj, obj.sdesc.get()))
+            candidate_map.append((obj, obj.sdesc.get(), obj.sdesc.get_words()))
         # if no sdesc, include key plus aliases instead
         else:
-            candidate_map.append((obj, obj.key))
-        candidate_map.extend([(obj, alias) for alias in obj.aliases.all()])
+            candidate_map.append((obj, obj.key, _get_words(obj.key)))
+        candidate_map.extend([(obj, alias, _get_words(alias)) for alias in obj.aliases.all()])
+    word_index = None
 
     # escape mapping syntax on the form {#id} if it exists already in emote,
     # if so it is replaced with just "id".
@@ -429,40 +543,23 @@ def parse_sdescs_and_recogs(
                 ]
             )
             matches = (
-                (re.search(rquery, text, _RE_FLAGS), obj, text) for obj, text in candidate_map
+                (re.search(rquery, text, _RE_FLAGS), obj, text) for obj, text, _ in candidate_map
             )
             # filter out any non-matching candidates
             bestmatches = [(obj, match.group()) for match, obj, text in matches if match]
 
         else:
-            # to find the longest match, we start from the marker and lengthen the
-            # match query one word at a time.
-            word_list = []
-            bestmatches = []
+            # find the candidates matching the most words after the marker, in one
+            # pass over the candidates sharing the first word.
+            if word_index is None:
+                word_index = _WordIndex(candidate_map)
             # preserve punctuation when splitting
-            tail = re.split("(\W)", tail)
-            iend = 0
-            for i, item in enumerate(tail):
-                # don't add non-word characters to the search query
-                if not item.isalpha():
-                    continue
-                word_list.append(item)
-                rquery = "".join([r"\b(" + re.escape(word) + r").*" for word in word_list])
-                # match candidates against the current set of words
-                matches = (
-                    (re.search(rquery, text, _RE_FLAGS), obj, text) for obj, text in candidate_map
-                )
-                matches = [(obj, match.group()) for match, obj, text in matches if match]
-                if len(matches) == 0:
-                    # no matches at this length, keep previous iteration as best
-                    break
-                # since this is the longest match so far, set latest match set as best matches
-                bestmatches = matches
-                # save current index as end point of matched text
-                iend = i
-
-            # save search string
-            matched_text = "".join(tail[1:iend])
+            tail = _RE_WORD_SPLIT.split(tail)
+            # don't add non-word characters to the search query
+            iwords = [i for i, item in enumerate(tail) if item.isalpha()]
+            nwords, bestmatches = word_index.match([tail[i].lower() for i in iwords])
+            # save index of the end point of the matched text
+            iend = iwords[nwords - 1] if nwords else 0
             # recombine remainder of emote back into a string
             tail = "".join(tail[iend + 1 :])
 
@@ -588,9 +685,6 @@ def send_emote(sender, receivers, emote, msg_type="pose", anonymous_add="first",
 
     skey = f"#{sender.id}"
 
-    # we escape the object mappings since we'll do the language ones first
-    # (the text could have nested object mappings).
-    emote = _RE_REF.sub(r"{{#\1}}", emote)
     # if anonymous_add is passed as a kwarg, collect and remove it from kwargs
     if "anonymous_add" in kwargs:
         anonymous_add = kwargs.pop("anonymous_add")
@@ -606,9 +700,13 @@ def send_emote(sender, receivers, emote, msg_type="pose", anonymous_add="first",
         else:
             # add it to the end
             femote = "{emote} [{key}]"
-        emote = femote.format(key="{{" + skey + "}}", emote=emote)
+        emote = femote.format(key="{" + skey + "}", emote=emote)
         obj_mapping[skey] = sender
 
+    # split the emote into text and {#dbref}/{##num} markers once, so it doesn't
+    # have to be re-parsed for every receiver.
+    emote_parts = [(text, key) for text, key, _, _ in _FORMATTER.parse(emote)]
+
     # broadcast emote to everyone
     for receiver in receivers:
         # first handle the language mapping, which always produce different keys ##nn
@@ -621,9 +719,6 @@ def send_emote(sender, receivers, emote, msg_type="pose", anonymous_add="first",
             receiver_lang_mapping = {
                 key: saytext for key, (langname, saytext) in language_mapping.items()
             }
-        # map the language {##num} markers. This will convert the escaped sdesc markers on
-        # the form {{#num}} to {#num} markers ready to sdesc-map in the next step.
-        sendemote = emote.format_map(receiver_lang_mapping)
 
         # map the ref keys to sdescs
         receiver_sdesc_mapping = dict(
@@ -634,9 +729,20 @@ def send_emote(sender, receivers, emote, msg_type="pose", anonymous_add="first",
             for ref, obj in obj_mapping.items()
         )
 
-        # do the template replacement of the sdesc/recog {#num} markers
+        # replace the sdesc/recog {#num} and language {##num} markers. The says can
+        # themselves contain {#num} markers.
+        sendemote = []
+        for text, key in emote_parts:
+            sendemote.append(text)
+            if key is None:
+                continue
+            if key in receiver_lang_mapping:
+                sendemote.append(receiver_lang_mapping[key].format_map(receiver_sdesc_mapping))
+            else:
+                sendemote.append(receiver_sdesc_mapping[key])
+
         receiver.msg(
-            text=(sendemote.format_map(receiver_sdesc_mapping), {"type": msg_type}),
+            text=("".join(sendemote), {"type": msg_type}),
             from_obj=sender,
             **kwargs,
         )
@@ -671,6 +777,7 @@ class SdescHandler:
         """
         self.obj = obj
         self.sdesc = ""
+        self.words = ()
         self._cache()
 
     def _cache(self):
@@ -678,6 +785,7 @@ class SdescHandler:
         Cache data from storage
         """
         self.sdesc = self.obj.attributes.get("_sdesc", default=self.obj.key)
+        self.words = _get_words(self.sdesc or "")
 
     def add(self, sdesc, max_length=60):
         """
@@ -722,6 +830,7 @@ class SdescHandler:
         self.obj.attributes.add("_sdesc", sdesc)
         # local caching
         self.sdesc = sdesc
+        self.words = _get_words(sdesc)
 
         return sdesc
 
@@ -731,6 +840,7 @@ class SdescHandler:
 
         """
         self.obj.attributes.remove("_sdesc")
+        self._cache()
 
     def get(self):
         """
@@ -740,6 +850,16 @@ class SdescHandler:
         """
         return self.sdesc or self.obj.key
 
+    def get_words(self):
+        """
+        Get the words of the sdesc, for matching /refs in emotes.
+
+        Returns:
+            tuple: The words, as `((word, index), ...)`.
+
+        """
+        return self.words if self.sdesc else _get_words(self.obj.key)
+
 
 class RecogHandler:
     """
@@ -766,6 +886,7 @@ class RecogHandler:
         # mappings
         self.ref2recog = {}
         self.obj2recog = {}
+        self.obj2words = {}
         self._cache()
 
     def _cache(self):
@@ -775,6 +896,7 @@ class RecogHandler:
         self.ref2recog = self.obj.attributes.get("_recog_ref2recog", default={})
         obj2recog = self.obj.attributes.get("_recog_obj2recog", default={})
         self.obj2recog = dict((obj, recog) for obj, recog in obj2recog.items() if obj)
+        self.obj2words = {obj: _get_words(recog) for obj, recog in self.obj2recog.items()}
 
     def add(self, obj, recog, max_length=60):
         """
@@ -828,6 +950,7 @@ class RecogHandler:
         # local caching
         self.ref2recog[key] = recog
         self.obj2recog[obj] = recog
+        self.obj2words[obj] = _get_words(recog)
         return recog
 
     def get(self, obj):
@@ -854,6 +977,20 @@ class RecogHandler:
             # recog_mask lock not passed, disable recog
             return None
 
+    def get_words(self, obj):
+        """
+        Get the words of the recog for an object, for matching /refs in emotes.
+        This does not check the "enable_recog" lock, use `get` for that.
+
+        Args:
+            obj (Object): The object recognized.
+
+        Returns:
+            tuple: The words, as `((word, index), ...)`. Empty if there is no recog.
+
+        """
+        return self.obj2words.get(obj, ())
+
     def all(self):
         """
         Get a mapping of the recogs stored in handler.
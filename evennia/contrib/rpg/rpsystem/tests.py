@@ -207,6 +207,34 @@ class TestRPSystem(BaseEvenniaTest):
             result,
         )
 
+    def test_parse_after_sdesc_and_recog_changes(self):
+        speaker = self.speaker
+        speaker.sdesc.add(sdesc0)
+        self.receiver1.sdesc.add(sdesc1)
+        self.receiver2.sdesc.add(sdesc2)
+        candidates = (self.receiver1, self.receiver2)
+        id1 = f"#{self.receiver1.id}"
+        id2 = f"#{self.receiver2.id}"
+
+        self.assertEqual(
+            rpsystem.parse_sdescs_and_recogs(speaker, candidates, "/nice sdesc grins."),
+            ("{" + id2 + "v} grins.", {id2 + "v": self.receiver2}),
+        )
+        with self.assertRaises(rpsystem.EmoteError):
+            rpsystem.parse_sdescs_and_recogs(speaker, candidates, "/nobody grins.")
+
+        self.receiver2.sdesc.add("A tall man")
+        speaker.recog.add(self.receiver1, "Bob Smith")
+        self.assertEqual(
+            rpsystem.parse_sdescs_and_recogs(speaker, candidates, "/Bob nods to /tall man."),
+            (
+                "{" + id1 + "t} nods to {" + id2 + "v}.",
+                {id1 + "t": self.receiver1, id2 + "v": self.receiver2},
+            ),
+        )
+        with self.assertRaises(rpsystem.EmoteError):
+            rpsystem.parse_sdescs_and_recogs(speaker, candidates, "/colliding grins.")
+
     def test_get_sdesc(self):
         looker = self.speaker  # Sender
         target = self.receiver1  # Receiver1
@@ -255,6 +283,19 @@ class TestRPSystem(BaseEvenniaTest):
             'receiver of emotes.|n and |mReceiver2|n. She says |w"This is a test."|n',
         )
 
+    def test_send_emote_brackets(self):
+        speaker = self.speaker
+        receivers = [speaker, self.receiver1]
+        speaker.sdesc.add(sdesc0)
+        self.receiver1.sdesc.add(sdesc1)
+        self.receiver1.msg = lambda text, **kwargs: setattr(self, "out1", text)
+        rpsystem.send_emote(speaker, receivers, '/me draws {a circle} and says "{hi} /first".')
+        self.assertEqual(
+            self.out1[0],
+            "|ba nice sender of emotes|n draws {a circle} and says "
+            '|w"{hi} |mReceiver1|n"|n.',
+        )
+
     def test_send_emote_fallback(self):
         speaker = self.speaker
         receiver1 = self.receiver1
@@ -83,6 +83,60 @@ class TestParseSubtopics(TestCase):
         self.assertEqual(expected, actual_result)
 
 
+class TestHelpSearchIndex(TestCase):
+    """
+    Test searching with cached search indexes.
+
+    """
+
+    def setUp(self):
+        super().setUp()
+        help_utils.clear_search_index_cache()
+        self.entries = [
+            filehelp.FileHelpEntry("evennia", ["ev"], "general", "Evennia text", ""),
+            filehelp.FileHelpEntry("building", [], "building", "Building text", ""),
+        ]
+
+    def tearDown(self):
+        super().tearDown()
+        help_utils.clear_search_index_cache()
+
+    def test_index_cache(self):
+        with mock.patch(
+            "evennia.help.utils._build_search_index", wraps=help_utils._build_search_index
+        ) as mock_build:
+            matches, suggestions = help_utils.help_search_with_index("evennia", self.entries)
+            self.assertEqual([self.entries[0]], matches)
+            self.assertEqual(["evennia"], suggestions)
+            matches, _ = help_utils.help_search_with_index("building", list(self.entries))
+            self.assertEqual([self.entries[1]], matches)
+            self.assertEqual(1, mock_build.call_count)
+
+            # changing an entry means a new index
+            self.entries[1].aliases = ["build"]
+            matches, _ = help_utils.help_search_with_index("build", self.entries)
+            self.assertEqual([self.entries[1]], matches)
+            self.assertEqual(2, mock_build.call_count)
+
+    def test_access_check(self):
+        hidden = filehelp.FileHelpEntry("building", [], "building", "Hidden text", "")
+        entries = self.entries + [hidden]
+
+        # the last entry with a key is the one found ...
+        matches, _ = help_utils.help_search_with_index("building", entries)
+        self.assertEqual([hidden], matches)
+        # ... unless it fails the access check
+        matches, suggestions = help_utils.help_search_with_index(
+            "building", entries, access_check=lambda entry: entry is not hidden
+        )
+        self.assertEqual([self.entries[1]], matches)
+        self.assertEqual(["building"], suggestions)
+        matches, suggestions = help_utils.help_search_with_index(
+            "building", entries, access_check=lambda entry: False
+        )
+        self.assertEqual(([], []), (matches, suggestions))
+
+
 # test filehelp system
 
 HELP_ENTRY_DICTS = [
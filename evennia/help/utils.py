@@ -6,6 +6,7 @@ This is used primarily by the default `help` command.
 
 """
 import re
+from collections import OrderedDict
 
 from django.conf import settings
 
@@ -28,6 +29,11 @@ _LUNR_EXCEPTION = None
 _LUNR_GET_BUILDER = None
 _LUNR_BUILDER_PIPELINE = None
 
+# built search indexes, keyed on the fields and documents they were built from.
+# This is an LRU cache holding at most _SEARCH_INDEX_CACHE_SIZE indexes.
+_SEARCH_INDEX_CACHE = OrderedDict()
+_SEARCH_INDEX_CACHE_SIZE = 20
+
 _RE_HELP_SUBTOPICS_START = re.compile(r"^\s*?#\s*?subtopics\s*?$", re.I + re.M)
 _RE_HELP_SUBTOPIC_SPLIT = re.compile(r"^\s*?(\#{2,6}\s*?\w+?[a-z0-9 \-\?!,\.]*?)$", re.M + re.I)
 _RE_HELP_SUBTOPIC_PARSE = re.compile(r"^(?P<nesting>\#{2,6})\s*?(?P<name>.*?)$", re.I + re.M)
@@ -35,7 +41,102 @@ _RE_HELP_SUBTOPIC_PARSE = re.compile(r"^(?P<nesting>\#{2,6})\s*?(?P<name>.*?)$",
 MAX_SUBTOPIC_NESTING = 5
 
 
-def help_search_with_index(query, candidate_entries, suggestion_maxnum=5, fields=None):
+def _load_lunr():
+    """
+    Delay-load lunr and set up the index-builder pipeline.
+
+    """
+    global _LUNR, _LUNR_EXCEPTION, _LUNR_BUILDER_PIPELINE, _LUNR_GET_BUILDER
+    # we have to delay-load lunr because it messes with logging if it's imported
+    # before twisted's logging has been set up
+    from lunr import get_default_builder as _LUNR_GET_BUILDER
+    from lunr import lunr as _LUNR
+    from lunr import stop_word_filter
+    from lunr.exceptions import QueryParseError as _LUNR_EXCEPTION
+    from lunr.stemmer import stemmer
+
+    # from lunr.trimmer import trimmer
+    # pre-create a lunr index-builder pipeline where we've removed some of
+    # the stop-words from the default in lunr.
+
+    stop_words = stop_word_filter.WORDS
+
+    for ignore_word in _LUNR_STOP_WORD_FILTER_EXCEPTIONS:
+        try:
+            stop_words.remove(ignore_word)
+        except ValueError:
+            pass
+
+    custom_stop_words_filter = stop_word_filter.generate_stop_word_filter(stop_words)
+    # _LUNR_BUILDER_PIPELINE = (trimmer, custom_stop_words_filter, stemmer)
+    _LUNR_BUILDER_PIPELINE = (custom_stop_words_filter, stemmer)
+
+
+def _build_search_index(documents, fields):
+    """
+    Build a Lunr search index.
+
+    Args:
+        documents (list): The dicts to index, each with a "key" used as reference.
+        fields (list): Lunr field mappings.
+
+    Returns:
+        lunr.Index: The search index.
+
+    """
+    builder = _LUNR_GET_BUILDER()
+    builder.pipeline.reset()
+    builder.pipeline.add(*_LUNR_BUILDER_PIPELINE)
+    return _LUNR(ref="key", fields=fields, documents=documents, builder=builder)
+
+
+def get_search_index(documents, fields):
+    """
+    Get a Lunr search index for the given documents. Building an index is slow, so
+    indexes are cached and only rebuilt when the documents or fields change, such as when
+    a help entry is created, edited or deleted or a different set of commands is searched.
+
+    Args:
+        documents (list): The dicts to index, each with a "key" used as reference.
+        fields (list): Lunr field mappings.
+
+    Returns:
+        lunr.Index: The search index.
+
+    """
+    if not _LUNR:
+        _load_lunr()
+    try:
+        cache_key = (
+            tuple(tuple(field.items()) for field in fields),
+            tuple(tuple(document.items()) for document in documents),
+        )
+        search_index = _SEARCH_INDEX_CACHE.get(cache_key)
+    except TypeError:
+        # unhashable data in the documents; can't cache this
+        return _build_search_index(documents, fields)
+
+    if search_index is None:
+        search_index = _build_search_index(documents, fields)
+        _SEARCH_INDEX_CACHE[cache_key] = search_index
+        if len(_SEARCH_INDEX_CACHE) > _SEARCH_INDEX_CACHE_SIZE:
+            _SEARCH_INDEX_CACHE.popitem(last=False)
+    else:
+        _SEARCH_INDEX_CACHE.move_to_end(cache_key)
+    return search_index
+
+
+def clear_search_index_cache():
+    """
+    Clear all cached help search indexes.
+
+    """
+    _SEARCH_INDEX_CACHE.clear()
+
+
+def help_search_with_index(
+    query, candidate_entries, suggestion_maxnum=5, fields=None, access_check=None
+):
     """
     Lunr-powered fast index search and suggestion wrapper. See https://lunrjs.com/.
 
@@ -43,46 +144,30 @@ def help_search_with_index(query, candidate_entries, suggestion_maxnum=5, fields
         query (str): The query to search for.
         candidate_entries (list): This is the body of possible entities to search. Each
             must have a property `.search_index_entry` that returns a dict with all
-            keys in the `fields` arg.
+            keys in the `fields` arg. If several candidates have the same key, the last
+            one is the one indexed.
         suggestion_maxnum (int): How many matches to allow at most in a multi-match.
         fields (list, optional): A list of Lunr field mappings
             ``{"field_name": str, "boost": int}``. See the Lunr documentation
             for more details. The field name must exist in the dicts returned
             by `.search_index_entry` of the candidates. If not given, a default setup
             is used, prefering keys > aliases > category > tags.
+        access_check (callable, optional): Called as `access_check(candidate)` for matched
+            candidates, in order of relevance, until `suggestion_maxnum` of them have
+            returned `True`. If the candidate indexed for a key fails the check, candidates
+            earlier in `candidate_entries` with the same key are tried instead. This allows
+            using the same (cached) index for everyone, only checking access for the matches.
     Returns:
         tuple: A tuple (matches, suggestions), each a list, where the `suggestion_maxnum` limits
             how many suggestions are included.
 
     """
-    global _LUNR, _LUNR_EXCEPTION, _LUNR_BUILDER_PIPELINE, _LUNR_GET_BUILDER
-    if not _LUNR:
-        # we have to delay-load lunr because it messes with logging if it's imported
-        # before twisted's logging has been set up
-        from lunr import get_default_builder as _LUNR_GET_BUILDER
-        from lunr import lunr as _LUNR
-        from lunr import stop_word_filter
-        from lunr.exceptions import QueryParseError as _LUNR_EXCEPTION
-        from lunr.stemmer import stemmer
-
-        # from lunr.trimmer import trimmer
-        # pre-create a lunr index-builder pipeline where we've removed some of
-        # the stop-words from the default in lunr.
-
-        stop_words = stop_word_filter.WORDS
-
-        for ignore_word in _LUNR_STOP_WORD_FILTER_EXCEPTIONS:
-            try:
-                stop_words.remove(ignore_word)
-            except ValueError:
-                pass
-
-        custom_stop_words_filter = stop_word_filter.generate_stop_word_filter(stop_words)
-        # _LUNR_BUILDER_PIPELINE = (trimmer, custom_stop_words_filter, stemmer)
-        _LUNR_BUILDER_PIPELINE = (custom_stop_words_filter, stemmer)
-
-    indx = [cnd.search_index_entry for cnd in candidate_entries]
-    mapping = {indx[ix]["key"]: cand for ix, cand in enumerate(candidate_entries)}
+    # {key: [(candidate, index_entry), ...]}
+    mapping = {}
+    for cand in candidate_entries:
+        entry = cand.search_index_entry
+        mapping.setdefault(entry["key"], []).append((cand, entry))
+    indx = [cands[-1][1] for cands in mapping.values()]
 
     if not fields:
         fields = [
@@ -92,23 +177,33 @@ def help_search_with_index(query, candidate_entries, suggestion_maxnum=5, fields
             {"field_name": "tags", "boost": 5},
         ]
 
-    # build the search index
-    builder = _LUNR_GET_BUILDER()
-    builder.pipeline.reset()
-    builder.pipeline.add(*_LUNR_BUILDER_PIPELINE)
-
-    search_index = _LUNR(ref="key", fields=fields, documents=indx, builder=builder)
+    search_index = get_search_index(indx, fields)
 
     try:
-        matches = search_index.search(query)[:suggestion_maxnum]
+        matches = search_index.search(query)
     except _LUNR_EXCEPTION:
         # this is a user-input problem
         matches = []
 
+    if access_check is None:
+        matches = [(mapping[match["ref"]][-1][0], match["ref"]) for match in matches]
+    else:
+        accessible = []
+        for match in matches:
+            for cand, _ in reversed(mapping[match["ref"]]):
+                if access_check(cand):
+                    accessible.append((cand, match["ref"]))
+                    break
+            if len(accessible) >= suggestion_maxnum:
+                break
+        matches = accessible
+
+    matches = matches[:suggestion_maxnum]
+
     # matches (objs), suggestions (strs)
     return (
-        [mapping[match["ref"]] for match in matches],
-        [str(match["ref"]) for match in matches],  # + f" (score {match['score']})")   # good debug
+        [cand for cand, _ in matches],
+        [str(ref) for _, ref in matches],  # + f" (score {match['score']})")   # good debug
     )
 
 
@@ -115,6 +115,7 @@ __all__ = ("LockHandler", "LockException")
 
 WARNING_LOG = settings.LOCKWARNING_LOG_FILE
 _LOCK_HANDLER = None
+_INVALIDATE_CMDSET_CACHE = None
 
 
 #
@@ -137,6 +138,9 @@ class LockException(Exception):
 #
 
 _LOCKFUNCS = {}
+# parsed lockstrings used with check_lockstring, {lockstring: locks}
+_LOCKSTRING_CACHE = {}
+_LOCKSTRING_CACHE_SIZE = 2000
 
 
 def _cache_lockfuncs():
@@ -146,6 +150,7 @@ def _cache_lockfuncs():
     """
     global _LOCKFUNCS
     _LOCKFUNCS = {}
+    _LOCKSTRING_CACHE.clear()
     for modulepath in settings.LOCK_FUNC_MODULES:
         _LOCKFUNCS.update(utils.callables_from_module(modulepath))
 
@@ -160,6 +165,89 @@ _RE_SEPS = re.compile(r"(?<=[ )])AND(?=\s)|(?<=[ )])OR(?=\s)|(?<=[ )])NOT(?=\s)"
 _RE_OK = re.compile(r"%s|and|or|not")
 
 
+#
+# Lock compilation
+#
+
+
+def _compile_lock(evalstring, lock_funcs):
+    """
+    Compile a parsed lock definition into a callable. The lock functions are
+    combined with the same precedence as Python (`not` before `and` before
+    `or`) and are evaluated lazily, so a lock function is only called if its
+    result can still change the outcome.
+
+    Args:
+        evalstring (str): The purged lock definition, like `"%s and not %s"`,
+            where each `%s` is a placeholder for a lock function.
+        lock_funcs (tuple): Tuples `(func, args, kwargs)`, one for each
+            placeholder in `evalstring`.
+
+    Returns:
+        _LockChecker: A callable `checker(accessing_obj, accessed_obj)` returning
+            the combined `True`/`False` result of the lock.
+
+    Raises:
+        ValueError: If `evalstring` is not a valid combination of placeholders
+            and `and`/`or`/`not` operators.
+
+    """
+    # the definition is stored as a disjunction of conjunctions, where each
+    # element is (negate, func, args, kwargs)
+    terms = [[]]
+    negate = False
+    expect_operand = True
+    ifunc = iter(lock_funcs)
+    for token in evalstring.split():
+        if expect_operand:
+            if token == "not":
+                negate = not negate
+            elif token == "%s":
+                try:
+                    func, args, kwargs = next(ifunc)
+                except StopIteration:
+                    raise ValueError("Too few lock functions for lock definition.")
+                terms[-1].append((negate, func, tuple(args), kwargs))
+                negate = False
+                expect_operand = False
+            else:
+                raise ValueError(f"Unexpected '{token}' in lock definition.")
+        elif token == "and":
+            expect_operand = True
+        elif token == "or":
+            terms.append([])
+            expect_operand = True
+        else:
+            raise ValueError(f"Unexpected '{token}' in lock definition.")
+    if expect_operand or next(ifunc, None) is not None:
+        raise ValueError("Incomplete lock definition.")
+
+    return _LockChecker(tuple(tuple(term) for term in terms))
+
+
+class _LockChecker:
+    """
+    A compiled lock definition, as created by `_compile_lock`. Call it as
+    `checker(accessing_obj, accessed_obj)` to evaluate the lock.
+
+    """
+
+    __slots__ = ("terms",)
+
+    def __init__(self, terms):
+        self.terms = terms
+
+    def __call__(self, accessing_obj, accessed_obj):
+        for term in self.terms:
+            for negate, func, args, kwargs in term:
+                if bool(func(accessing_obj, accessed_obj, *args, **kwargs)) == negate:
+                    # this and-term failed, try the next or-term
+                    break
+            else:
+                return True
+        return False
+
+
 #
 #
 # Lock handler
@@ -256,10 +344,10 @@ class LockHandler:
             if len(lock_funcs) < nfuncs:
                 continue
             try:
-                # purge the eval string of any superfluous items, then test it
+                # purge the eval string of any superfluous items, then compile it
                 evalstring = " ".join(_RE_OK.findall(evalstring))
-                eval(evalstring % tuple(True for func in funclist), {}, {})
-            except Exception:
+                checker = _compile_lock(evalstring, lock_funcs)
+            except ValueError:
                 elist.append(
                     _("Lock: definition '{lock_string}' has syntax errors.").format(
                         lock_string=raw_lockstring
@@ -279,7 +367,7 @@ class LockHandler:
                         )
                     )
                 )
-            locks[access_type] = (evalstring, tuple(lock_funcs), raw_lockstring)
+            locks[access_type] = (evalstring, tuple(lock_funcs), raw_lockstring, checker)
         if wlist and WARNING_LOG:
             # a warning text was set, it's not an error, so only report
             logger.log_file("\n".join(wlist), WARNING_LOG)
@@ -294,14 +382,29 @@ class LockHandler:
         Store data
 
         """
+        global _INVALIDATE_CMDSET_CACHE
+        if not _INVALIDATE_CMDSET_CACHE:
+            from evennia.commands.cmdhandler import (
+                invalidate_cmdset_cache as _INVALIDATE_CMDSET_CACHE,
+            )
+
         self.locks = self._parse_lockstring(storage_lockstring)
+        # call-locks affect which cmdsets are merged for a caller
+        _INVALIDATE_CMDSET_CACHE(self.obj)
 
     def _save_locks(self):
         """
         Store locks to obj
 
         """
+        global _INVALIDATE_CMDSET_CACHE
+        if not _INVALIDATE_CMDSET_CACHE:
+            from evennia.commands.cmdhandler import (
+                invalidate_cmdset_cache as _INVALIDATE_CMDSET_CACHE,
+            )
+
         self.obj.lock_storage = ";".join([tup[2] for tup in self.locks.values()])
+        _INVALIDATE_CMDSET_CACHE(self.obj)
 
     def cache_lock_bypass(self, obj):
         """
@@ -531,15 +634,15 @@ class LockHandler:
 
             Parsing the lockstring, we (during cache) extract the valid
             lock functions and store their function objects in the right
-            order along with their args/kwargs. These are now executed in
-            sequence, creating a list of True/False values. This is put
-            into the evalstring, which is a string of AND/OR/NOT entries
-            separated by placeholders where each function result should
-            go. We just put those results in and evaluate the string to
-            get a final, combined True/False value for the lockstring.
+            order along with their args/kwargs. The AND/OR/NOT structure
+            between them is compiled into a checker function once, at the
+            same time. The checker calls the lock functions in order, but
+            short-circuits like Python does, so a lock function is only
+            called if its result can still change the final, combined
+            True/False value of the lockstring.
 
             The important bit with this solution is that the full
-            lockstring is never blindly evaluated, and thus there (should
+            lockstring is never evaluated, and thus there (should
             be) no way to sneak in malign code in it. Only "safe" lock
             functions (as defined by your settings) are executed.
 
@@ -567,22 +670,16 @@ class LockHandler:
                 return True
 
         # no superuser or bypass -> normal lock operation
-        if access_type in self.locks:
-            # we have a lock, test it.
-            evalstring, func_tup, raw_string = self.locks[access_type]
-            # execute all lock funcs in the correct order, producing a tuple of True/False results.
-            true_false = tuple(
-                bool(tup[0](accessing_obj, self.obj, *tup[1], **tup[2])) for tup in func_tup
-            )
-            # the True/False tuple goes into evalstring, which combines them
-            # with AND/OR/NOT in order to get the final result.
-            return eval(evalstring % true_false)
+        lock = self.locks.get(access_type)
+        if lock:
+            # we have a lock, test it with its pre-compiled checker
+            return lock[3](accessing_obj, self.obj)
         else:
             return default
 
     def _eval_access_type(self, accessing_obj, locks, access_type):
         """
-        Helper method for evaluating the access type using eval().
+        Helper method for evaluating the access type using its compiled checker.
 
         Args:
             accessing_obj (object): Object seeking access.
@@ -590,9 +687,7 @@ class LockHandler:
             access_type (str): An access-type key to evaluate.
 
         """
-        evalstring, func_tup, raw_string = locks[access_type]
-        true_false = tuple(tup[0](accessing_obj, self.obj, *tup[1], **tup[2]) for tup in func_tup)
-        return eval(evalstring % true_false)
+        return locks[access_type][3](accessing_obj, self.obj)
 
     def check_lockstring(
         self, accessing_obj, lockstring, no_superuser_bypass=False, default=False, access_type=None
@@ -642,7 +737,12 @@ class LockHandler:
         if ":" not in lockstring:
             lockstring = "%s:%s" % ("_dummy", lockstring)
 
-        locks = self._parse_lockstring(lockstring)
+        locks = _LOCKSTRING_CACHE.get(lockstring)
+        if locks is None:
+            locks = self._parse_lockstring(lockstring)
+            if len(_LOCKSTRING_CACHE) >= _LOCKSTRING_CACHE_SIZE:
+                _LOCKSTRING_CACHE.clear()
+            _LOCKSTRING_CACHE[lockstring] = locks
 
         if access_type:
             if access_type not in locks:
@@ -16,7 +16,7 @@ except ImportError:
     from django.test import TestCase, override_settings
 
 from evennia import settings_default
-from evennia.locks import lockfuncs
+from evennia.locks import lockfuncs, lockhandler
 from evennia.utils.create import create_object
 
 # ------------------------------------------------------------
@@ -42,6 +42,65 @@ class TestLockCheck(BaseEvenniaTest):
         self.assertEqual(True, self.obj1.locks.check(self.obj2, "not_exist", default=True))
 
 
+class TestLockCompile(TestCase):
+    """
+    Test compilation of lock definitions into checker functions.
+
+    """
+
+    def setUp(self):
+        self.calls = []
+
+    def _lockfunc(self, result):
+        def _func(accessing_obj, accessed_obj, *args, **kwargs):
+            self.calls.append(result)
+            return result
+
+        return (_func, [], {})
+
+    def test_precedence(self):
+        for evalstring in (
+            "%s",
+            "not %s",
+            "%s and %s",
+            "%s or %s",
+            "%s and not %s or %s",
+            "not %s or %s and %s",
+            "%s or not not %s and %s or %s",
+        ):
+            nfuncs = evalstring.count("%s")
+            for num in range(2**nfuncs):
+                results = tuple(bool(num & (1 << ifunc)) for ifunc in range(nfuncs))
+                checker = lockhandler._compile_lock(
+                    evalstring, [self._lockfunc(result) for result in results]
+                )
+                self.assertEqual(
+                    checker(None, None), eval(evalstring % results), f"{evalstring} % {results}"
+                )
+
+    def test_short_circuit(self):
+        checker = lockhandler._compile_lock(
+            "%s or %s and %s",
+            [self._lockfunc(True), self._lockfunc(False), self._lockfunc(True)],
+        )
+        self.assertTrue(checker(None, None))
+        self.assertEqual(self.calls, [True])
+        self.calls = []
+        checker = lockhandler._compile_lock(
+            "%s and %s or %s",
+            [self._lockfunc(False), self._lockfunc(True), self._lockfunc(False)],
+        )
+        self.assertFalse(checker(None, None))
+        self.assertEqual(self.calls, [False, False])
+
+    def test_invalid(self):
+        for evalstring in ("%s and", "or %s", "%s %s", "not", "%s and or %s"):
+            with self.assertRaises(ValueError):
+                lockhandler._compile_lock(
+                    evalstring, [self._lockfunc(True) for _ in range(evalstring.count("%s"))]
+                )
+
+
 class TestLockfuncs(BaseEvenniaTest):
     def setUp(self):
         super().setUp()
@@ -282,11 +282,13 @@ class ObjectDBManager(TypedObjectManager):
             exact (bool, optional): Require exact match of ostring
                 (still case-insensitive). If `False`, will do fuzzy matching
                 using `evennia.utils.utils.string_partial_matching` algorithm.
-            candidates (list): Only match among these candidates.
+            candidates (list): Only match among these candidates. The matching is then
+                done in memory, using the cached keys and aliases of the candidates.
             typeclasses (list): Only match objects with typeclasses having thess path strings.
 
         Returns:
-            Queryset: An iterable with 0, 1 or more matches.
+            Queryset or list: An iterable with 0, 1 or more matches, ordered by id. This
+                is a list if `candidates` were given.
 
         """
         if not isinstance(ostring, str):
@@ -298,6 +300,8 @@ class ObjectDBManager(TypedObjectManager):
             # if candidates is an empty iterable there can be no matches
             # Exit early.
             return self.none()
+        if candidates is not None:
+            return self._match_key_or_alias(ostring, exact, candidates, typeclasses)
 
         # build query objects
         candidates_id = [_GA(obj, "id") for obj in make_iter(candidates) if obj]
@@ -365,6 +369,62 @@ class ObjectDBManager(TypedObjectManager):
         # rather than a list ... maybe the above queries can be improved.
         return self.filter(id__in=match_ids)
 
+    def _match_key_or_alias(self, ostring, exact, candidates, typeclasses=None):
+        """
+        In-memory version of `get_objs_with_key_or_alias` for when we have
+        candidates. The candidates are already loaded, with their aliases
+        cached on their TagHandlers, so there's no need to query the database.
+
+        Args:
+            ostring (str): A search criterion.
+            exact (bool): Require exact (case-insensitive) match of ostring.
+            candidates (list): Only match among these candidates.
+            typeclasses (list, optional): Only match objects with these typeclass paths.
+
+        Returns:
+            list: The matching candidates, ordered by id.
+
+        """
+        typeclasses = make_iter(typeclasses) if typeclasses else None
+        search_candidates = {}
+        for obj in make_iter(candidates):
+            # skip duplicates and deleted objects
+            if obj and _GA(obj, "id") and _GA(obj, "id") not in search_candidates:
+                if typeclasses and _GA(obj, "db_typeclass_path") not in typeclasses:
+                    continue
+                search_candidates[_GA(obj, "id")] = obj
+        search_candidates = [search_candidates[key] for key in sorted(search_candidates)]
+
+        ostring = ostring.lower()
+        if exact:
+            return [
+                obj
+                for obj in search_candidates
+                if obj.db_key.lower() == ostring
+                or any(alias.lower() == ostring for alias in obj.aliases.all())
+            ]
+
+        # fuzzy matching
+        index_matches = string_partial_matching(
+            [obj.db_key for obj in search_candidates], ostring, ret_index=True
+        )
+        if not index_matches:
+            # match by alias rather than by key
+            alias_strings = []
+            alias_candidates = []
+            for obj in search_candidates:
+                aliases = obj.aliases.all()
+                if any(ostring in alias.lower() for alias in aliases):
+                    alias_strings.extend(aliases)
+                    alias_candidates.extend([obj] * len(aliases))
+            search_candidates = alias_candidates
+            index_matches = string_partial_matching(alias_strings, ostring, ret_index=True)
+        # the same object may match on several aliases
+        matches = {
+            _GA(search_candidates[ind], "id"): search_candidates[ind] for ind in index_matches
+        }
+        return [matches[key] for key in sorted(matches)]
+
     # main search methods and helper functions
 
     def search_object(
@@ -444,6 +504,8 @@ class ObjectDBManager(TypedObjectManager):
         def _search_by_tag(query, taglist):
             if not query:
                 query = self.all()
+            elif isinstance(query, list):
+                query = self.filter(id__in=[_GA(obj, "id") for obj in query])
 
             for tagkey, tagcategory in taglist:
                 query = query.filter(db_tags__db_key=tagkey, db_tags__db_category=tagcategory)
@@ -451,7 +513,6 @@ class ObjectDBManager(TypedObjectManager):
             return query
 
         if not searchdata and searchdata != 0:
-
             if tags:
                 return _search_by_tag(make_iter(tags))
 
@@ -526,9 +587,12 @@ class ObjectDBManager(TypedObjectManager):
         elif len(matches) > 1 and match_number is not None:
             # multiple matches, but a number was given to separate them
             if 0 <= match_number < len(matches):
-                # limit to one match (we still want a queryset back)
-                # TODO: Can we do this some other way and avoid a second lookup?
-                matches = self.filter(id=matches[match_number].id)
+                if isinstance(matches, list):
+                    matches = [matches[match_number]]
+                else:
+                    # limit to one match (we still want a queryset back)
+                    # TODO: Can we do this some other way and avoid a second lookup?
+                    matches = self.filter(id=matches[match_number].id)
             else:
                 # a number was given outside of range. This means a no-match.
                 matches = self.none()
@@ -25,6 +25,8 @@ from evennia.typeclasses.models import TypedObject
 from evennia.utils import logger
 from evennia.utils.utils import dbref, lazy_property, make_iter
 
+_INVALIDATE_CMDSET_CACHE = None
+
 
 class ContentsHandler:
     """
@@ -62,11 +64,31 @@ class ContentsHandler:
         """
         return list(self.obj.locations_set.all())
 
+    def _invalidate_cmdsets(self, *objs):
+        """
+        Contents changes affect which cmdsets are available to the objects
+        involved, so make sure their merged cmdsets are re-calculated.
+
+        Args:
+            *objs (Object): Objects moved in or out of this location.
+
+        """
+        global _INVALIDATE_CMDSET_CACHE
+        if not _INVALIDATE_CMDSET_CACHE:
+            from evennia.commands.cmdhandler import (
+                invalidate_cmdset_cache as _INVALIDATE_CMDSET_CACHE,
+            )
+
+        _INVALIDATE_CMDSET_CACHE(self.obj)
+        for obj in objs:
+            _INVALIDATE_CMDSET_CACHE(obj)
+
     def init(self):
         """
         Re-initialize the content cache
 
         """
+        self._invalidate_cmdsets()
         objects = self.load()
         self._pkcache = {obj.pk: True for obj in objects}
         for obj in objects:
@@ -115,6 +137,7 @@ class ContentsHandler:
         self._pkcache[obj.pk] = obj
         for ctype in obj._content_types:
             self._typecache[ctype][obj.pk] = True
+        self._invalidate_cmdsets(obj)
 
     def remove(self, obj):
         """
@@ -128,6 +151,7 @@ class ContentsHandler:
         for ctype in obj._content_types:
             if obj.pk in self._typecache[ctype]:
                 self._typecache[ctype].pop(obj.pk, None)
+        self._invalidate_cmdsets(obj)
 
     def clear(self):
         """
@@ -269,6 +293,15 @@ class ObjectDB(TypedObject):
     def contents_cache(self):
         return ContentsHandler(self)
 
+    def at_idmapper_evict(self):
+        """
+        Puppeted objects are never evicted from the idmapper cache.
+
+        """
+        if self.db_sessid:
+            return False
+        return super().at_idmapper_evict()
+
     # cmdset_storage property handling
     def __cmdset_storage_get(self):
         """getter"""
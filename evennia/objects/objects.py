@@ -46,6 +46,8 @@ _SESSID_MAX = 16 if _MULTISESSION_MODE in (1, 3) else 1
 
 # init the actor-stance funcparser for msg_contents
 _MSG_CONTENTS_PARSER = funcparser.FuncParser(funcparser.ACTOR_STANCE_CALLABLES)
+# callables whose msg_contents result is the same for all receivers except the caller
+_MSG_CONTENTS_MEMOIZE = ("conj", "pron", "Pron")
 
 
 class ObjectSessionHandler:
@@ -768,12 +770,19 @@ class DefaultObject(ObjectDB, metaclass=TypeclassBase):
             exclude = make_iter(exclude)
             contents = [obj for obj in contents if obj not in exclude]
 
+        # pre-parse the message once rather than once per receiver. Results of
+        # callables only depending on if the receiver is `you` or not can be
+        # re-used for everyone else in the room.
+        compiled = _MSG_CONTENTS_PARSER.compile(inmessage)
+        bystander_memo = {}
+
         for receiver in contents:
 
             # actor-stance replacements
-            outmessage = _MSG_CONTENTS_PARSER.parse(
-                inmessage,
+            outmessage = compiled.parse(
                 raise_errors=raise_funcparse_errors,
+                memo=None if receiver == you else bystander_memo,
+                memoize=_MSG_CONTENTS_MEMOIZE,
                 return_string=True,
                 caller=you,
                 receiver=receiver,
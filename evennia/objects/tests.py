@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from evennia import DefaultCharacter, DefaultExit, DefaultObject, DefaultRoom
 from evennia.objects.models import ObjectDB
 from evennia.objects.objects import DefaultObject
@@ -8,7 +10,6 @@ from evennia.utils.test_resources import BaseEvenniaTest, EvenniaTestCase
 
 
 class DefaultObjectTest(BaseEvenniaTest):
-
     ip = "212.216.139.14"
 
     def test_object_create(self):
@@ -106,6 +107,21 @@ class DefaultObjectTest(BaseEvenniaTest):
         # partial match to 'colon' - multimatch error since stack is not homogenous
         self.assertEqual(self.char1.search("co", stacked=2), None)
 
+    def test_msg_contents(self):
+        "Test actor-stance messages to everyone in a location"
+        with patch.object(DefaultObject, "msg") as mock_msg:
+            self.room1.msg_contents(
+                "$You() $conj(smile) at $you(char2).",
+                from_obj=self.char1,
+                mapping={"char2": self.char2},
+            )
+        received = {
+            call.kwargs["text"][0] for call in mock_msg.call_args_list if call.kwargs.get("text")
+        }
+        self.assertIn(f"You smile at Char2(#{self.char2.id}).", received)
+        self.assertIn("Char smiles at you.", received)
+        self.assertIn("Char smiles at Char2.", received)
+
 
 class TestObjectManager(BaseEvenniaTest):
     "Test object manager methods"
@@ -146,6 +162,49 @@ class TestObjectManager(BaseEvenniaTest):
         )
         self.assertEqual(list(query), [self.char1])
 
+    def test_get_objs_with_key_or_alias(self):
+        self.obj1.aliases.add("red ball")
+        self.obj2.aliases.add("blue ball")
+        candidates = [self.char1, self.obj2, self.obj1, self.obj1, self.char2]
+        for obj in candidates:
+            obj.aliases.all()  # load the alias caches
+        with self.assertNumQueries(0):
+            query = ObjectDB.objects.get_objs_with_key_or_alias("obj", candidates=candidates)
+            self.assertEqual(query, [self.obj1])
+            query = ObjectDB.objects.get_objs_with_key_or_alias("RED BALL", candidates=candidates)
+            self.assertEqual(query, [self.obj1])
+            query = ObjectDB.objects.get_objs_with_key_or_alias(
+                "ob", exact=False, candidates=candidates
+            )
+            self.assertEqual(query, [self.obj1, self.obj2])
+            query = ObjectDB.objects.get_objs_with_key_or_alias(
+                "ball", exact=False, candidates=candidates
+            )
+            self.assertEqual(query, [self.obj1, self.obj2])
+            query = ObjectDB.objects.get_objs_with_key_or_alias(
+                "blue", exact=False, candidates=candidates
+            )
+            self.assertEqual(query, [self.obj2])
+            query = ObjectDB.objects.get_objs_with_key_or_alias(
+                "char", candidates=candidates, typeclasses=["evennia.objects.objects.DefaultObject"]
+            )
+            self.assertEqual(query, [])
+        # same results as searching the database
+        for ostring, exact in (("obj", True), ("ob", False), ("ball", False), ("blue", False)):
+            self.assertEqual(
+                ObjectDB.objects.get_objs_with_key_or_alias(
+                    ostring, exact=exact, candidates=candidates
+                ),
+                list(ObjectDB.objects.get_objs_with_key_or_alias(ostring, exact=exact)),
+            )
+
+    def test_search_multimatch(self):
+        self.obj1.aliases.add("ball")
+        self.obj2.aliases.add("ball")
+        self.assertEqual(self.char1.search("ball-2"), self.obj2)
+        self.assertEqual(self.char1.search("ball-1", quiet=True), [self.obj1])
+        self.assertEqual(self.char1.search("ball-3", quiet=True), [])
+
     def test_get_objs_with_attr(self):
         self.obj1.db.testattr = "testval1"
         query = ObjectDB.objects.get_objs_with_attr("testattr")
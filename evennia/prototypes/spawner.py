@@ -139,6 +139,7 @@ import time
 
 import evennia
 from django.conf import settings
+from django.db import connection
 from django.utils.translation import gettext as _
 from evennia.objects.models import ObjectDB
 from evennia.prototypes import prototypes as protlib
@@ -149,7 +150,10 @@ from evennia.prototypes.prototypes import (
     value_to_obj,
     value_to_obj_or_any,
 )
+from evennia.typeclasses.attributes import Attribute
+from evennia.typeclasses.tags import Tag
 from evennia.utils import logger
+from evennia.utils.dbserialize import to_pickle
 from evennia.utils.utils import class_from_module, is_iter, make_iter
 
 _CREATE_OBJECT_KWARGS = ("key", "location", "home", "destination")
@@ -173,6 +177,8 @@ _PROTOTYPE_ROOT_NAMES = (
     "destination",
 )
 _NON_CREATE_KWARGS = _CREATE_OBJECT_KWARGS + _PROTOTYPE_META_NAMES
+# max number of rows to insert per query when bulk-creating objects
+_BULK_BATCH_SIZE = 500
 
 
 class Unset:
@@ -810,7 +816,7 @@ def batch_update_objects_with_prototype(
     return changed
 
 
-def batch_create_object(*objparams):
+def batch_create_object(*objparams, bulk=False):
     """
     This is a cut-down version of the create_object() function,
     optimized for speed. It does NOT check and convert various input
@@ -836,6 +842,9 @@ def batch_create_object(*objparams):
                         (the newly created object) available in the namespace. Execution
                         will happend after all other properties have been assigned and
                         is intended for calling custom handlers etc.
+        bulk (bool, optional): Insert the objects, their Attributes and Tags into the
+            database with a few large queries instead of saving each object separately.
+            This is much faster when creating many objects. See `bulk_create_object`.
 
     Returns:
         objects (list): A list of created objects
@@ -845,13 +854,8 @@ def batch_create_object(*objparams):
         unprivileged users!
 
     """
-
-    # bulk create all objects in one go
-
-    # unfortunately this doesn't work since bulk_create doesn't creates pks;
-    # the result would be duplicate objects at the next stage, so we comment
-    # it out for now:
-    #  dbobjs = _ObjectDB.objects.bulk_create(dbobjs)
+    if bulk and connection.features.can_return_rows_from_bulk_insert:
+        return bulk_create_object(*objparams)
 
     objs = []
     for objparam in objparams:
@@ -877,6 +881,204 @@ def batch_create_object(*objparams):
     return objs
 
 
+def _bulk_add_tags(objs, objtags):
+    """
+    Add Tags (including aliases and permissions) to many new objects with a
+    minimal number of queries.
+
+    Args:
+        objs (list): The new objects.
+        objtags (list): One list for each object, of tuples `(key, category, data, tagtype)`.
+
+    """
+    # find the unique tags; as for TagHandler.add, later data overwrites earlier
+    tagdata = {}
+    for tags in objtags:
+        for key, category, data, tagtype in tags:
+            tagkey = (key, category, tagtype)
+            if data is not None or tagkey not in tagdata:
+                tagdata[tagkey] = data
+    if not tagdata:
+        return
+
+    tagobjs = {}
+    to_update = []
+    for tag in Tag.objects.filter(db_model="objectdb", db_key__in={key for key, _, _ in tagdata}):
+        tagkey = (tag.db_key, tag.db_category, tag.db_tagtype)
+        if tagkey in tagdata:
+            tagobjs[tagkey] = tag
+            data = tagdata[tagkey]
+            if data is not None and tag.db_data != data:
+                tag.db_data = data
+                to_update.append(tag)
+    if to_update:
+        Tag.objects.bulk_update(to_update, ["db_data"], batch_size=_BULK_BATCH_SIZE)
+    new_tags = [
+        Tag(db_key=key, db_category=category, db_data=data, db_tagtype=tagtype, db_model="objectdb")
+        for (key, category, tagtype), data in tagdata.items()
+        if (key, category, tagtype) not in tagobjs
+    ]
+    for tag in Tag.objects.bulk_create(new_tags, batch_size=_BULK_BATCH_SIZE):
+        tagobjs[(tag.db_key, tag.db_category, tag.db_tagtype)] = tag
+
+    through = ObjectDB.db_tags.through
+    links = {
+        (obj.id, tagobjs[(key, category, tagtype)].id)
+        for obj, tags in zip(objs, objtags)
+        for key, category, _, tagtype in tags
+    }
+    # creation hooks may already have added some of these tags
+    through.objects.bulk_create(
+        [through(objectdb_id=obj_id, tag_id=tag_id) for obj_id, tag_id in links],
+        batch_size=_BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    for obj in objs:
+        obj.tags.reset_cache()
+        obj.aliases.reset_cache()
+        obj.permissions.reset_cache()
+
+
+def _bulk_add_attributes(objs, objattrs):
+    """
+    Add Attributes to many new objects with a minimal number of queries.
+
+    Args:
+        objs (list): The new objects.
+        objattrs (list): One list for each object, of tuples `(key, value, category, lockstring)`.
+
+    Notes:
+        Attributes already created by the objects' creation hooks are updated
+        normally, like `AttributeHandler.batch_add` would do.
+
+    """
+    attr_objs = []
+    attr_owners = []
+    for obj, attributes in zip(objs, objattrs):
+        cache = obj.attributes.backend._cache
+        to_update = []
+        for key, value, category, lockstring in attributes:
+            key = str(key).strip().lower()
+            category = str(category).strip().lower() if category is not None else None
+            if not settings.TYPECLASS_AGGRESSIVE_CACHE or cache.get(f"{key}-{category}"):
+                # we can't be sure this Attribute doesn't already exist
+                to_update.append((key, value, category, lockstring))
+                continue
+            attr_objs.append(
+                Attribute(
+                    db_key=key,
+                    db_category=category,
+                    db_model="objectdb",
+                    db_lock_storage=lockstring if lockstring else "",
+                    db_attrtype=None,
+                    db_value=to_pickle(value),
+                    db_strvalue=None,
+                )
+            )
+            attr_owners.append(obj)
+        if to_update:
+            obj.attributes.batch_add(*to_update)
+    if not attr_objs:
+        return
+
+    Attribute.objects.bulk_create(attr_objs, batch_size=_BULK_BATCH_SIZE)
+    through = ObjectDB.db_attributes.through
+    through.objects.bulk_create(
+        [
+            through(objectdb_id=obj.id, attribute_id=attr.id)
+            for obj, attr in zip(attr_owners, attr_objs)
+        ],
+        batch_size=_BULK_BATCH_SIZE,
+    )
+    for obj, attr in zip(attr_owners, attr_objs):
+        Attribute.cache_instance(attr, new=True)
+        obj.attributes.backend._set_cache(attr.db_key, attr.db_category, attr)
+
+
+def bulk_create_object(*objparams):
+    """
+    Create many objects using bulk database inserts. This takes the same
+    input as `batch_create_object` and gives the same result, but saves
+    the objects, their Attributes and their Tags (including aliases and
+    permissions) with a few large queries rather than several queries per
+    object. The objects' creation hooks are called after their database
+    rows were inserted.
+
+    Args:
+        objparams (tuple): As for `batch_create_object`.
+
+    Returns:
+        objects (list): A list of created objects.
+
+    Notes:
+        This requires a database able to return the ids of bulk-inserted
+        rows (like PostgreSQL, SQLite 3.35+ or MariaDB 10.5+).
+
+        Since the object is saved before its creation hooks run, its Tags are
+        in place when `at_object_creation` is called. Attributes are applied
+        after the hooks and overwrite eventual values the hooks set.
+
+    """
+    objs = ObjectDB.objects.bulk_create(
+        [ObjectDB(**objparam[0]) for objparam in objparams], batch_size=_BULK_BATCH_SIZE
+    )
+    for obj in objs:
+        # bulk_create doesn't send post_save, so cache the new objects ourselves
+        ObjectDB.cache_instance(obj, new=True)
+
+    objtags = []
+    for objparam in objparams:
+        tags = [
+            (str(perm).strip().lower(), None, None, "permission")
+            for perm in make_iter(objparam[1])
+            if perm
+        ]
+        tags.extend(
+            (str(alias).strip().lower(), None, None, "alias")
+            for alias in make_iter(objparam[3])
+            if alias
+        )
+        for tag in make_iter(objparam[6]):
+            # tags are given as `key`, `(key, category)` or `(key, category, data)`
+            tag = make_iter(tag)
+            category = tag[1] if len(tag) > 1 else None
+            data = tag[2] if len(tag) > 2 else None
+            if tag[0]:
+                tags.append(
+                    (
+                        str(tag[0]).strip().lower(),
+                        str(category).strip().lower() if category else None,
+                        str(data) if data is not None else None,
+                        None,
+                    )
+                )
+        objtags.append(tags)
+    _bulk_add_tags(objs, objtags)
+
+    for obj, objparam in zip(objs, objparams):
+        # Attributes and Tags are handled separately, so are left out here
+        obj._createdict = {
+            "permissions": [],
+            "locks": objparam[2],
+            "aliases": [],
+            "nattributes": objparam[4],
+            "attributes": [],
+            "tags": [],
+        }
+        # this triggers all hooks, as if saving the object normally
+        obj.at_first_save()
+        obj.at_db_location_postsave(True)
+
+    _bulk_add_attributes(objs, [objparam[5] for objparam in objparams])
+
+    for obj, objparam in zip(objs, objparams):
+        # run eventual extra code
+        for code in objparam[7]:
+            if code:
+                exec(code, {}, {"evennia": evennia, "obj": obj})
+    return objs
+
+
 # Spawner mechanism
 
 
@@ -902,6 +1104,8 @@ def spawn(*prototypes, caller=None, **kwargs):
             (no object creation) and return the create-kwargs.
         protfunc_raise_errors (bool): Raise explicit exceptions on a malformed/not-found
             protfunc. Defaults to True.
+        bulk (bool): Save the objects to the database with bulk inserts. This is much
+            faster when spawning many objects at once. See `bulk_create_object`.
 
     Returns:
         object (Object, dict or list): Spawned object(s). If `only_validate` is given, return
@@ -1072,4 +1276,4 @@ def spawn(*prototypes, caller=None, **kwargs):
 
     if kwargs.get("only_validate"):
         return objsparams
-    return batch_create_object(*objsparams)
+    return batch_create_object(*objsparams, bulk=kwargs.get("bulk", False))
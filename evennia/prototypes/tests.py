@@ -9,7 +9,8 @@ from time import time
 
 import mock
 from anything import Something
-from django.test.utils import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from evennia.commands.default import building
 from evennia.objects.models import ObjectDB
 from evennia.prototypes import menus as olc_menus
@@ -1007,6 +1008,75 @@ class Test2474(BaseEvenniaTest):
         self.assertEqual(sting.db.magic, False)
 
 
+class TestBulkSpawn(BaseEvenniaTest):
+    """
+    Test spawning with bulk database inserts.
+
+    """
+
+    num_objects = 50
+
+    def setUp(self):
+        super().setUp()
+        self.prot = {
+            "prototype_key": "goblin",
+            "typeclass": "evennia.objects.objects.DefaultObject",
+            "key": "goblin",
+            "location": self.room1,
+            "aliases": ["gob", "grunt"],
+            "permissions": ["Goblin"],
+            "locks": "get:false()",
+            "tags": [("monster", "type", "A monster"), ("green", None)],
+            "attrs": [("health", 10, "stats"), ("desc", "An ugly goblin.")],
+            "weapon": "club",
+        }
+
+    def _check_spawned(self, obj):
+        self.assertEqual(obj.key, "goblin")
+        self.assertEqual(obj.location, self.room1)
+        self.assertIn(obj, self.room1.contents)
+        self.assertEqual(obj.aliases.all(), ["gob", "grunt"])
+        self.assertTrue(obj.permissions.check("Goblin"))
+        self.assertFalse(obj.access(self.char1, "get"))
+        self.assertTrue(obj.tags.has("monster", category="type"))
+        self.assertTrue(obj.tags.has("green"))
+        self.assertTrue(obj.tags.has("goblin", category=spawner.PROTOTYPE_TAG_CATEGORY))
+        self.assertEqual(obj.attributes.get("health", category="stats"), 10)
+        self.assertEqual(obj.db.weapon, "club")
+        # the desc set by at_object_creation is overridden
+        self.assertEqual(obj.db.desc, "An ugly goblin.")
+
+    def test_bulk_spawn(self):
+        objs = spawner.spawn(self.prot, self.prot, bulk=True)
+        self.assertEqual(len(objs), 2)
+        for obj in objs:
+            self._check_spawned(obj)
+        obj = objs[0]
+        # check the database rather than the caches
+        obj.attributes.reset_cache()
+        obj.tags.reset_cache()
+        obj.aliases.reset_cache()
+        self._check_spawned(obj)
+        self.assertEqual(ObjectDB.objects.get(id=obj.id), obj)
+        self.assertEqual(set(protlib.search_objects_with_prototype("goblin")), set(objs))
+
+    def test_bulk_spawn_queries(self):
+        prots = [self.prot] * self.num_objects
+
+        with CaptureQueriesContext(connection) as normal_queries:
+            objs = spawner.spawn(*prots)
+        self.assertEqual(len(objs), self.num_objects)
+
+        with CaptureQueriesContext(connection) as bulk_queries:
+            objs = spawner.spawn(*prots, bulk=True)
+        self.assertEqual(len(objs), self.num_objects)
+        self.assertEqual(len(set(objs)), self.num_objects)
+        for obj in objs:
+            self._check_spawned(obj)
+
+        self.assertLess(len(bulk_queries), len(normal_queries))
+
+
 class TestPartialTagAttributes(BaseEvenniaTest):
     """
     Make sure tags and attributes are homogenized if given as incomplete tuples.
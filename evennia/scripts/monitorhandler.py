@@ -9,6 +9,10 @@ functionality:
 - Attribute-monitor tracks an object's specific Attribute and perform
     an action whenever that Attribute *changes* for whatever reason.
 
+Monitored objects are flagged with `_monitored`, so saving an object
+without monitors never reaches the handler. Monitored objects are also
+kept in the idmapper cache for as long as they are monitored.
+
 """
 import inspect
 from collections import defaultdict
@@ -36,6 +40,8 @@ class MonitorHandler(object):
         """
         self.savekey = "_monitorhandler_save"
         self.monitors = defaultdict(lambda: defaultdict(dict))
+        # {(obj, fieldname): ((idstring, callback, kwargs), ...)}
+        self._callbacks = {}
 
     def save(self):
         """
@@ -69,7 +75,7 @@ class MonitorHandler(object):
                 non-persistent tickers must be killed.
 
         """
-        self.monitors = defaultdict(lambda: defaultdict(dict))
+        self.clear()
         restored_monitors = ServerConfig.objects.conf(key=self.savekey)
         if restored_monitors:
             restored_monitors = dbunserialize(restored_monitors)
@@ -87,6 +93,7 @@ class MonitorHandler(object):
 
                     if obj and hasattr(obj, fieldname):
                         self.monitors[obj][fieldname][idstring] = (callback, persistent, kwargs)
+                        self._update_callbacks(obj, fieldname)
                 except Exception:
                     continue
         # make sure to clean data from database
@@ -100,28 +107,50 @@ class MonitorHandler(object):
         """
         return f"{fieldname}[{category}]" if category else fieldname
 
-    def at_update(self, obj, fieldname):
+    def _update_callbacks(self, obj, fieldname):
+        """
+        Update the callbacks to call when a field changes, as well as
+        the `_monitored` flag of the object. Must be called whenever the
+        monitors of a field change.
+
+        Args:
+            obj (Object or Attribute): The monitored entity.
+            fieldname (str): The (category-adjusted) fieldname.
+
         """
-        Called by the field/attribute as it saves.
+        fieldmonitors = self.monitors[obj].get(fieldname)
+        if fieldmonitors:
+            self._callbacks[(obj, fieldname)] = tuple(
+                (idstring, callback, kwargs)
+                for idstring, (callback, persistent, kwargs) in fieldmonitors.items()
+            )
+        else:
+            self._callbacks.pop((obj, fieldname), None)
+        _SA(obj, "_monitored", any(self.monitors[obj].values()))
 
+    def at_update(self, obj, fieldname):
         """
-        # if this an Attribute with a category we should differentiate
-        fieldname = self._attr_category_fieldname(
-            fieldname,
-            obj.db_category if fieldname == "db_value" and hasattr(obj, "db_category") else None,
-        )
+        Called by the field/attribute as it saves. This is only called for
+        objects flagged as `_monitored`.
 
-        to_delete = []
-        if obj in self.monitors and fieldname in self.monitors[obj]:
-            for idstring, (callback, persistent, kwargs) in self.monitors[obj][fieldname].items():
-                try:
-                    callback(obj=obj, fieldname=fieldname, **kwargs)
-                except Exception:
-                    to_delete.append((obj, fieldname, idstring))
-                    logger.log_trace("Monitor callback was removed.")
-        # we cleanup non-found monitors (has to be done after loop)
-        for (obj, fieldname, idstring) in to_delete:
-            del self.monitors[obj][fieldname][idstring]
+        """
+        if fieldname == "db_value" and hasattr(obj, "db_category"):
+            # if this an Attribute with a category we should differentiate
+            fieldname = self._attr_category_fieldname(fieldname, obj.db_category)
+
+        callbacks = self._callbacks.get((obj, fieldname))
+        if not callbacks:
+            return
+        failed = False
+        for idstring, callback, kwargs in callbacks:
+            try:
+                callback(obj=obj, fieldname=fieldname, **kwargs)
+            except Exception:
+                self.monitors[obj][fieldname].pop(idstring, None)
+                failed = True
+                logger.log_trace("Monitor callback was removed.")
+        if failed:
+            self._update_callbacks(obj, fieldname)
 
     def add(self, obj, fieldname, callback, idstring="", persistent=False, category=None, **kwargs):
         """
@@ -175,6 +204,7 @@ class MonitorHandler(object):
             logger.log_trace(err)
         else:
             self.monitors[obj][fieldname][idstring] = (callback, persistent, kwargs)
+            self._update_callbacks(obj, fieldname)
 
     def remove(self, obj, fieldname, idstring="", category=None):
         """
@@ -189,12 +219,16 @@ class MonitorHandler(object):
         idstring_dict = self.monitors[obj][fieldname]
         if idstring in idstring_dict:
             del self.monitors[obj][fieldname][idstring]
+            self._update_callbacks(obj, fieldname)
 
     def clear(self):
         """
         Delete all monitors.
         """
+        for obj in self.monitors:
+            _SA(obj, "_monitored", False)
         self.monitors = defaultdict(lambda: defaultdict(dict))
+        self._callbacks = {}
 
     def all(self, obj=None):
         """
@@ -3,10 +3,13 @@ Module containing the task handler for Evennia deferred tasks, persistent or not
 """
 
 from datetime import datetime, timedelta
+from heapq import heapify, heappop, heappush
+from itertools import count
 from pickle import PickleError
 
 from twisted.internet import reactor
 from twisted.internet.defer import CancelledError as DefCancelledError
+from twisted.internet.defer import Deferred
 from twisted.internet.task import deferLater
 
 from evennia.server.models import ServerConfig
@@ -15,6 +18,11 @@ from evennia.utils.logger import log_err
 
 TASK_HANDLER = None
 
+# each persistent task is stored in its own ServerConfig row, with this key-prefix
+_TASK_KEY_PREFIX = "delayed_task_"
+# max number of rows to delete in one query
+_TASK_DELETE_BATCH_SIZE = 500
+
 
 def handle_error(*args, **kwargs):
     """Handle errors within deferred objects."""
@@ -211,6 +219,14 @@ class TaskHandler(object):
     When `utils.delay` is called, the task handler is used to create
     the task.
 
+    All tasks are kept in a single heap, ordered by when they are due. Only
+    the first task in the heap has a timer running; when it fires, all tasks
+    that are due are called and the timer is restarted for the next task.
+
+    Each persistent task is stored in its own ServerConfig row. Adding or
+    removing a persistent task only writes that task, and all changes done
+    in the same reactor-iteration are written together.
+
     Task handler will automatically remove uncalled but canceled from task
     handler. By default this will not occur until a canceled task
     has been uncalled for 60 second after the time it should have been called.
@@ -227,6 +243,20 @@ class TaskHandler(object):
         # number of seconds before an uncalled canceled task is removed from TaskHandler
         self.stale_timeout = 60
         self._now = False  # used in unit testing to manually set now time
+        self._last_id = 0
+        # (call_time, order, deferred), the first item is the next task to call
+        self._heap = []
+        self._heap_order = count()
+        # number of canceled deferreds still in the heap
+        self._heap_canceled = 0
+        self._timer = None
+        self._timer_time = None
+        self._timer_clock = None
+        # ids of tasks that may no longer be active, checked by clean_stale_tasks
+        self._inactive = set()
+        # {task_id: serialized task, or None to delete it}, not yet in the database
+        self._pending_saves = {}
+        self._save_call = None
 
     def load(self):
         """Load from the ServerConfig.
@@ -235,30 +265,46 @@ class TaskHandler(object):
         It populates `self.tasks` according to the ServerConfig.
 
         """
-        to_save = False
-        value = ServerConfig.objects.conf("delayed_tasks", default={})
-        if isinstance(value, str):
-            tasks = dbunserialize(value)
-        else:
-            tasks = value
+        # make sure the database is up to date before reading from it
+        self.save()
+
+        # tasks saved by older versions are all stored in one ServerConfig
+        old_tasks = ServerConfig.objects.conf("delayed_tasks", default={})
+        if isinstance(old_tasks, str):
+            old_tasks = dbunserialize(old_tasks)
+        tasks = dict(old_tasks)
+
+        for key, value in ServerConfig.objects.filter(
+            db_key__startswith=_TASK_KEY_PREFIX
+        ).values_list("db_key", "db_value"):
+            task_id = int(key[len(_TASK_KEY_PREFIX) :])
+            tasks[task_id] = value
+            old_tasks.pop(task_id, None)
 
         # At this point, `tasks` contains a dictionary of still-serialized tasks
         for task_id, value in tasks.items():
+            self._last_id = max(self._last_id, task_id)
             date, callback, args, kwargs = dbunserialize(value)
             if isinstance(callback, tuple):
                 # `callback` can be an object and name for instance methods
                 obj, method = callback
                 if obj is None:
-                    to_save = True
+                    self._pending_saves[task_id] = None
                     continue
 
                 callback = getattr(obj, method)
             self.tasks[task_id] = (date, callback, args, kwargs, True, None)
+            self.to_save[task_id] = value
+            if task_id in old_tasks:
+                # move the task to its own row
+                self._pending_saves[task_id] = value
+
+        self.save()
+        if old_tasks:
+            ServerConfig.objects.conf("delayed_tasks", delete=True)
 
         if self.stale_timeout > 0:  # cleanup stale tasks.
             self.clean_stale_tasks()
-        if to_save:
-            self.save()
 
     def clean_stale_tasks(self):
         """remove uncalled but canceled from task handler.
@@ -268,51 +314,173 @@ class TaskHandler(object):
         To adjust this time use TASK_HANDLER.stale_timeout.
 
         """
+        # if a now time is provided use it (intended for unit testing)
+        now = self._now if self._now else datetime.now()
         clean_ids = []
-        for task_id, (date, callback, args, kwargs, persistent, _) in self.tasks.items():
-            if not self.active(task_id):
-                stale_date = date + timedelta(seconds=self.stale_timeout)
-                # if a now time is provided use it (intended for unit testing)
-                now = self._now if self._now else datetime.now()
+        # only tasks that were canceled or called can be stale
+        for task_id in self._inactive:
+            if task_id not in self.tasks:
+                clean_ids.append(task_id)
+            elif not self.active(task_id):
+                stale_date = self.tasks[task_id][0] + timedelta(seconds=self.stale_timeout)
                 # the task was canceled more than stale_timeout seconds ago
                 if now > stale_date:
                     clean_ids.append(task_id)
         for task_id in clean_ids:
             self.remove(task_id)
+            self._inactive.discard(task_id)
         return True
 
+    def _serialize(self, task_id):
+        """
+        Serialize a persistent task for storing in the database.
+
+        Args:
+            task_id (int): an existing task ID.
+
+        Returns:
+            str: The serialized task.
+
+        Raises:
+            ValueError: If the callback of the task can't be pickled.
+
+        """
+        date, callback, args, kwargs, persistent, _ = self.tasks[task_id]
+        safe_callback = callback
+        if getattr(callback, "__self__", None):
+            # `callback` is an instance method
+            obj = callback.__self__
+            name = callback.__name__
+            safe_callback = (obj, name)
+
+        # Check if callback can be pickled. args and kwargs have been checked
+        try:
+            dbserialize(safe_callback)
+        except (TypeError, AttributeError, PickleError) as err:
+            raise ValueError(
+                "the specified callback {callback} cannot be pickled. "
+                "It must be a top-level function in a module or an "
+                "instance method ({err}).".format(callback=callback, err=err)
+            )
+
+        return dbserialize((date, safe_callback, args, kwargs))
+
+    def _save_later(self, task_id, value):
+        """
+        Queue a change to a persistent task, to be written to the database
+        together with all other changes done this reactor-iteration.
+
+        Args:
+            task_id (int): The task to change.
+            value (str or None): The serialized task, or `None` to delete it.
+
+        """
+        self._pending_saves[task_id] = value
+        if not self._save_call:
+            self._save_call = self.clock.callLater(0, self.save)
+
     def save(self):
         """
-        Save the tasks in ServerConfig.
+        Write changes to persistent tasks to the database. This is called
+        automatically soon after a persistent task is added or removed.
 
         """
+        self._save_call = None
+        if not self._pending_saves:
+            return
+        pending, self._pending_saves = self._pending_saves, {}
 
-        for task_id, (date, callback, args, kwargs, persistent, _) in self.tasks.items():
-            if task_id in self.to_save:
-                continue
-            if not persistent:
-                continue
+        # replace all rows of changed tasks
+        keys = [f"{_TASK_KEY_PREFIX}{task_id}" for task_id in pending]
+        for start in range(0, len(keys), _TASK_DELETE_BATCH_SIZE):
+            ServerConfig.objects.filter(
+                db_key__in=keys[start : start + _TASK_DELETE_BATCH_SIZE]
+            ).delete()
+        ServerConfig.objects.bulk_create(
+            [
+                ServerConfig(db_key=f"{_TASK_KEY_PREFIX}{task_id}", db_value=value)
+                for task_id, value in pending.items()
+                if value is not None
+            ],
+            batch_size=_TASK_DELETE_BATCH_SIZE,
+        )
 
-            safe_callback = callback
-            if getattr(callback, "__self__", None):
-                # `callback` is an instance method
-                obj = callback.__self__
-                name = callback.__name__
-                safe_callback = (obj, name)
+    def _schedule(self, task_id, timedelay):
+        """
+        Schedule a task to be called.
 
-            # Check if callback can be pickled. args and kwargs have been checked
-            try:
-                dbserialize(safe_callback)
-            except (TypeError, AttributeError, PickleError) as err:
-                raise ValueError(
-                    "the specified callback {callback} cannot be pickled. "
-                    "It must be a top-level function in a module or an "
-                    "instance method ({err}).".format(callback=callback, err=err)
-                )
+        Args:
+            task_id (int): The task to call.
+            timedelay (int or float): Time in seconds before calling the task.
 
-            self.to_save[task_id] = dbserialize((date, safe_callback, args, kwargs))
+        Returns:
+            deferred: The deferred that will call the task. Cancel it to stop
+                the task from being called.
 
-        ServerConfig.objects.conf("delayed_tasks", self.to_save)
+        """
+        d = Deferred(canceller=lambda d: self._cancel_scheduled(task_id, d))
+        d.addCallback(lambda _: self.do_task(task_id))
+        d.addErrback(handle_error)
+        heappush(self._heap, (self.clock.seconds() + timedelay, next(self._heap_order), d))
+        self._start_timer()
+        return d
+
+    def _cancel_scheduled(self, task_id, d):
+        """
+        Called when a scheduled deferred is canceled. Canceled deferreds
+        are left in the heap, so it's rebuilt once they make up about
+        half of it.
+
+        Args:
+            task_id (int): The task that was canceled.
+            d (Deferred): The deferred being canceled.
+
+        """
+        self._inactive.add(task_id)
+        self._heap_canceled += 1
+        if self._heap_canceled * 2 > len(self._heap):
+            # d is not marked as called until after this returns
+            self._heap = [item for item in self._heap if not (item[2] is d or item[2].called)]
+            heapify(self._heap)
+            self._heap_canceled = 0
+
+    def _start_timer(self, *args):
+        """
+        Make sure there is a timer running for the next task in the heap.
+
+        """
+        heap = self._heap
+        timer = self._timer
+        if timer and (
+            not heap or self._timer_clock is not self.clock or heap[0][0] < self._timer_time
+        ):
+            # the timer is no longer for the next task
+            self._timer = None
+            timer.cancel()
+            timer = None
+        if heap and not timer:
+            self._timer_time = heap[0][0]
+            self._timer_clock = self.clock
+            self._timer = timer = deferLater(
+                self.clock, max(0, self._timer_time - self.clock.seconds()), self._call_due_tasks
+            )
+            timer.addCallback(self._start_timer)
+            timer.addErrback(handle_error)
+
+    def _call_due_tasks(self):
+        """
+        Call all tasks in the heap that are due. Called by the timer.
+
+        """
+        self._timer = None
+        heap = self._heap
+        now = self.clock.seconds()
+        while heap and heap[0][0] <= now:
+            d = heappop(heap)[2]
+            if d.called:  # canceled tasks stay in the heap until due or rebuilt
+                self._heap_canceled = max(0, self._heap_canceled - 1)
+            else:
+                d.callback(None)
 
     def add(self, timedelay, callback, *args, **kwargs):
         """
@@ -347,10 +515,10 @@ class TaskHandler(object):
         delta = timedelta(seconds=timedelay)
         comp_time = now + delta
         # get an open task id
-        used_ids = list(self.tasks.keys())
-        task_id = 1
-        while task_id in used_ids:
+        task_id = self._last_id + 1
+        while task_id in self.tasks:
             task_id += 1
+        self._last_id = task_id
 
         # record the task to the tasks dictionary
         persistent = kwargs.get("persistent", False)
@@ -386,26 +554,22 @@ class TaskHandler(object):
                     safe_kwargs[key] = value
 
             self.tasks[task_id] = (comp_time, callback, safe_args, safe_kwargs, persistent, None)
-            self.save()
+            try:
+                value = self._serialize(task_id)
+            except ValueError:
+                del self.tasks[task_id]
+                raise
+            self.to_save[task_id] = value
+            self._save_later(task_id, value)
         else:  # this is a non-persitent task
             self.tasks[task_id] = (comp_time, callback, args, kwargs, persistent, None)
 
         # defer the task
-        callback = self.do_task
-        args = [task_id]
-        kwargs = {}
-        d = deferLater(self.clock, timedelay, callback, *args, **kwargs)
-        d.addErrback(handle_error)
+        d = self._schedule(task_id, timedelay)
+        task = list(self.tasks[task_id])
+        task[5] = d
+        self.tasks[task_id] = task
 
-        # some tasks may complete before the deferred can be added
-        if task_id in self.tasks:
-            task = self.tasks.get(task_id)
-            task = list(task)
-            task[4] = persistent
-            task[5] = d
-            self.tasks[task_id] = task
-        else:  # the task already completed
-            return False
         if self.stale_timeout > 0:
             self.clean_stale_tasks()
         return TaskHandlerTask(task_id)
@@ -494,7 +658,7 @@ class TaskHandler(object):
         # remove the task from the persistent dictionary and ServerConfig
         if task_id in self.to_save:
             del self.to_save[task_id]
-            self.save()  # remove from ServerConfig.objects
+            self._save_later(task_id, None)  # remove from ServerConfig.objects
         # delete the instance of the deferred
         if d:
             del d
@@ -517,10 +681,22 @@ class TaskHandler(object):
                 if cancel:
                     self.cancel(task_id)
             self.tasks = {}
+        if cancel:
+            self._heap = []
+            self._heap_canceled = 0
+            self._start_timer()
+            self._last_id = 0
+        self._inactive = set()
         if self.to_save:
             self.to_save = {}
         if save:
-            self.save()
+            # the pending changes are dropped, so the queued save is not needed
+            if self._save_call and self._save_call.active():
+                self._save_call.cancel()
+            self._save_call = None
+            self._pending_saves = {}
+            ServerConfig.objects.filter(db_key__startswith=_TASK_KEY_PREFIX).delete()
+            ServerConfig.objects.conf("delayed_tasks", delete=True)
         return True
 
     def call_task(self, task_id):
@@ -569,6 +745,8 @@ class TaskHandler(object):
                 d.cancel()  # cancel the automated callback
         else:  # this task has no deferred, and should not be called
             return False
+        # if the callback fails, the task is left for clean_stale_tasks
+        self._inactive.add(task_id)
         callback_return = callback(*args, **kwargs)
         self.remove(task_id)
         return callback_return
@@ -598,13 +776,15 @@ class TaskHandler(object):
         """
         now = datetime.now()
         for task_id, (date, callback, args, kwargs, _, _) in self.tasks.items():
-            self.tasks[task_id] = date, callback, args, kwargs, True, None
             seconds = max(0, (date - now).total_seconds())
-            d = deferLater(self.clock, seconds, self.do_task, task_id)
-            d.addErrback(handle_error)
-            # some tasks may complete before the deferred can be added
-            if self.tasks.get(task_id, False):
-                self.tasks[task_id] = date, callback, args, kwargs, True, d
+            self.tasks[task_id] = (
+                date,
+                callback,
+                args,
+                kwargs,
+                True,
+                self._schedule(task_id, seconds),
+            )
 
 
 # Create the soft singleton
@@ -3,10 +3,12 @@ Unit tests for the scripts package
 
 """
 
+import time
 from unittest import TestCase, mock
 from collections import defaultdict
 
 from parameterized import parameterized
+from twisted.internet.task import Clock
 
 from evennia import DefaultScript
 from evennia.objects.objects import DefaultObject
@@ -14,7 +16,7 @@ from evennia.scripts.models import ObjectDoesNotExist, ScriptDB
 from evennia.scripts.scripts import DoNothing, ExtendedLoopingCall
 from evennia.utils.create import create_script
 from evennia.utils.test_resources import BaseEvenniaTest
-from evennia.scripts.tickerhandler import TickerHandler
+from evennia.scripts.tickerhandler import Ticker, TickerHandler
 from evennia.scripts.monitorhandler import MonitorHandler
 from evennia.scripts.manager import ScriptDBManager
 from evennia.utils.dbserialize import dbserialize
@@ -29,6 +31,56 @@ class TestScript(BaseEvenniaTest):
             self.assertFalse(errors, errors)
             mockinit.assert_called()
 
+def monitor_func(obj, fieldname, calls):
+    """ Monitor callback recording its calls """
+    calls.append((obj, fieldname))
+
+
+class TestMonitorHandlerDispatch(BaseEvenniaTest):
+    """
+    Test dispatching of saves to the global MonitorHandler.
+    """
+
+    def setUp(self):
+        super().setUp()
+        from evennia.scripts.monitorhandler import MONITOR_HANDLER
+
+        self.handler = MONITOR_HANDLER
+
+    def tearDown(self):
+        self.handler.clear()
+        super().tearDown()
+
+    def test_unmonitored_save(self):
+        """Saving an unmonitored object never reaches the handler"""
+        with mock.patch.object(self.handler, "at_update") as mock_at_update:
+            self.obj1.key = "foo"
+            mock_at_update.assert_not_called()
+
+    def test_monitored_save(self):
+        """Only monitored fields call their monitors"""
+        calls = []
+        self.handler.add(self.obj1, "db_key", monitor_func, idstring="test", calls=calls)
+        self.assertTrue(self.obj1._monitored)
+        self.assertFalse(self.obj2._monitored)
+        self.obj1.key = "foo"
+        self.obj1.location = self.room2
+        self.assertEqual(calls, [(self.obj1, "db_key")])
+
+        self.handler.remove(self.obj1, "db_key", idstring="test")
+        self.assertFalse(self.obj1._monitored)
+        self.obj1.key = "bar"
+        self.assertEqual(len(calls), 1)
+
+    def test_failing_callback(self):
+        """A failing monitor is removed"""
+        self.handler.add(self.obj1, "db_key", dummy_func, idstring="test")
+        with mock.patch("evennia.scripts.monitorhandler.logger"):
+            self.obj1.key = "foo"
+        self.assertEqual(self.handler.monitors[self.obj1]["db_key"], {})
+        self.assertFalse(self.obj1._monitored)
+
+
 class TestTickerHandler(TestCase):
     """ Test the TickerHandler class """
 
@@ -44,6 +96,57 @@ class TestTickerHandler(TestCase):
             th=TickerHandler()
             th.remove(callback=1)
 
+class TestTicker(TestCase):
+    """ Test the Ticker's timing wheel and time budget """
+
+    def _get_ticker(self, interval, num_subs):
+        ticker = Ticker(interval)
+        ticker.task.clock = Clock()
+        callbacks = []
+        for inum in range(num_subs):
+            callback = mock.MagicMock()
+            callbacks.append(callback)
+            ticker.add(("key", inum), _callback=callback, _obj=None)
+        return ticker, callbacks
+
+    @mock.patch("evennia.scripts.tickerhandler._TICKER_SLOTS", 3)
+    def test_slots(self):
+        ticker, callbacks = self._get_ticker(6, 7)
+        self.assertEqual([3, 2, 2], [len(slot) for slot in ticker.slots])
+        self.assertEqual(2, ticker.task.interval)
+
+        ticker._callback()
+        self.assertEqual(3, sum(callback.call_count for callback in callbacks))
+        ticker._callback()
+        ticker._callback()
+        for callback in callbacks:
+            callback.assert_called_once()
+        self.assertEqual(7, len(ticker.timings))
+
+        ticker.remove(("key", 0))
+        self.assertEqual([2, 2, 2], [len(slot) for slot in ticker.slots])
+        ticker.add(("key", 8), _callback=mock.MagicMock(), _obj=None)
+        self.assertEqual([3, 2, 2], [len(slot) for slot in ticker.slots])
+        ticker.stop()
+        self.assertFalse(ticker.task.running)
+
+    @mock.patch("evennia.scripts.tickerhandler._TICKER_TIME_BUDGET", 0.00001)
+    def test_time_budget(self):
+        ticker, callbacks = self._get_ticker(6, 5)
+        for callback in callbacks:
+            callback.side_effect = lambda: time.sleep(0.001)
+        deferred = ticker._callback()
+        self.assertFalse(deferred.called)
+        self.assertTrue(ticker._is_ticking)
+        self.assertLess(sum(callback.call_count for callback in callbacks), 5)
+        while not deferred.called:
+            ticker.task.clock.advance(0)
+        for callback in callbacks:
+            callback.assert_called_once()
+        self.assertFalse(ticker._is_ticking)
+        ticker.stop()
+
+
 class TestScriptDBManager(TestCase):
     """ Test the ScriptDBManger class """
 
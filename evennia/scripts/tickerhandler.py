@@ -66,9 +66,12 @@ call the handler's `save()` and `restore()` methods when the server reboots.
 
 """
 import inspect
+from time import perf_counter
 
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from twisted.internet.defer import inlineCallbacks
+from twisted.internet.task import deferLater
 
 from evennia.scripts.scripts import ExtendedLoopingCall
 from evennia.server.models import ServerConfig
@@ -79,6 +82,9 @@ from evennia.utils.logger import log_err, log_trace
 _GA = object.__getattribute__
 _SA = object.__setattr__
 
+_TICKER_SLOTS = max(1, int(settings.TICKER_SLOTS))
+_TICKER_TIME_BUDGET = settings.TICKER_TIME_BUDGET
+
 
 _ERROR_ADD_TICKER = """TickerHandler: Tried to add an invalid ticker:
 {store_key}
@@ -97,6 +103,22 @@ class Ticker(object):
     Represents a repeatedly running task that calls
     hooks repeatedly. Overload `_callback` to change the
     way it operates.
+
+    If `settings.TICKER_SLOTS` is larger than 1, the subscribers are
+    spread evenly over that many slots and the task runs once per slot
+    and interval, each time calling only the subscribers of the next slot
+    (a timing wheel). Each subscriber is still called once per `interval`,
+    but the load is spread out instead of all subscribers being called at
+    once.
+
+    If `settings.TICKER_TIME_BUDGET` is set, the ticker lets the reactor
+    handle other events whenever its callbacks have run for longer than
+    this many seconds, continuing with the rest in the next reactor
+    iteration.
+
+    The time each subscriber's callback took last time it was called is
+    stored in `.timings`, keyed on its store-key.
+
     """
 
     @inlineCallbacks
@@ -119,9 +141,25 @@ class Ticker(object):
         self._to_add = []
         self._to_remove = []
         self._is_ticking = True
-        for store_key, (args, kwargs) in self.subscriptions.items():
+        if self.num_slots > 1:
+            store_keys = list(self.slots[self.current_slot])
+            self.current_slot = (self.current_slot + 1) % self.num_slots
+        else:
+            store_keys = list(self.subscriptions)
+        time_budget = self.time_budget
+        budget_start = perf_counter()
+        for store_key in store_keys:
+            if time_budget and perf_counter() - budget_start > time_budget:
+                # let the reactor process other events before continuing
+                yield deferLater(self.task.clock, 0, lambda: None)
+                budget_start = perf_counter()
+            subscription = self.subscriptions.get(store_key)
+            if not subscription:
+                continue
+            args, kwargs = subscription
             callback = yield kwargs.pop("_callback", "at_tick")
             obj = yield kwargs.pop("_obj", None)
+            call_start = perf_counter()
             try:
                 if callable(callback):
                     # call directly
@@ -143,6 +181,7 @@ class Ticker(object):
                 # make sure to re-store
                 kwargs["_callback"] = callback
                 kwargs["_obj"] = obj
+                self.timings[store_key] = perf_counter() - call_start
         # cleanup - we do this here to avoid changing the subscription dict while it loops
         self._is_ticking = False
         for store_key in self._to_remove:
@@ -162,6 +201,12 @@ class Ticker(object):
         """
         self.interval = interval
         self.subscriptions = {}
+        self.timings = {}
+        self.time_budget = _TICKER_TIME_BUDGET
+        # the timing wheel - each slot is a dict {store_key: True}
+        self.num_slots = _TICKER_SLOTS
+        self.slots = [{} for _ in range(self.num_slots)]
+        self.current_slot = 0
         self._is_ticking = False
         self._to_remove = []
         self._to_add = []
@@ -182,7 +227,7 @@ class Ticker(object):
             if not subs:
                 self.task.stop()
         elif subs:
-            self.task.start(self.interval, now=False, start_delay=start_delay)
+            self.task.start(self.interval / self.num_slots, now=False, start_delay=start_delay)
 
     def add(self, store_key, *args, **kwargs):
         """
@@ -203,6 +248,9 @@ class Ticker(object):
             self._to_add.append((store_key, (args, kwargs)))
         else:
             start_delay = kwargs.pop("_start_delay", None)
+            if self.num_slots > 1 and store_key not in self.subscriptions:
+                # put it in the least busy slot
+                min(self.slots, key=len)[store_key] = True
             self.subscriptions[store_key] = (args, kwargs)
             self.validate(start_delay=start_delay)
 
@@ -220,6 +268,10 @@ class Ticker(object):
             self._to_remove.append(store_key)
         else:
             self.subscriptions.pop(store_key, False)
+            self.timings.pop(store_key, None)
+            for slot in self.slots:
+                if slot.pop(store_key, None):
+                    break
             self.validate()
 
     def stop(self):
@@ -228,6 +280,8 @@ class Ticker(object):
 
         """
         self.subscriptions = {}
+        self.timings = {}
+        self.slots = [{} for _ in range(self.num_slots)]
         self.validate()
 
 
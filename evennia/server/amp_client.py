@@ -7,7 +7,7 @@ Portal. This module sets up the Client-side communication.
 import os
 
 from django.conf import settings
-from twisted.internet import protocol
+from twisted.internet import protocol, reactor
 
 from evennia.server.portal import amp
 from evennia.utils import logger
@@ -101,6 +101,23 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
 
     """
 
+    def __init__(self, *args, **kwargs):
+        # messages waiting to be sent to the Portal at the end of this reactor iteration
+        self.msg_batch = []
+        self.msg_batch_task = None
+        super().__init__(*args, **kwargs)
+
+    def connectionLost(self, reason):
+        """
+        Drop any messages still waiting to be sent over this connection.
+
+        """
+        if self.msg_batch_task and self.msg_batch_task.active():
+            self.msg_batch_task.cancel()
+        self.msg_batch_task = None
+        self.msg_batch = []
+        super().connectionLost(reason)
+
     # sending AMP data
 
     def connectionMade(self):
@@ -137,10 +154,34 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
 
         """
         # print("server data_to_portal: {}, {}, {}".format(command, sessid, kwargs))
+        # make sure batched messages are not overtaken by this one
+        self.flush_msg_batch()
         return self.callRemote(command, packed_data=amp.dumps((sessid, kwargs))).addErrback(
             self.errback, command.key
         )
 
+    def flush_msg_batch(self):
+        """
+        Send all batched messages to the Portal. If there is more than one,
+        they are sent together as a single AMP command.
+
+        Returns:
+            deferred (deferred or None): A deferred with an errback, or `None`
+                if there was nothing to send.
+
+        """
+        if self.msg_batch_task and self.msg_batch_task.active():
+            self.msg_batch_task.cancel()
+        self.msg_batch_task = None
+        batch, self.msg_batch = self.msg_batch, []
+        if not batch:
+            return None
+        # a lone message is sent as-is, a batch as a list of (sessid, kwargs)
+        packed_data = amp.dumps(batch[0] if len(batch) == 1 else batch)
+        return self.callRemote(amp.MsgServer2Portal, packed_data=packed_data).addErrback(
+            self.errback, amp.MsgServer2Portal.key
+        )
+
     def send_MsgServer2Portal(self, session, **kwargs):
         """
         Access method - executed on the Server for sending data
@@ -150,8 +191,15 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
             session (Session): Unique Session.
             kwargs (any, optiona): Extra data.
 
+        Notes:
+            The message is not sent immediately but is batched with all
+            other messages sent during the same reactor iteration. Use
+            `flush_msg_batch` to force sending.
+
         """
-        return self.data_to_portal(amp.MsgServer2Portal, session.sessid, **kwargs)
+        self.msg_batch.append((session.sessid, kwargs))
+        if not self.msg_batch_task:
+            self.msg_batch_task = reactor.callLater(0, self.flush_msg_batch)
 
     def send_AdminServer2Portal(self, session, operation="", **kwargs):
         """
@@ -24,6 +24,7 @@ import importlib
 from codecs import lookup as codecs_lookup
 
 from django.conf import settings
+from twisted.internet import reactor
 
 from evennia.accounts.models import AccountDB
 from evennia.commands.cmdhandler import cmdhandler
@@ -410,8 +411,43 @@ def unrepeat(session, *args, **kwargs):
 
 _monitorable = {"name": "db_key", "location": "db_location", "desc": "desc"}
 
+# monitored changes waiting to be sent, {session: {outputfunc_name: {name: value}}}
+_MONITOR_CHANGES = {}
+_MONITOR_SEND_CALL = None
+
+
+def _send_monitor_changes():
+    """
+    Send all monitored changes queued up during this reactor-iteration. Each
+    change is sent on the normal form `{"name": name, "value": value}`, with
+    the changes for different outputfuncs combined into as few messages as
+    possible.
+
+    """
+    global _MONITOR_SEND_CALL
+    _MONITOR_SEND_CALL = None
+    changes = dict(_MONITOR_CHANGES)
+    _MONITOR_CHANGES.clear()
+    for session, outputs in changes.items():
+        outputs = {
+            outputfunc_name: list(fields.items()) for outputfunc_name, fields in outputs.items()
+        }
+        while outputs:
+            session.msg(
+                **{
+                    outputfunc_name: {"name": fields[0][0], "value": fields[0][1]}
+                    for outputfunc_name, fields in outputs.items()
+                }
+            )
+            outputs = {
+                outputfunc_name: fields[1:]
+                for outputfunc_name, fields in outputs.items()
+                if len(fields) > 1
+            }
+
 
 def _on_monitor_change(**kwargs):
+    global _MONITOR_SEND_CALL
     fieldname = kwargs["fieldname"]
     obj = kwargs["obj"]
     name = kwargs["name"]
@@ -422,8 +458,11 @@ def _on_monitor_change(**kwargs):
     # else then edits the object
 
     if session:
-        callsign = {outputfunc_name: {"name": name, "value": _GA(obj, fieldname)}}
-        session.msg(**callsign)
+        # only the last change of a field is sent
+        outputs = _MONITOR_CHANGES.setdefault(session, {})
+        outputs.setdefault(outputfunc_name, {})[name] = _GA(obj, fieldname)
+        if not _MONITOR_SEND_CALL:
+            _MONITOR_SEND_CALL = reactor.callLater(0, _send_monitor_changes)
 
 
 def monitor(session, *args, **kwargs):
@@ -444,7 +483,7 @@ def monitor(session, *args, **kwargs):
     from evennia.scripts.monitorhandler import MONITOR_HANDLER
 
     name = kwargs.get("name", None)
-    outputfunc_name = kwargs("outputfunc_name", "monitor")
+    outputfunc_name = kwargs.get("outputfunc_name", "monitor")
     if name and name in _monitorable and session.puppet:
         field_name = _monitorable[name]
         obj = session.puppet
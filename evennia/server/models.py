@@ -12,7 +12,7 @@ from django.db import models
 
 from evennia.server.manager import ServerConfigManager
 from evennia.utils import logger, picklefield, utils
-from evennia.utils.dbserialize import from_pickle, to_pickle
+from evennia.utils.dbserialize import discard_pending_save, from_pickle, to_pickle
 from evennia.utils.idmapper.models import WeakSharedMemoryModel
 
 # ------------------------------------------------------------
@@ -97,6 +97,7 @@ class ServerConfig(WeakSharedMemoryModel):
             # we have to protect against storing db objects.
             logger.log_err("ServerConfig cannot store db objects! (%s)" % value)
             return
+        discard_pending_save(self)
         self.db_value = to_pickle(value)
         self.save()
 
@@ -5,7 +5,6 @@ This module acts as a central place for AMP-servers and -clients to get commands
 
 """
 
-import pickle
 import time
 import zlib  # Used in Compressed class
 from collections import defaultdict, namedtuple
@@ -13,10 +12,11 @@ from functools import wraps
 from io import BytesIO
 from itertools import count
 
+from django.conf import settings
 from twisted.internet.defer import Deferred, DeferredList
 from twisted.protocols import amp
 
-from evennia.utils.utils import variable_from_module
+from evennia.utils.utils import class_from_module, variable_from_module
 
 # delayed import
 _LOGGER = None
@@ -46,6 +46,18 @@ NUL = b"\x00"
 NULNUL = b"\x00\x00"
 
 AMP_MAXLEN = amp.MAX_VALUE_LENGTH  # max allowed data length in AMP protocol (cannot be changed)
+# how much data to put in each box-value, leaving room for compression overhead
+_AMP_CHUNKLEN = AMP_MAXLEN - 512
+
+# compression of data on the wire
+_COMPRESSION_THRESHOLD = settings.AMP_COMPRESSION_THRESHOLD
+_COMPRESSION_LEVEL = settings.AMP_COMPRESSION_LEVEL
+_COMPRESSION_STREAMING = settings.AMP_COMPRESSION_STREAMING
+# headers marking how each chunk of data was compressed. Data without a header
+# (starting with the zlib header byte 'x') is from an older Evennia version.
+_UNCOMPRESSED = b"\x01"
+_ZLIB = b"\x02"
+_ZLIB_STREAM = b"\x03"
 
 # amp internal
 ASK = b"_ask"
@@ -59,6 +71,16 @@ UNKNOWN_ERROR_CODE = b"UNKNOWN"
 _SENDBATCH = defaultdict(list)
 _MSGBUFFER = defaultdict(list)
 
+# statistics for data passing through the Compressed argument
+_AMP_STATS = {
+    "bytes_out": 0,  # data sent, before compression
+    "bytes_out_wire": 0,  # data sent, after compression
+    "bytes_in": 0,  # data received, after decompression
+    "bytes_in_wire": 0,  # data received, before decompression
+    "compress_time": 0.0,
+    "decompress_time": 0.0,
+}
+
 # resources
 
 DUMMYSESSION = namedtuple("DummySession", ["sessid"])(0)
@@ -82,15 +104,25 @@ Content-Type: text/html
 )
 
 
-# Helper functions for pickling.
+# Helper functions for serializing data (pickle by default)
+
+_CODEC = class_from_module(settings.AMP_CODEC_CLASS)
+dumps = _CODEC.dumps
+loads = _CODEC.loads
 
 
-def dumps(data):
-    return pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+def amp_stats():
+    """
+    Get statistics of the data passed over AMP by this process.
 
+    Returns:
+        dict: Byte counts (`bytes_out`, `bytes_out_wire`, `bytes_in`,
+            `bytes_in_wire`) and time spent (`compress_time`, `decompress_time`,
+            in seconds) since the process started. The `_wire` counts are the
+            actual (compressed) sizes sent/received.
 
-def loads(data):
-    return pickle.loads(data)
+    """
+    return dict(_AMP_STATS)
 
 
 def _get_logger():
@@ -132,6 +164,10 @@ class Compressed(amp.String):
     batch-grouping of too-long sends is borrowed from the "mediumbox"
     recipy at twisted-hacks's ~glyph/+junk/amphacks/mediumbox.
 
+    Data smaller than `settings.AMP_COMPRESSION_THRESHOLD` is sent
+    uncompressed. Each chunk on the wire starts with a header byte telling
+    how it was compressed, so the receiving side needs no configuration.
+
     """
 
     def fromBox(self, name, strings, objects, proto):
@@ -161,12 +197,12 @@ class Compressed(amp.String):
         # print("toBox: name={}, strings={}, objects={}, proto{}".format(name, strings, objects, proto))
 
         value = BytesIO(objects[str(name, "utf-8")])
-        strings[name] = self.toStringProto(value.read(AMP_MAXLEN), proto)
+        strings[name] = self.toStringProto(value.read(_AMP_CHUNKLEN), proto)
 
         # print("toBox strings[name] = {}".format(strings[name]))
 
         for counter in count(2):
-            chunk = value.read(AMP_MAXLEN)
+            chunk = value.read(_AMP_CHUNKLEN)
             if not chunk:
                 break
             strings[b"%s.%d" % (name, counter)] = self.toStringProto(chunk, proto)
@@ -178,14 +214,73 @@ class Compressed(amp.String):
         Note: In Py3 this is really a byte stream.
 
         """
-        return zlib.compress(super().toString(inObject), 9)
+        return self.toStringProto(inObject, None)
 
     def fromString(self, inString):
         """
         Convert (decompress) from the string-representation on the wire to Python.
 
         """
-        return super().fromString(zlib.decompress(inString))
+        return self.fromStringProto(inString, None)
+
+    def toStringProto(self, inObject, proto):
+        """
+        Compress data to send over the given connection.
+
+        Args:
+            inObject (bytes): The data to send.
+            proto (AMPMultiConnectionProtocol or None): The connection to send
+                over. Used to find the compression context when streaming.
+
+        Returns:
+            bytes: The data to put on the wire.
+
+        """
+        data = super().toString(inObject)
+        t0 = time.perf_counter()
+        compressor = getattr(proto, "compressor", None) if _COMPRESSION_STREAMING else None
+        if len(data) < _COMPRESSION_THRESHOLD:
+            out = _UNCOMPRESSED + data
+        elif compressor:
+            # this must always be sent, since the other side's decompressor
+            # must see all data this compressor has seen
+            out = _ZLIB_STREAM + compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        else:
+            out = zlib.compress(data, _COMPRESSION_LEVEL)
+            out = _ZLIB + out if len(out) < len(data) else _UNCOMPRESSED + data
+        _AMP_STATS["compress_time"] += time.perf_counter() - t0
+        _AMP_STATS["bytes_out"] += len(data)
+        _AMP_STATS["bytes_out_wire"] += len(out)
+        return out
+
+    def fromStringProto(self, inString, proto):
+        """
+        Decompress data received over the given connection.
+
+        Args:
+            inString (bytes): The data from the wire.
+            proto (AMPMultiConnectionProtocol or None): The connection the data
+                came from. Used to find the decompression context when streaming.
+
+        Returns:
+            bytes: The decompressed data.
+
+        """
+        t0 = time.perf_counter()
+        header = inString[:1]
+        if header == _UNCOMPRESSED:
+            data = inString[1:]
+        elif header == _ZLIB:
+            data = zlib.decompress(inString[1:])
+        elif header == _ZLIB_STREAM:
+            data = proto.decompressor.decompress(inString[1:])
+        else:
+            # from an older version, always compressed
+            data = zlib.decompress(inString)
+        _AMP_STATS["decompress_time"] += time.perf_counter() - t0
+        _AMP_STATS["bytes_in"] += len(data)
+        _AMP_STATS["bytes_in_wire"] += len(inString)
+        return super().fromString(data)
 
 
 class MsgLauncher2Portal(amp.Command):
@@ -313,6 +408,9 @@ class AMPMultiConnectionProtocol(amp.AMP):
         self.send_mode = True
         self.send_task = None
         self.multibatches = 0
+        # running compression contexts for this connection (if streaming)
+        self.compressor = zlib.compressobj(_COMPRESSION_LEVEL) if _COMPRESSION_STREAMING else None
+        self.decompressor = zlib.decompressobj()
         # later twisted amp has its own __init__
         super().__init__(*args, **kwargs)
 
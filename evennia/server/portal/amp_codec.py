@@ -0,0 +1,297 @@
+"""
+Codecs for serializing data sent between Portal and Server over AMP.
+
+The codec to use is set with `settings.AMP_CODEC_CLASS`. A codec is a
+class with two static methods, `dumps(data) -> bytes` and
+`loads(bytes) -> data`.
+
+- `PickleCodec` - the default. Handles any picklable Python object.
+- `CompactCodec` - A msgpack-style binary format implemented in pure
+  Python. It handles the data normally passed between Portal and Server
+  (`None`, bools, ints, floats, strings, bytes, lists, tuples and dicts of
+  these) without pickle. Anything else falls back to pickle for that
+  message.
+- `StrictCompactCodec` - The same format as `CompactCodec`, but never uses
+  pickle. Data it can't encode raises an error instead, and it refuses to
+  load anything but the compact format, so no pickled data is ever loaded.
+
+`PickleCodec` and `CompactCodec` can load data from either, so Portal and
+Server can use different codecs (like when changing codec without
+restarting the Portal). `StrictCompactCodec` must be used by both.
+
+Use `benchmark()` to compare the size and speed of the codecs.
+
+"""
+
+import pickle
+import timeit
+from struct import Struct
+
+# marks data encoded with CompactCodec (pickled data always starts with \x80)
+_COMPACT_MARKER = b"\xc1"
+
+_NONE = 0xC0
+_FALSE = 0xC2
+_TRUE = 0xC3
+_BIN = 0xC6
+_FLOAT = 0xCB
+_INT = 0xD3
+_TUPLE = 0xD4
+_STR = 0xDB
+_LIST = 0xDD
+_DICT = 0xDF
+# small values are stored directly in the type byte
+_FIXMAP = 0x80  # dict with up to 15 items
+_FIXLIST = 0x90  # list with up to 15 items
+_FIXSTR = 0xA0  # str with up to 31 bytes (utf-8)
+_NEGFIXINT = 0xE0  # ints -32 to -1 (0 to 127 are stored as themselves)
+
+_UINT32 = Struct(">I")
+_INT64 = Struct(">q")
+_FLOAT64 = Struct(">d")
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+class _Unencodable(Exception):
+    """
+    Raised when data cannot be encoded with the compact codec.
+
+    """
+
+    pass
+
+
+class PickleCodec:
+    """
+    Serialize AMP data with pickle.
+
+    """
+
+    @staticmethod
+    def dumps(data):
+        return pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def loads(data):
+        if data[:1] == _COMPACT_MARKER:
+            return CompactCodec.loads(data)
+        return pickle.loads(data)
+
+
+def _encode(obj, out):
+    """
+    Encode an object into the compact format.
+
+    Args:
+        obj (any): The object to encode.
+        out (bytearray): Encoded data is added to this.
+
+    Raises:
+        _Unencodable: If `obj` is (or contains) something that
+            can't be encoded.
+
+    """
+    typ = type(obj)
+    if typ is str:
+        data = obj.encode("utf-8", "strict")
+        length = len(data)
+        if length < 32:
+            out.append(_FIXSTR | length)
+        else:
+            out.append(_STR)
+            out += _UINT32.pack(length)
+        out += data
+    elif typ is dict:
+        length = len(obj)
+        if length < 16:
+            out.append(_FIXMAP | length)
+        else:
+            out.append(_DICT)
+            out += _UINT32.pack(length)
+        for key, value in obj.items():
+            _encode(key, out)
+            _encode(value, out)
+    elif typ is list:
+        length = len(obj)
+        if length < 16:
+            out.append(_FIXLIST | length)
+        else:
+            out.append(_LIST)
+            out += _UINT32.pack(length)
+        for item in obj:
+            _encode(item, out)
+    elif typ is tuple:
+        out.append(_TUPLE)
+        out += _UINT32.pack(len(obj))
+        for item in obj:
+            _encode(item, out)
+    elif typ is int:
+        if 0 <= obj < 128:
+            out.append(obj)
+        elif -32 <= obj < 0:
+            out.append(obj & 0xFF)
+        elif _INT64_MIN <= obj <= _INT64_MAX:
+            out.append(_INT)
+            out += _INT64.pack(obj)
+        else:
+            raise _Unencodable(obj)
+    elif obj is None:
+        out.append(_NONE)
+    elif typ is bool:
+        out.append(_TRUE if obj else _FALSE)
+    elif typ is float:
+        out.append(_FLOAT)
+        out += _FLOAT64.pack(obj)
+    elif typ is bytes:
+        out.append(_BIN)
+        out += _UINT32.pack(len(obj))
+        out += obj
+    else:
+        # this includes subclasses of the above types, which would
+        # otherwise lose their class
+        raise _Unencodable(obj)
+
+
+def _decode(data, pos):
+    """
+    Decode one object from the compact format.
+
+    Args:
+        data (bytes): The encoded data.
+        pos (int): Where in `data` the object starts.
+
+    Returns:
+        tuple: `(obj, pos)`, the decoded object and the position after it.
+
+    """
+    code = data[pos]
+    pos += 1
+    if code < 0x80:
+        return code, pos
+    if code >= _NEGFIXINT:
+        return code - 0x100, pos
+    if _FIXSTR <= code < _FIXSTR + 32:
+        end = pos + (code & 0x1F)
+        return data[pos:end].decode("utf-8"), end
+    if _FIXMAP <= code < _FIXMAP + 16:
+        return _decode_dict(data, pos, code & 0x0F)
+    if _FIXLIST <= code < _FIXLIST + 16:
+        return _decode_list(data, pos, code & 0x0F)
+    if code == _NONE:
+        return None, pos
+    if code == _TRUE:
+        return True, pos
+    if code == _FALSE:
+        return False, pos
+    if code == _INT:
+        return _INT64.unpack_from(data, pos)[0], pos + 8
+    if code == _FLOAT:
+        return _FLOAT64.unpack_from(data, pos)[0], pos + 8
+    length = _UINT32.unpack_from(data, pos)[0]
+    pos += 4
+    if code == _STR:
+        end = pos + length
+        return data[pos:end].decode("utf-8"), end
+    if code == _TUPLE:
+        lst, pos = _decode_list(data, pos, length)
+        return tuple(lst), pos
+    if code == _DICT:
+        return _decode_dict(data, pos, length)
+    if code == _LIST:
+        return _decode_list(data, pos, length)
+    if code == _BIN:
+        end = pos + length
+        return bytes(data[pos:end]), end
+    raise ValueError(f"Unknown type code {code} in AMP data.")
+
+
+def _decode_list(data, pos, length):
+    lst = []
+    for _ in range(length):
+        item, pos = _decode(data, pos)
+        lst.append(item)
+    return lst, pos
+
+
+def _decode_dict(data, pos, length):
+    dct = {}
+    for _ in range(length):
+        key, pos = _decode(data, pos)
+        dct[key], pos = _decode(data, pos)
+    return dct, pos
+
+
+class CompactCodec:
+    """
+    Serialize AMP data with a compact binary format, falling back to pickle
+    for data it can't handle.
+
+    """
+
+    @staticmethod
+    def dumps(data):
+        out = bytearray(_COMPACT_MARKER)
+        try:
+            _encode(data, out)
+        except (_Unencodable, UnicodeEncodeError, RecursionError):
+            return PickleCodec.dumps(data)
+        return bytes(out)
+
+    @staticmethod
+    def loads(data):
+        if data[:1] != _COMPACT_MARKER:
+            return pickle.loads(data)
+        obj, _ = _decode(data, 1)
+        return obj
+
+
+class StrictCompactCodec:
+    """
+    Serialize AMP data with the compact binary format only, never
+    using pickle.
+
+    """
+
+    @staticmethod
+    def dumps(data):
+        out = bytearray(_COMPACT_MARKER)
+        try:
+            _encode(data, out)
+        except _Unencodable as err:
+            raise TypeError(f"AMP data {err.args[0]!r} can't be encoded without pickle.")
+        return bytes(out)
+
+    @staticmethod
+    def loads(data):
+        if data[:1] != _COMPACT_MARKER:
+            raise ValueError("Refusing to load AMP data that is not in the compact format.")
+        obj, _ = _decode(data, 1)
+        return obj
+
+
+def benchmark(data, codecs=(PickleCodec, CompactCodec), number=1000):
+    """
+    Compare the size and speed of AMP codecs for some data.
+
+    Args:
+        data (any): The data to serialize.
+        codecs (tuple, optional): The codec classes to compare.
+        number (int, optional): How many times to serialize the data.
+
+    Returns:
+        dict: `{codec_name: {"size": int, "dumps": float, "loads": float}}`,
+            the size of the serialized data in bytes and the seconds it took
+            to dump and load it `number` times.
+
+    """
+    results = {}
+    for codec in codecs:
+        wire = codec.dumps(data)
+        results[codec.__name__] = {
+            "size": len(wire),
+            "dumps": timeit.timeit(lambda: codec.dumps(data), number=number),
+            "loads": timeit.timeit(lambda: codec.loads(wire), number=number),
+        }
+    return results
@@ -374,14 +374,24 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
         This method is executed on the Portal.
 
         Args:
-            packed_data (str): Pickled data (sessid, kwargs) coming over the wire.
+            packed_data (str): Pickled data (sessid, kwargs) coming over the wire,
+                or a list of such tuples if the Server batched several messages.
 
         """
         try:
-            sessid, kwargs = self.data_in(packed_data)
-            session = self.factory.portal.sessions.get(sessid, None)
+            data = self.data_in(packed_data)
+        except Exception:
+            logger.log_trace("packed_data len {}".format(len(packed_data)))
+            return {}
+        sessions = self.factory.portal.sessions
+        if isinstance(data, list):
+            sessions.data_out_batch(data)
+            return {}
+        try:
+            sessid, kwargs = data
+            session = sessions.get(sessid, None)
             if session:
-                self.factory.portal.sessions.data_out(session, **kwargs)
+                sessions.data_out(session, **kwargs)
         except Exception:
             logger.log_trace("packed_data len {}".format(len(packed_data)))
         return {}
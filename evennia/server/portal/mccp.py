@@ -11,11 +11,16 @@ as normal.  Note: On modern hardware you are not likely to notice the
 effect of MCCP unless you have extremely heavy traffic or sits on a
 terribly slow connection.
 
-This protocol is implemented by the telnet protocol importing
-mccp_compress and calling it from its write methods.
+This protocol is implemented by the telnet protocol sending all its
+output through `Mccp.write` once compression is active. Compressed output
+is buffered and flushed to the client once per reactor iteration, so
+everything sent in one go (like a room's worth of messages) shares a single
+sync-flush of the compression stream.
 """
 import zlib
 
+from twisted.internet import reactor
+
 # negotiations for v1 and v2 of the protocol
 MCCP = bytes([86])  # b"\x56"
 FLUSH = zlib.Z_SYNC_FLUSH
@@ -58,6 +63,9 @@ class Mccp:
 
         self.protocol = protocol
         self.protocol.protocol_flags["MCCP"] = False
+        # compressed data waiting to be flushed to the client
+        self.buffer = []
+        self.flush_call = None
         # ask if client will mccp, connect callbacks to handle answer
         self.protocol.will(MCCP).addCallbacks(self.do_mccp, self.no_mccp)
 
@@ -70,6 +78,8 @@ class Mccp:
 
         """
         if hasattr(self.protocol, "zlib"):
+            # send what was compressed so far before turning off compression
+            self.flush()
             del self.protocol.zlib
         self.protocol.protocol_flags["MCCP"] = False
         self.protocol.handshake_done()
@@ -87,3 +97,31 @@ class Mccp:
         self.protocol.requestNegotiation(MCCP, b"")
         self.protocol.zlib = zlib.compressobj(9)
         self.protocol.handshake_done()
+
+    def write(self, data):
+        """
+        Compress data for sending to the client. The compressed data is
+        sent at the end of the current reactor iteration (or when calling
+        `flush`).
+
+        Args:
+            data (bytes): Data to send.
+
+        """
+        self.buffer.append(self.protocol.zlib.compress(data))
+        if not self.flush_call:
+            self.flush_call = reactor.callLater(0, self.flush)
+
+    def flush(self):
+        """
+        Flush the compression stream and send all compressed data to the client.
+
+        """
+        if self.flush_call and self.flush_call.active():
+            self.flush_call.cancel()
+        self.flush_call = None
+        if not self.buffer or not hasattr(self.protocol, "zlib"):
+            return
+        self.buffer.append(self.protocol.zlib.flush(FLUSH))
+        buffer, self.buffer = self.buffer, []
+        self.protocol.transport.writeSequence([chunk for chunk in buffer if chunk])
@@ -70,6 +70,10 @@ class PortalSessionHandler(SessionHandler):
         self.connection_last = self.uptime
         self.connection_task = None
 
+        # while relaying a batch of messages from the Server, protocols can store
+        # rendered output here to re-use for other sessions with the same settings
+        self.output_cache = None
+
     def at_server_connection(self):
         """
         Called when the Portal establishes connection with the Server.
@@ -488,6 +492,30 @@ class PortalSessionHandler(SessionHandler):
                     except Exception:
                         log_trace()
 
+    def data_out_batch(self, messages):
+        """
+        Called by server for having the portal relay several messages, such as
+        everything sent during one Server reactor iteration. Protocols can use
+        `self.output_cache` while this runs, so a message sent to many sessions
+        with the same settings (like a broadcast) only needs to be rendered once.
+
+        Args:
+            messages (list): A list of tuples `(sessid, kwargs)`, where `kwargs` is
+                what would be passed to `data_out`.
+
+        """
+        self.output_cache = {}
+        try:
+            for sessid, kwargs in messages:
+                try:
+                    session = self.get(sessid, None)
+                    if session:
+                        self.data_out(session, **kwargs)
+                except Exception:
+                    log_trace()
+        finally:
+            self.output_cache = None
+
 
 _PORTAL_SESSION_HANDLER_CLASS = class_from_module(settings.PORTAL_SESSION_HANDLER_CLASS)
 PORTAL_SESSIONS = _PORTAL_SESSION_HANDLER_CLASS()
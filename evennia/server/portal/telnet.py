@@ -11,7 +11,7 @@ import re
 
 from django.conf import settings
 from evennia.server.portal import mssp, naws, suppress_ga, telnet_oob, ttype
-from evennia.server.portal.mccp import MCCP, Mccp, mccp_compress
+from evennia.server.portal.mccp import MCCP, Mccp
 from evennia.server.portal.mxp import Mxp, mxp_parse
 from evennia.utils import ansi
 from evennia.utils.utils import class_from_module, to_bytes
@@ -294,6 +294,9 @@ class TelnetProtocol(Telnet, StatefulTelnetProtocol, _BASE_SESSION_CLASS):
             reason (str): Motivation for losing connection.
 
         """
+        if hasattr(self, "zlib"):
+            # send any compressed output still waiting
+            self.mccp.flush()
         self.sessionhandler.disconnect(self)
         self.transport.loseConnection()
 
@@ -338,21 +341,37 @@ class TelnetProtocol(Telnet, StatefulTelnetProtocol, _BASE_SESSION_CLASS):
         for dat in data:
             self.data_in(text=dat + b"\n")
 
+    def _send(self, data):
+        """
+        Send data to the client, compressing it if MCCP is active.
+
+        Args:
+            data (bytes): Data to send.
+
+        """
+        if hasattr(self, "zlib"):
+            self.mccp.write(data)
+        else:
+            self.transport.write(data)
+
     def _write(self, data):
         """
         Hook overloading the one used in plain telnet
 
         """
         data = data.replace(b"\n", b"\r\n").replace(b"\r\r\n", b"\r\n")
-        super()._write(mccp_compress(self, data))
+        self._send(data)
 
-    def sendLine(self, line):
+    def _render_line(self, line):
         """
-        Hook overloading the one used by linereceiver.
+        Convert a line to the bytes sent to the client.
 
         Args:
             line (str): Line to send.
 
+        Returns:
+            bytes: The line, ready to send.
+
         """
         line = to_bytes(line, self)
         # escape IAC in line mode, and correctly add \r\n (the TELNET end-of-line)
@@ -362,7 +381,17 @@ class TelnetProtocol(Telnet, StatefulTelnetProtocol, _BASE_SESSION_CLASS):
             line += b"\r\n"
         if not self.protocol_flags.get("NOGOAHEAD", True):
             line += IAC + GA
-        return self.transport.write(mccp_compress(self, line))
+        return line
+
+    def sendLine(self, line):
+        """
+        Hook overloading the one used by linereceiver.
+
+        Args:
+            line (str): Line to send.
+
+        """
+        self._send(self._render_line(line))
 
     # Session hooks
 
@@ -444,61 +473,106 @@ class TelnetProtocol(Telnet, StatefulTelnetProtocol, _BASE_SESSION_CLASS):
         echo = options.get("echo", None)
         mxp = options.get("mxp", flags.get("MXP", False))
         screenreader = options.get("screenreader", flags.get("SCREENREADER", False))
+        prompt = options.get("send_prompt", False)
+
+        if echo is not None and not prompt:
+            # turn on/off echo. Note that this is a bit turned around since we use
+            # echo as if we are "turning off the client's echo" when telnet really
+            # handles it the other way around.
+            if echo:
+                # by telling the client that WE WON'T echo, the client knows
+                # that IT should echo. This is the expected behavior from
+                # our perspective.
+                self._send(IAC + WONT + ECHO)
+            else:
+                # by telling the client that WE WILL echo, the client can
+                # safely turn OFF its OWN echo.
+                self._send(IAC + WILL + ECHO)
+
+        # sessions sent the same text with the same settings get the same output,
+        # so when relaying a batch of messages, it's only rendered once for all of them.
+        output_cache = getattr(self.sessionhandler, "output_cache", None)
+        if output_cache is not None:
+            cachekey = (
+                text,
+                prompt,
+                raw,
+                nocolor,
+                xterm256,
+                mxp,
+                screenreader,
+                flags.get("ENCODING"),
+                flags.get("FORCEDENDLINE", True),
+                flags.get("NOGOAHEAD", True),
+                flags.get("NOPROMPTGOAHEAD"),
+            )
+            try:
+                output = output_cache.get(cachekey)
+            except TypeError:
+                # unhashable text
+                output_cache = output = None
+        else:
+            output = None
+
+        if output is None:
+            output = self._render_text(text, prompt, raw, nocolor, xterm256, mxp, screenreader)
+            if output_cache is not None:
+                output_cache[cachekey] = output
+        self._send(output)
+
+    def _render_text(self, text, prompt, raw, nocolor, xterm256, mxp, screenreader):
+        """
+        Convert text to the bytes sent to the client. See `send_text` for the options.
 
+        Args:
+            text (str): The text to send.
+            prompt (bool): If this is a prompt (not ending with a line break).
+            raw (bool): Don't do any ansi processing.
+            nocolor (bool): Strip all color.
+            xterm256 (bool): Use xterm256 colors.
+            mxp (bool): Use MXP links.
+            screenreader (bool): Clean up the text for screenreaders.
+
+        Returns:
+            bytes: The text, ready to send.
+
+        """
         if screenreader:
             # screenreader mode cleans up output
             text = ansi.parse_ansi(text, strip_ansi=True, xterm256=False, mxp=False)
             text = _RE_SCREENREADER_REGEX.sub("", text)
 
-        if options.get("send_prompt"):
+        if prompt:
             # send a prompt instead.
-            prompt = text
             if not raw:
                 # processing
-                prompt = ansi.parse_ansi(
-                    _RE_N.sub("", prompt) + ("||n" if prompt.endswith("|") else "|n"),
+                text = ansi.parse_ansi(
+                    _RE_N.sub("", text) + ("||n" if text.endswith("|") else "|n"),
                     strip_ansi=nocolor,
                     xterm256=xterm256,
                 )
                 if mxp:
-                    prompt = mxp_parse(prompt)
-            prompt = to_bytes(prompt, self)
-            prompt = prompt.replace(IAC, IAC + IAC).replace(b"\n", b"\r\n")
+                    text = mxp_parse(text)
+            text = to_bytes(text, self)
+            text = text.replace(IAC, IAC + IAC).replace(b"\n", b"\r\n")
             if not self.protocol_flags.get(
                 "NOPROMPTGOAHEAD", self.protocol_flags.get("NOGOAHEAD", True)
             ):
-                prompt += IAC + GA
-            self.transport.write(mccp_compress(self, prompt))
-        else:
-            if echo is not None:
-                # turn on/off echo. Note that this is a bit turned around since we use
-                # echo as if we are "turning off the client's echo" when telnet really
-                # handles it the other way around.
-                if echo:
-                    # by telling the client that WE WON'T echo, the client knows
-                    # that IT should echo. This is the expected behavior from
-                    # our perspective.
-                    self.transport.write(mccp_compress(self, IAC + WONT + ECHO))
-                else:
-                    # by telling the client that WE WILL echo, the client can
-                    # safely turn OFF its OWN echo.
-                    self.transport.write(mccp_compress(self, IAC + WILL + ECHO))
-            if raw:
-                # no processing
-                self.sendLine(text)
-                return
-            else:
-                # we need to make sure to kill the color at the end in order
-                # to match the webclient output.
-                linetosend = ansi.parse_ansi(
-                    _RE_N.sub("", text) + ("||n" if text.endswith("|") else "|n"),
-                    strip_ansi=nocolor,
-                    xterm256=xterm256,
-                    mxp=mxp,
-                )
-                if mxp:
-                    linetosend = mxp_parse(linetosend)
-                self.sendLine(linetosend)
+                text += IAC + GA
+            return text
+
+        if not raw:
+            # we need to make sure to kill the color at the end in order
+            # to match the webclient output.
+            text = ansi.parse_ansi(
+                _RE_N.sub("", text) + ("||n" if text.endswith("|") else "|n"),
+                strip_ansi=nocolor,
+                xterm256=xterm256,
+                mxp=mxp,
+            )
+            if mxp:
+                text = mxp_parse(text)
+        return self._render_line(text)
 
     def send_prompt(self, *args, **kwargs):
         """
@@ -12,6 +12,8 @@ import json
 import pickle
 import string
 import sys
+import zlib
+from collections import OrderedDict
 
 import mock
 from autobahn.twisted.websocket import WebSocketServerFactory
@@ -21,24 +23,34 @@ from twisted.internet.base import DelayedCall
 from twisted.test import proto_helpers
 from twisted.trial.unittest import TestCase as TwistedTestCase
 
+from evennia.server import inputfuncs
 from evennia.server.portal import irc
 from evennia.utils.test_resources import BaseEvenniaTest
 
+from . import amp, amp_codec
 from .amp import (
     AMP_MAXLEN,
     AMPMultiConnectionProtocol,
+    Compressed,
     MsgPortal2Server,
     MsgServer2Portal,
 )
 from .amp_server import AMPServerFactory
-from .mccp import MCCP
+from .mccp import MCCP, Mccp
 from .mssp import MSSP
 from .mxp import MXP
 from .naws import DEFAULT_HEIGHT, DEFAULT_WIDTH
 from .portal import PORTAL_SESSIONS
 from .suppress_ga import SUPPRESS_GA
 from .telnet import TelnetProtocol, TelnetServerFactory
-from .telnet_oob import MSDP, MSDP_VAL, MSDP_VAR
+from .telnet_oob import (
+    MSDP,
+    MSDP_TABLE_CLOSE,
+    MSDP_TABLE_OPEN,
+    MSDP_VAL,
+    MSDP_VAR,
+    TelnetOOB,
+)
 from .ttype import IS, TTYPE
 from .webclient import WebSocketClient
 
@@ -65,16 +77,16 @@ class TestAMPServer(TwistedTestCase):
         if pickle.HIGHEST_PROTOCOL == 5:
             # Python 3.8+
             byte_out = (
-                b"\x00\x04_ask\x00\x011\x00\x08_command\x00\x10MsgServer2Portal\x00\x0b"
-                b"packed_data\x00 x\xdak`\x9d*\xc8\x00\x01\xde\x8c\xb5SzXJR"
-                b"\x8bK\xa6x3\x15\xb7M\xd1\x03\x00VU\x07u\x00\x00"
+                b"\x00\x04_ask\x00\x011\x00\x08_command\x00\x10MsgServer2Portal\x00\x0bpacked_data"
+                b"\x00\x1d\x01\x80\x05\x95\x11\x00\x00\x00\x00\x00\x00\x00K\x01}\x94\x8c\x04test"
+                b"\x94K\x02s\x86\x94.\x00\x00"
             )
         elif pickle.HIGHEST_PROTOCOL == 4:
             # Python 3.7
             byte_out = (
-                b"\x00\x04_ask\x00\x011\x00\x08_command\x00\x10MsgServer2Portal\x00\x0b"
-                b"packed_data\x00 x\xdak`\x99*\xc8\x00\x01\xde\x8c\xb5SzXJR"
-                b"\x8bK\xa6x3\x15\xb7M\xd1\x03\x00V:\x07t\x00\x00"
+                b"\x00\x04_ask\x00\x011\x00\x08_command\x00\x10MsgServer2Portal\x00\x0bpacked_data"
+                b"\x00\x1d\x01\x80\x04\x95\x11\x00\x00\x00\x00\x00\x00\x00K\x01}\x94\x8c\x04test"
+                b"\x94K\x02s\x86\x94.\x00\x00"
             )
         self.transport.write.assert_called_with(byte_out)
         with mock.patch("evennia.server.portal.amp.amp.AMP.dataReceived") as mocked_amprecv:
@@ -88,16 +100,16 @@ class TestAMPServer(TwistedTestCase):
         if pickle.HIGHEST_PROTOCOL == 5:
             # Python 3.8+
             byte_out = (
-                b"\x00\x04_ask\x00\x011\x00\x08_command\x00\x10MsgPortal2Server\x00\x0b"
-                b"packed_data\x00 x\xdak`\x9d*\xc8\x00\x01\xde\x8c\xb5SzXJR"
-                b"\x8bK\xa6x3\x15\xb7M\xd1\x03\x00VU\x07u\x00\x00"
+                b"\x00\x04_ask\x00\x011\x00\x08_command\x00\x10MsgPortal2Server\x00\x0bpacked_data"
+                b"\x00\x1d\x01\x80\x05\x95\x11\x00\x00\x00\x00\x00\x00\x00K\x01}\x94\x8c\x04test"
+                b"\x94K\x02s\x86\x94.\x00\x00"
             )
         elif pickle.HIGHEST_PROTOCOL == 4:
             # Python 3.7
             byte_out = (
-                b"\x00\x04_ask\x00\x011\x00\x08_command\x00\x10MsgPortal2Server\x00\x0b"
-                b"packed_data\x00 x\xdak`\x99*\xc8\x00\x01\xde\x8c\xb5SzXJR"
-                b"\x8bK\xa6x3\x15\xb7M\xd1\x03\x00V:\x07t\x00\x00"
+                b"\x00\x04_ask\x00\x011\x00\x08_command\x00\x10MsgPortal2Server\x00\x0bpacked_data"
+                b"\x00\x1d\x01\x80\x04\x95\x11\x00\x00\x00\x00\x00\x00\x00K\x01}\x94\x8c\x04test"
+                b"\x94K\x02s\x86\x94.\x00\x00"
             )
         self.transport.write.assert_called_with(byte_out)
         with mock.patch("evennia.server.portal.amp.amp.AMP.dataReceived") as mocked_amprecv:
@@ -116,44 +128,263 @@ class TestAMPServer(TwistedTestCase):
             # Python 3.8+
             self.transport.write.assert_called_with(
                 b"\x00\x04_ask\x00\x011\x00\x08_command\x00\x10MsgServer2Portal\x00\x0bpacked_data"
-                b"\x00wx\xda\xed\xc6\xc1\t\x80 \x00@Q#=5Z\x0b\xb8\x80\x13\xe85h\x80\x8e\xbam`Dc\xf4><\xf8g"
-                b"\x1a[\xf8\xda\x97\xa3_\xb1\x95\xdaz\xbe\xe7\x1a\xde\x03\x00\x00\x00\x00\x00\x00\x00"
-                b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
-                b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
-                b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xe0\x1f\x1eP\x1d\x02\r\x00\rpacked_data.2"
-                b"\x00Zx\xda\xed\xc3\x01\r\x00\x00\x08\xc0\xa0\xb4&\xf0\xfdg\x10a\xa3"
-                b"\xd9RUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUU\xf5\xfb\x03m\xe0\x06"
-                b"\x1d\x00\rpacked_data.3\x00Zx\xda\xed\xc3\x01\r\x00\x00\x08\xc0\xa0\xb4&\xf0\xfdg\x10a"
-                b"\xa3fSUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUU\xf5\xfb\x03n\x1c"
-                b"\x06\x1e\x00\rpacked_data.4\x00Zx\xda\xed\xc3\x01\t\x00\x00\x0c\x03\xa0\xb4O\xb0\xf5gA"
-                b"\xae`\xda\x8b\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa"
-                b"\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa"
-                b"\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa"
-                b"\xaa\xaa\xaa\xdf\x0fnI\x06,\x00\rpacked_data.5\x00\x18x\xdaK-.)I\xc5\x8e\xa7\xb22@\xc0"
-                b"\x94\xe2\xb6)z\x00Z\x1e\x0e\xb6\x00\x00"
+                b"\x01v\x02x\x01\xed\xd2\xb1\x09\x800\x00\x04\xc0\x88I\xe5h.\x90\x052A\xd2\x0a\x0e`"
+                b"\x99l+D\xc41\xbc\x87\x87\xaf\x9f;\xd3\xd8\xc2\x97}9\xfa\x15[\xa9\xad\xe7{\xae\xe1"
+                b"]\xea\x03\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\xfec\xe0\x01\xd6r!\xfe\x00\x0dpacked_data.2\x01W\x02x\x01\xed"
+                b"\xd21\x0d\x00\x00\x00\xc20\xb5(\x00\xff\xc1H\x8f\x19X\xbat\x93\x07\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\x90"
+                b"\x1e\xcb\xbd&\x0e\x00\x0dpacked_data.3\x01W\x02x\x01\xed\xd2A\x0d\x00\x00\x0c\x84"
+                b"0\xb5\xa7`\xf8\xcf\x8c\xf4\x81\x01\xd2\xda%\x0f\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\xa0=\xc3\xf9&\x0f\x00"
+                b"\x0dpacked_data.4\x01W\x02x\x01\xed\xd2A\x0d\x00\x00\x0c\x840\xb5Sp\xf8\xcf\x8c"
+                b"\xf4\x81\x01\xd2\xd5M\x1e0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0@=\xbe&&\x1d\x00\x0dpacked_data.5\x00.\x02x\x01"
+                b"K-.)I\x1d\xc5\xa3a0\x9a\x06F\xd3\xc0h\x1a\x18M\x03\xa3i`4\x0d@\xd2\xc0TV\x06\x08"
+                b"\x98R\xdc6E\x0f\x00N\xac\x8e\xe3\x00\x00"
             )
         elif pickle.HIGHEST_PROTOCOL == 4:
             # Python 3.7
             self.transport.write.assert_called_with(
                 b"\x00\x04_ask\x00\x011\x00\x08_command\x00\x10MsgServer2Portal\x00\x0bpacked_data"
-                b"\x00wx\xda\xed\xc6\xc1\t\x80 \x00@Q#o\x8e\xd6\x02-\xe0\x04z\r\x1a\xa0\xa3m+$\xd2"
-                b"\x18\xbe\x0f\x0f\xfe\x1d\xdf\x14\xfe\x8e\xedjO\xac\xb9\xd4v\xf6o\x0f\xf3\x00\x00"
-                b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
-                b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
-                b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
-                b"\x00X\xc3\x00P\x10\x02\x0c\x00\rpacked_data.2\x00Zx\xda\xed\xc3\x01\r\x00\x00\x08"
-                b"\xc0\xa0\xb4&\xf0\xfdg\x10a\xa3\xd9RUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUU"
-                b"\xf5\xfb\x03m\xe0\x06\x1d\x00\rpacked_data.3\x00Zx\xda\xed\xc3\x01\r\x00\x00\x08"
-                b"\xc0\xa0\xb4&\xf0\xfdg\x10a\xa3fSUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUUU"
-                b"\xf5\xfb\x03n\x1c\x06\x1e\x00\rpacked_data.4\x00Zx\xda\xed\xc3\x01\t\x00\x00\x0c"
-                b"\x03\xa0\xb4O\xb0\xf5gA\xae`\xda\x8b\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa"
-                b"\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa"
-                b"\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa"
-                b"\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xaa\xdf\x0fnI\x06,\x00\rpacked_data.5"
-                b"\x00\x18x\xdaK-.)I\xc5\x8e\xa7\xb22@\xc0\x94\xe2\xb6)z\x00Z\x1e\x0e\xb6\x00\x00"
+                b"\x01u\x02x\x01\xed\xd2\xb1\x09\xc0 \x00\x04@C\xec\x1c-\x0bd\x01'\xd06\x90\x01R"
+                b"\x9am\x85\x88d\x0c\xef\xe1\xe1\xeb\xe7\xee\xf8\xa6\xf0\xe7\xd8\xae\xf6\xc4\x9aKmg"
+                b"\xff\xf60\x97\xfa\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x81u\x0c\x0c\xd8e!\xfd\x00\x0dpacked_data.2\x01W\x02x"
+                b"\x01\xed\xd21\x0d\x00\x00\x00\xc20\xb5(\x00\xff\xc1H\x8f\x19X\xbat\x93\x07\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\x90\x1e\xcb\xbd&\x0e\x00\x0dpacked_data.3\x01W\x02x\x01\xed\xd2A\x0d\x00"
+                b"\x00\x0c\x840\xb5\xa7`\xf8\xcf\x8c\xf4\x81\x01\xd2\xda%\x0f\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06"
+                b"\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01"
+                b"\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80"
+                b"\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`"
+                b"\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\x80\x01\x06\x18`\xa0=\xc3\xf9"
+                b"&\x0f\x00\x0dpacked_data.4\x01W\x02x\x01\xed\xd2A\x0d\x00\x00\x0c\x840\xb5Sp\xf8"
+                b"\xcf\x8c\xf4\x81\x01\xd2\xd5M\x1e0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00"
+                b"\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0"
+                b"\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0"
+                b"\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03"
+                b"\x0c0\xc0\x00\x03\x0c0\xc0\x00\x03\x0c0\xc0@=\xbe&&\x1d\x00\x0dpacked_data.5\x00."
+                b"\x02x\x01K-.)I\x1d\xc5\xa3a0\x9a\x06F\xd3\xc0h\x1a\x18M\x03\xa3i`4\x0d@\xd2\xc0TV"
+                b"\x06\x08\x98R\xdc6E\x0f\x00N\xac\x8e\xe3\x00\x00"
             )
 
 
+class TestCompressed(TestCase):
+    """
+    Test compression of AMP data
+
+    """
+
+    def setUp(self):
+        self.arg = Compressed()
+        self.small = b"small text"
+        self.large = b"large text " * 200
+
+    def test_threshold(self):
+        self.assertEqual(b"\x01" + self.small, self.arg.toString(self.small))
+        wire = self.arg.toString(self.large)
+        self.assertEqual(b"\x02", wire[:1])
+        self.assertLess(len(wire), len(self.large))
+        self.assertEqual(self.small, self.arg.fromString(self.arg.toString(self.small)))
+        self.assertEqual(self.large, self.arg.fromString(wire))
+
+    def test_legacy(self):
+        self.assertEqual(self.large, self.arg.fromString(zlib.compress(self.large, 9)))
+
+    def test_streaming(self):
+        with mock.patch.object(amp, "_COMPRESSION_STREAMING", True):
+            sender = AMPMultiConnectionProtocol()
+            receiver = AMPMultiConnectionProtocol()
+            wire1 = self.arg.toStringProto(self.large, sender)
+            wire2 = self.arg.toStringProto(self.large, sender)
+        self.assertEqual(b"\x03", wire1[:1])
+        # the second message can refer back to the first
+        self.assertLess(len(wire2), len(wire1))
+        self.assertEqual(self.large, self.arg.fromStringProto(wire1, receiver))
+        self.assertEqual(self.large, self.arg.fromStringProto(wire2, receiver))
+
+    def test_stats(self):
+        stats = amp.amp_stats()
+        wire = self.arg.toString(self.large)
+        self.arg.fromString(wire)
+        new_stats = amp.amp_stats()
+        self.assertEqual(len(self.large), new_stats["bytes_out"] - stats["bytes_out"])
+        self.assertEqual(len(wire), new_stats["bytes_out_wire"] - stats["bytes_out_wire"])
+        self.assertEqual(len(self.large), new_stats["bytes_in"] - stats["bytes_in"])
+        self.assertEqual(len(wire), new_stats["bytes_in_wire"] - stats["bytes_in_wire"])
+        self.assertGreater(new_stats["compress_time"], stats["compress_time"])
+
+
+class TestAMPCodec(TestCase):
+    """
+    Test the codecs used to serialize AMP data
+
+    """
+
+    def setUp(self):
+        self.data = (
+            3,
+            {
+                "text": (("You see |wa large box|n here.",), {"type": "look"}),
+                "prompt": (["HP: 100/100"], {}),
+                "options": {"screenreader": False, "width": 78, "height": None},
+                "values": [0, 127, -1, -32, -33, 128, 2**40, -(2**63), 1.5, b"\x00\xff"],
+                "long": ["x" * 100, list(range(20)), {str(i): i for i in range(20)}],
+                "unicode": "Vänligen skriv ditt namn ☺",
+            },
+        )
+
+    def test_roundtrip(self):
+        for codec in (amp_codec.PickleCodec, amp_codec.CompactCodec):
+            self.assertEqual(self.data, codec.loads(codec.dumps(self.data)))
+
+    def test_compact(self):
+        wire = amp_codec.CompactCodec.dumps(self.data)
+        self.assertEqual(b"\xc1", wire[:1])
+        self.assertLess(len(wire), len(amp_codec.PickleCodec.dumps(self.data)))
+
+    def test_pickle_fallback(self):
+        for data in (OrderedDict(a=1), {"set": {1, 2}}, 2**70, "\ud800"):
+            wire = amp_codec.CompactCodec.dumps(data)
+            self.assertEqual(b"\x80", wire[:1])
+            result = amp_codec.CompactCodec.loads(wire)
+            self.assertEqual(data, result)
+            self.assertEqual(type(data), type(result))
+
+    def test_mixed(self):
+        """Either codec can load data from the other"""
+        self.assertEqual(
+            self.data, amp_codec.PickleCodec.loads(amp_codec.CompactCodec.dumps(self.data))
+        )
+        self.assertEqual(
+            self.data, amp_codec.CompactCodec.loads(amp_codec.PickleCodec.dumps(self.data))
+        )
+
+    def test_strict(self):
+        codec = amp_codec.StrictCompactCodec
+        self.assertEqual(self.data, codec.loads(codec.dumps(self.data)))
+        self.assertEqual(self.data, codec.loads(amp_codec.CompactCodec.dumps(self.data)))
+        # pickled data is never loaded
+        with self.assertRaises(ValueError):
+            codec.loads(amp_codec.PickleCodec.dumps(self.data))
+        with self.assertRaises(ValueError):
+            codec.loads(amp_codec.CompactCodec.dumps({"set": {1, 2}}))
+        with self.assertRaises(TypeError):
+            codec.dumps({"set": {1, 2}})
+
+    def test_benchmark(self):
+        """
+        Compare the size and speed of the codecs. Only the sizes are checked,
+        since timings vary with the machine and its load.
+
+        """
+        results = amp_codec.benchmark(
+            self.data,
+            codecs=(
+                amp_codec.PickleCodec,
+                amp_codec.CompactCodec,
+                amp_codec.StrictCompactCodec,
+            ),
+            number=10,
+        )
+        self.assertEqual({"PickleCodec", "CompactCodec", "StrictCompactCodec"}, set(results))
+        for result in results.values():
+            self.assertGreater(result["dumps"], 0)
+            self.assertGreater(result["loads"], 0)
+        self.assertLess(results["CompactCodec"]["size"], results["PickleCodec"]["size"])
+
+
 class TestIRC(TestCase):
     def test_plain_ansi(self):
         """
@@ -283,6 +514,102 @@ class TestTelnet(TwistedTestCase):
         self.proto._handshake_delay.cancel()
         return d
 
+    def _make_session(self, sessid):
+        proto = TelnetProtocol()
+        proto.init_session("telnet", "localhost", PORTAL_SESSIONS)
+        proto.sessid = sessid
+        proto.transport = proto_helpers.StringTransport()
+        return proto
+
+    def test_data_out_batch(self):
+        sessions = [self._make_session(sessid) for sessid in (1, 2, 3)]
+        sessions[2].protocol_flags["NOCOLOR"] = True
+        render_text = TelnetProtocol._render_text
+        with mock.patch.dict(
+            PORTAL_SESSIONS, {sess.sessid: sess for sess in sessions}, clear=True
+        ), mock.patch.object(
+            TelnetProtocol, "_render_text", autospec=True, side_effect=render_text
+        ) as mock_render:
+            PORTAL_SESSIONS.data_out_batch(
+                [(sess.sessid, {"text": [["|rHello|n"], {}]}) for sess in sessions]
+            )
+        # rendered once for the two sessions with the same settings
+        self.assertEqual(2, mock_render.call_count)
+        self.assertIsNone(PORTAL_SESSIONS.output_cache)
+        self.assertIn(b"Hello", sessions[0].transport.value())
+        self.assertEqual(sessions[0].transport.value(), sessions[1].transport.value())
+        self.assertEqual(b"Hello\r\n", sessions[2].transport.value())
+
+    @mock.patch("evennia.server.portal.mccp.reactor")
+    def test_mccp_output(self, mock_reactor):
+        proto = self._make_session(1)
+        proto.handshakes = 8
+        proto.mccp = Mccp(proto)
+        proto.dataReceived(IAC + DO + MCCP)
+        self.assertTrue(proto.protocol_flags["MCCP"])
+        proto.transport.clear()
+
+        proto.send_text("Hello", options={"raw": True})
+        proto.send_text("World", options={"raw": True})
+        # compressed output is sent at the end of the reactor iteration
+        self.assertEqual(b"", proto.transport.value())
+        mock_reactor.callLater.assert_called_once_with(0, proto.mccp.flush)
+        proto.mccp.flush()
+        self.assertEqual(
+            b"Hello\r\nWorld\r\n", zlib.decompressobj().decompress(proto.transport.value())
+        )
+
+        # turning off mccp sends any compressed data first
+        proto.transport.clear()
+        proto.send_text("Bye", options={"raw": True})
+        proto.dataReceived(IAC + DONT + MCCP)
+        self.assertFalse(proto.protocol_flags["MCCP"])
+        self.assertTrue(proto.transport.value())
+        self.assertFalse(proto.mccp.buffer)
+
+
+class TestTelnetOOB(TestCase):
+    def setUp(self):
+        self.oob = TelnetOOB(MagicMock(protocol_flags={}))
+
+    @mock.patch("evennia.server.inputfuncs.reactor.callLater")
+    def test_monitor_output(self, mock_calllater):
+        """Batched monitor output is encoded the same as single changes"""
+        session = Mock()
+        inputfuncs._on_monitor_change(
+            obj=Mock(db_key="Bob"),
+            fieldname="db_key",
+            name="name",
+            session=session,
+            outputfunc_name="monitor",
+        )
+        inputfuncs._send_monitor_changes()
+        kwargs = session.msg.call_args.kwargs["monitor"]
+        self.assertEqual(
+            self.oob.encode_msdp("monitor", **kwargs),
+            b"".join(
+                [
+                    MSDP_VAR,
+                    b"monitor",
+                    MSDP_VAL,
+                    MSDP_TABLE_OPEN,
+                    MSDP_VAR,
+                    b"name",
+                    MSDP_VAL,
+                    b"name",
+                    MSDP_VAR,
+                    b"value",
+                    MSDP_VAL,
+                    b"Bob",
+                    MSDP_TABLE_CLOSE,
+                ]
+            ),
+        )
+        self.assertEqual(
+            self.oob.encode_gmcp("monitor", **kwargs),
+            b'Char.Monitor.Update {"name": "name", "value": "Bob"}',
+        )
+
 
 class TestWebSocket(BaseEvenniaTest):
     def setUp(self):
@@ -524,6 +524,11 @@ class Evennia:
 
         TICKER_HANDLER.save()
 
+        # write any queued changes to persistent tasks
+        from evennia.scripts.taskhandler import TASK_HANDLER
+
+        TASK_HANDLER.save()
+
         # always called, also for a reload
         self.at_server_stop()
 
@@ -79,12 +79,36 @@ class TestAMPClientSend(_TestAMP):
     def test_msgserver2portal(self, mocktransport):
         self._connect_client(mocktransport)
         self.amp_client.send_MsgServer2Portal(self.session, text={"foo": "bar"})
+        self.amp_client.flush_msg_batch()
         wire_data = self._catch_wire_read(mocktransport)[0]
 
         self._connect_server(mocktransport)
         self.amp_server.dataReceived(wire_data)
         self.portal.sessions.data_out.assert_called_with(self.portalsession, text={"foo": "bar"})
 
+    def test_msgserver2portal_batch(self, mocktransport):
+        self._connect_client(mocktransport)
+        self.amp_client.send_MsgServer2Portal(self.session, text={"foo": "bar"})
+        self.amp_client.send_MsgServer2Portal(self.session, text={"foo": "bar2"})
+        # not sent until end of reactor iteration
+        self.assertFalse(self._catch_wire_read(mocktransport))
+        self.amp_client.flush_msg_batch()
+        wire_data = self._catch_wire_read(mocktransport)
+        self.assertEqual(1, len(wire_data))
+
+        self._connect_server(mocktransport)
+        self.amp_server.dataReceived(wire_data[0])
+        self.assertEqual(2, self.portal.sessions.data_out.call_count)
+        self.portal.sessions.data_out.assert_called_with(self.portalsession, text={"foo": "bar2"})
+
+    def test_msgserver2portal_order(self, mocktransport):
+        self._connect_client(mocktransport)
+        self.amp_client.send_MsgServer2Portal(self.session, text={"foo": "bar"})
+        # admin commands flush the batch first
+        self.amp_client.send_AdminServer2Portal(self.session, operation=amp.SDISCONN)
+        self.assertEqual(2, len(self._catch_wire_read(mocktransport)))
+        self.assertIsNone(self.amp_client.msg_batch_task)
+
     def test_adminserver2portal(self, mocktransport):
         self._connect_client(mocktransport)
 
@@ -5,10 +5,12 @@ Testing various individual functionalities in the server package.
 
 """
 import unittest
+from unittest import mock
 
 from django.test import TestCase
 from django.test.runner import DiscoverRunner
 
+from evennia.server import inputfuncs
 from evennia.server.throttle import Throttle
 from evennia.server.validators import EvenniaPasswordValidator
 from evennia.utils.test_resources import BaseEvenniaTest
@@ -83,6 +85,43 @@ class ValidatorTest(BaseEvenniaTest):
         self.assertRaises(ValidationError, validator.validate, "(#)[#]<>", user=self.account)
 
 
+class MonitorOutputTest(TestCase):
+    """
+    Class for testing the sending of monitored changes.
+    """
+
+    @mock.patch("evennia.server.inputfuncs.reactor.callLater")
+    def test_batched_output(self, mock_calllater):
+        session = mock.Mock()
+        obj = mock.Mock(db_key="foo", db_location="room")
+        for name, fieldname in (
+            ("name", "db_key"),
+            ("location", "db_location"),
+            ("name", "db_key"),
+        ):
+            inputfuncs._on_monitor_change(
+                obj=obj, fieldname=fieldname, name=name, session=session, outputfunc_name="monitor"
+            )
+            obj.db_key = "bar"
+        inputfuncs._on_monitor_change(
+            obj=obj, fieldname="db_key", name="name", session=session, outputfunc_name="other"
+        )
+        mock_calllater.assert_called_once()
+        session.msg.assert_not_called()
+
+        inputfuncs._send_monitor_changes()
+        self.assertEqual(
+            session.msg.call_args_list,
+            [
+                mock.call(
+                    monitor={"name": "name", "value": "bar"},
+                    other={"name": "name", "value": "bar"},
+                ),
+                mock.call(monitor={"name": "location", "value": "room"}),
+            ],
+        )
+
+
 class ThrottleTest(BaseEvenniaTest):
     """
     Class for testing the connection/IP throttle.
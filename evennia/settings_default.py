@@ -208,8 +208,10 @@ MXP_OUTGOING_ONLY = True
 # caching results in a massive speedup of the server (since it dramatically
 # limits the number of database accesses needed) and also allows for
 # storing temporary data on objects. It is however also the main memory
-# consumer of Evennia. With this setting the cache can be capped and
-# flushed when it reaches a certain size. Minimum is 50 MB but it is
+# consumer of Evennia. With this setting the cache can be capped. When the
+# server's memory use nears this size, the least recently used quarter of
+# the cache is evicted (puppeted objects, connected accounts and objects
+# with non-persistent Attributes are kept). Minimum is 50 MB but it is
 # not recommended to set this to less than 100 MB for a distribution
 # system.
 # Empirically, N_objects_in_cache ~ ((RMEM - 35) / 0.0157):
@@ -456,6 +458,11 @@ COLOR_ANSI_XTERM256_BRIGHT_BG_EXTRA_MAP = []
 # If set True, the above color settings *replace* the default |-style color markdown
 # rather than extend it.
 COLOR_NO_DEFAULT = False
+# How many parsed strings to remember in total. The same string parsed for
+# different client color capabilities (ansi/xterm256/mxp/stripped) takes one
+# entry each. Parsed strings are re-used from this cache, with the least
+# recently used ones dropped when it's full.
+COLOR_PARSE_CACHE_SIZE = 10000
 
 
 ######################################################################
@@ -504,6 +511,13 @@ COMMAND_DEFAULT_ARG_REGEX = r"^[ /]|\n|$"
 COMMAND_DEFAULT_MSG_ALL_SESSIONS = False
 # The default lockstring of a command.
 COMMAND_DEFAULT_LOCKS = ""
+# Cache the fully merged cmdset per caller between commands. The cache is invalidated
+# when cmdsets, locks, tags, permissions or contents change on any object contributing to
+# the merge (the caller, its location and everything in it), or when quelling. If your
+# `call`-locks depend on other volatile state (like Attributes), either call
+# `evennia.commands.cmdhandler.invalidate_cmdset_cache(obj)` when that state changes or
+# turn this off to re-merge cmdsets on every command.
+COMMAND_CACHE_MERGED_CMDSETS = True
 
 ######################################################################
 # Typeclasses and other paths
@@ -553,6 +567,13 @@ START_LOCATION = "#2"
 # out of sync between the processes. Keep on unless you face such
 # issues.
 TYPECLASS_AGGRESSIVE_CACHE = True
+# Changing a mutable Attribute value in-place (like `obj.db.mylist.append(1)`
+# or `obj.db.mydict["key"] = 1`) normally saves the whole value to the database
+# immediately. If this is set, all such changes made during the same reactor
+# iteration are instead saved together, once per Attribute, at the start of the
+# next iteration. Use `evennia.utils.dbserialize.batch_saves` to do this for a
+# specific block of code only.
+ATTRIBUTE_COALESCE_SAVES = False
 # These are fallbacks for BASE typeclasses failing to load. Usually needed only
 # during doc building. The system expects these to *always* load correctly, so
 # only modify if you are making fundamental changes to how objects/accounts
@@ -676,6 +697,11 @@ FUNCPARSER_ESCAPE_CHAR = "\\"
 # This is the global max nesting-level for nesting functions in
 # the funcparser. This protects against infinite loops.
 FUNCPARSER_MAX_NESTING = 20
+# How many parsed strings the funcparser should keep in memory, so
+# that strings parsed over and over (like prototype values, room
+# descriptions and message templates) need not be re-tokenized every
+# time. Set to 0 to turn off this caching.
+FUNCPARSER_COMPILE_CACHE_SIZE = 2000
 # Activate funcparser for all outgoing strings. The current Session
 # will be passed into the parser (used to be called inlinefuncs)
 FUNCPARSER_PARSE_OUTGOING_MESSAGES_ENABLED = False
@@ -705,6 +731,15 @@ GLOBAL_SCRIPTS = {
     # 'key': {'typeclass': 'typeclass.path.here',
     #         'repeats': -1, 'interval': 50, 'desc': 'Example script'},
 }
+# The TickerHandler normally calls all subscribers of the same interval at
+# the same time, which gives a lag spike if there are many of them. If this is
+# larger than 1, the subscribers of each interval are instead spread evenly over
+# this many slots, called one slot at a time through the interval.
+TICKER_SLOTS = 1
+# If set, the TickerHandler lets the server handle other events (like player
+# input) whenever its tickers have been running for this many seconds without a
+# break, continuing where it left off right after. None means no limit.
+TICKER_TIME_BUDGET = None
 
 ######################################################################
 # Default Account setup and access
@@ -1190,6 +1225,22 @@ SESSION_SYNC_ATTRS = (
 # Very dragons territory.
 AMP_SERVER_PROTOCOL_CLASS = "evennia.server.portal.amp_server.AMPServerProtocol"
 AMP_CLIENT_PROTOCOL_CLASS = "evennia.server.amp_client.AMPServerClientProtocol"
+# Data sent between Portal and Server smaller than this many bytes is
+# sent as-is, since compressing short messages costs more than it saves.
+AMP_COMPRESSION_THRESHOLD = 512
+# zlib compression level (1-9) for larger messages. Lower is faster.
+AMP_COMPRESSION_LEVEL = 1
+# If set, each AMP connection keeps a running zlib compression context,
+# so data already sent can be referred to by later messages. This
+# compresses better but uses some more memory per connection.
+AMP_COMPRESSION_STREAMING = False
+# Class used to serialize data sent between Portal and Server. The default
+# uses pickle. The `CompactCodec` in the same module gives smaller messages
+# for plain data (falling back to pickle for anything else). Portal and
+# Server can read each other's data even if these are set differently.
+# `StrictCompactCodec` never uses pickle, so never loads pickled data; it
+# must then be used by both Portal and Server.
+AMP_CODEC_CLASS = "evennia.server.portal.amp_codec.PickleCodec"
 
 # don't change this manually, it can be checked from code to know if
 # being run from a unit test (set by the evennia.utils.test_resources.BaseEvenniaTest
@@ -16,7 +16,7 @@ from django.conf import settings
 from django.db import models
 from django.utils.encoding import smart_str
 from evennia.locks.lockhandler import LockHandler
-from evennia.utils.dbserialize import from_pickle, to_pickle
+from evennia.utils.dbserialize import discard_pending_save, from_pickle, to_pickle
 from evennia.utils.idmapper.models import SharedMemoryModel
 from evennia.utils.picklefield import PickledObjectField
 from evennia.utils.utils import is_iter, lazy_property, make_iter, to_str
@@ -442,6 +442,7 @@ class Attribute(IAttribute, SharedMemoryModel):
         Setter. Allows for self.value = value. We cannot cache here,
         see self.__value_get.
         """
+        discard_pending_save(self)
         self.db_value = to_pickle(new_value)
         self.save(update_fields=["db_value"])
 
@@ -1588,6 +1589,118 @@ def parse_nick_template(string, template_regex, outtemplate):
     return False, string
 
 
+# regex parts that can't be renamed/shifted safely when a nick regex is
+# combined with others; such nicks are matched on their own instead.
+_RE_NICK_UNCOMBINABLE = re.compile(r"\\[1-9]|\(\?\(|\(\?[aiLmsux]+\)")
+_RE_NICK_GROUPNAME = re.compile(r"(?<!\\)\(\?P([<=])(\w+)")
+_NICK_REGEX_FLAGS = re.I + re.DOTALL + re.U
+
+
+def _compile_nick_regex(nick_regex):
+    """
+    Compile a single nick regex, logging rather than raising on errors.
+
+    """
+    try:
+        return re.compile(nick_regex, _NICK_REGEX_FLAGS)
+    except re.error:
+        from evennia.utils import logger
+
+        logger.log_trace("Probably nick being created with unvalidated regex mapping.")
+
+
+class _NickMatcher:
+    """
+    A compiled matcher for a set of nicks. Consecutive nick regexes are
+    combined into a single alternation (with the named groups of each nick
+    prefixed to keep them apart), so a line of input is matched against all
+    of them in one regex call rather than one call per nick. The first nick
+    (in order) to match wins, same as when matching them one by one.
+
+    """
+
+    def __init__(self, nick_values):
+        """
+        Args:
+            nick_values (list): The `(nick_regex, template, pattern, replacement)`
+                values of the nicks to match, in order of priority.
+
+        """
+        # each segment is (regex, templates), where templates is either a
+        # single template (the regex matches one nick) or a dict
+        # {wrappername: (template, ((groupname, argname), ...))}
+        self.segments = []
+        combined = []
+
+        for inum, (nick_regex, template, _, _) in enumerate(nick_values):
+            regex = _compile_nick_regex(nick_regex)
+            if not regex:
+                continue
+            if _RE_NICK_UNCOMBINABLE.search(nick_regex):
+                self._add_combined(combined)
+                combined = []
+                self.segments.append((regex, template))
+            else:
+                combined.append((inum, nick_regex, regex, template))
+        self._add_combined(combined)
+
+    def _add_combined(self, combined):
+        """
+        Add a segment combining several nick regexes.
+
+        Args:
+            combined (list): Tuples `(inum, nick_regex, regex, template)`.
+
+        """
+        if len(combined) < 2:
+            self.segments.extend((regex, template) for _, _, regex, template in combined)
+            return
+
+        parts, templates = [], {}
+        for inum, nick_regex, _, template in combined:
+            prefix = "_n%i" % inum
+            groupnames = []
+
+            def _rename(match):
+                if match.group(1) == "<":
+                    groupnames.append(("%s_%s" % (prefix, match.group(2)), match.group(2)))
+                return "(?P%s%s_%s" % (match.group(1), prefix, match.group(2))
+
+            parts.append("(?P<%s>%s)" % (prefix, _RE_NICK_GROUPNAME.sub(_rename, nick_regex)))
+            templates[prefix] = (template, tuple(groupnames))
+        try:
+            self.segments.append((re.compile("|".join(parts), _NICK_REGEX_FLAGS), templates))
+        except re.error:
+            # fall back to matching the nicks one by one
+            self.segments.extend((regex, template) for _, _, regex, template in combined)
+
+    def replace(self, raw_string):
+        """
+        Replace `raw_string` using the first matching nick.
+
+        Args:
+            raw_string (str): The string to replace.
+
+        Returns:
+            str: The replaced string, or `raw_string` unchanged if no nick matched.
+
+        """
+        for regex, templates in self.segments:
+            if isinstance(templates, str):
+                is_match, string = parse_nick_template(raw_string, regex, templates)
+                if is_match:
+                    return string
+                continue
+            match = regex.match(raw_string)
+            if match:
+                # the nick's wrapper group is always the last group to close
+                template, groupnames = templates[match.lastgroup]
+                return template.format_map(
+                    {argname: match.group(groupname) or "" for groupname, argname in groupnames}
+                )
+        return raw_string
+
+
 class NickHandler(AttributeHandler):
     """
     Handles the addition and removal of Nicks. Nicks are special
@@ -1600,7 +1713,9 @@ class NickHandler(AttributeHandler):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._regex_cache = {}
+        # compiled matchers for nickreplace, invalidated by bumping the version
+        self._matcher_cache = {}
+        self._version = 0
 
     def has(self, key, category="inputline"):
         """
@@ -1691,6 +1806,16 @@ class NickHandler(AttributeHandler):
         super().add(
             pattern, (nick_regex, nick_template, pattern, replacement), category=category, **kwargs
         )
+        self._version += 1
+
+    def batch_add(self, *args, **kwargs):
+        """
+        Batch-add nicks. See `AttributeHandler.batch_add`. Note that the
+        values must already be nick tuples.
+
+        """
+        super().batch_add(*args, **kwargs)
+        self._version += 1
 
     def remove(self, key, category="inputline", **kwargs):
         """
@@ -1705,28 +1830,42 @@ class NickHandler(AttributeHandler):
 
         """
         super().remove(key, category=category, **kwargs)
+        self._version += 1
 
-    def nickreplace(self, raw_string, categories=("inputline", "channel"), include_account=True):
+    def clear(self, *args, **kwargs):
         """
-        Apply nick replacement of entries in raw_string with nick replacement.
+        Remove all nicks. See `AttributeHandler.clear`.
+
+        """
+        super().clear(*args, **kwargs)
+        self._version += 1
+
+    def reset_cache(self):
+        super().reset_cache()
+        self._version += 1
+
+    def _get_matcher(self, categories, include_account):
+        """
+        Get the compiled matcher for the nicks in the given categories,
+        re-building it if the nicks have changed since last time.
 
         Args:
-            raw_string (str): The string in which to perform nick
-                replacement.
-            categories (tuple, optional): Replacement categories in
-                which to perform the replacement, such as "inputline",
-                "channel" etc.
-            include_account (bool, optional): Also include replacement
-                with nicks stored on the Account level.
-            kwargs (any, optional): Not used.
+            categories (tuple): Nick categories to include.
+            include_account (bool): Also include nicks stored on the Account.
 
         Returns:
-            string (str): A string with matching keys replaced with
-                their nick equivalents.
+            _NickMatcher: The matcher for these nicks.
 
         """
+        categories = tuple(make_iter(categories))
+        account_nicks = self.obj.account.nicks if include_account and self.obj.has_account else None
+        version = (self._version, account_nicks, account_nicks._version if account_nicks else None)
+        cached = self._matcher_cache.get((categories, include_account))
+        if cached and cached[0] == version and _TYPECLASS_AGGRESSIVE_CACHE:
+            return cached[1]
+
         nicks = {}
-        for category in make_iter(categories):
+        for category in categories:
             nicks.update(
                 {
                     nick.key: nick
@@ -1734,31 +1873,36 @@ class NickHandler(AttributeHandler):
                     if nick and nick.key
                 }
             )
-        if include_account and self.obj.has_account:
-            for category in make_iter(categories):
+        if account_nicks:
+            for category in categories:
                 nicks.update(
                     {
                         nick.key: nick
-                        for nick in make_iter(
-                            self.obj.account.nicks.get(category=category, return_obj=True)
-                        )
+                        for nick in make_iter(account_nicks.get(category=category, return_obj=True))
                         if nick and nick.key
                     }
                 )
-        for key, nick in nicks.items():
-            nick_regex, template, _, _ = nick.value
-            regex = self._regex_cache.get(nick_regex)
-            if not regex:
-                try:
-                    regex = re.compile(nick_regex, re.I + re.DOTALL + re.U)
-                except re.error:
-                    from evennia.utils import logger
-
-                    logger.log_trace("Probably nick being created with unvalidated regex mapping.")
-                    continue
-                self._regex_cache[nick_regex] = regex
-
-            is_match, raw_string = parse_nick_template(raw_string, regex, template)
-            if is_match:
-                break
-        return raw_string
+        matcher = _NickMatcher([nick.value for nick in nicks.values()])
+        self._matcher_cache[(categories, include_account)] = (version, matcher)
+        return matcher
+
+    def nickreplace(self, raw_string, categories=("inputline", "channel"), include_account=True):
+        """
+        Apply nick replacement of entries in raw_string with nick replacement.
+
+        Args:
+            raw_string (str): The string in which to perform nick
+                replacement.
+            categories (tuple, optional): Replacement categories in
+                which to perform the replacement, such as "inputline",
+                "channel" etc.
+            include_account (bool, optional): Also include replacement
+                with nicks stored on the Account level.
+            kwargs (any, optional): Not used.
+
+        Returns:
+            string (str): A string with matching keys replaced with
+                their nick equivalents.
+
+        """
+        return self._get_matcher(categories, include_account).replace(raw_string)
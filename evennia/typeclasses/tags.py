@@ -18,6 +18,7 @@ from evennia.locks.lockfuncs import perm as perm_lockfunc
 from evennia.utils.utils import make_iter, to_str
 
 _TYPECLASS_AGGRESSIVE_CACHE = settings.TYPECLASS_AGGRESSIVE_CACHE
+_INVALIDATE_CMDSET_CACHE = None
 
 # ------------------------------------------------------------
 #
@@ -357,6 +358,20 @@ class TagHandler(object):
         self._catcache.pop(catkey, None)
         self._cache_complete = False
 
+    def _invalidate_cmdsets(self):
+        """
+        Tags and permissions may change the outcome of `call`-locks, so make
+        sure merged cmdsets involving this object are re-calculated.
+
+        """
+        global _INVALIDATE_CMDSET_CACHE
+        if not _INVALIDATE_CMDSET_CACHE:
+            from evennia.commands.cmdhandler import (
+                invalidate_cmdset_cache as _INVALIDATE_CMDSET_CACHE,
+            )
+
+        _INVALIDATE_CMDSET_CACHE(self.obj)
+
     def reset_cache(self):
         """
         Reset the cache from the outside.
@@ -402,6 +417,7 @@ class TagHandler(object):
             )
             getattr(self.obj, self._m2m_fieldname).add(tagobj)
             self._setcache(tagstr, category, tagobj)
+        self._invalidate_cmdsets()
 
     def has(self, key=None, category=None, return_list=False):
         """
@@ -525,6 +541,7 @@ class TagHandler(object):
             if tagobj:
                 getattr(self.obj, self._m2m_fieldname).remove(tagobj[0])
             self._delcache(key, category)
+        self._invalidate_cmdsets()
 
     def clear(self, category=None):
         """
@@ -549,6 +566,7 @@ class TagHandler(object):
         self._cache = {}
         self._catcache = {}
         self._cache_complete = False
+        self._invalidate_cmdsets()
 
     def all(self, return_key_and_category=False, return_objs=False):
         """
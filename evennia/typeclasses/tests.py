@@ -457,3 +457,52 @@ class TestNickHandler(BaseEvenniaTest):
             re.escape("OOC["), "ooc", pattern_is_regex=True
         )
         re.compile(nick_regex, re.I + re.DOTALL + re.U)
+
+    def test_nickreplace_many(self):
+        """
+        Test matching with many nicks, which are combined into one regex.
+
+        """
+        for inum in range(200):
+            self.char1.nicks.add(f"gr{inum} $1", f"emote grins {inum} at $1")
+        self.char1.nicks.add(r"lit\1 $1", "literal $1")
+        self.char1.nicks.add(r"say (?P<arg1>\w+) (?P=arg1)", "say $1 twice", pattern_is_regex=True)
+        self.char1.nicks.add(r"back (\w+) \1", "back", pattern_is_regex=True)
+
+        self.assertEqual("emote grins 0 at Foo", self.char1.nicks.nickreplace("gr0 Foo"))
+        self.assertEqual("emote grins 199 at Foo", self.char1.nicks.nickreplace("gr199 Foo"))
+        self.assertEqual("say hi twice", self.char1.nicks.nickreplace("say hi hi"))
+        self.assertEqual("say hi ho", self.char1.nicks.nickreplace("say hi ho"))
+        self.assertEqual("back", self.char1.nicks.nickreplace("back ho ho"))
+        self.assertEqual("back hi ho", self.char1.nicks.nickreplace("back hi ho"))
+        self.assertEqual("literal Foo", self.char1.nicks.nickreplace(r"lit\1 Foo"))
+        self.assertEqual("gr Foo", self.char1.nicks.nickreplace("gr Foo"))
+
+        # the matcher is re-compiled when nicks change
+        self.char1.nicks.remove("gr0 $1")
+        self.assertEqual("gr0 Foo", self.char1.nicks.nickreplace("gr0 Foo"))
+        self.char1.nicks.add("gr0 $1", "emote smiles at $1")
+        self.assertEqual("emote smiles at Foo", self.char1.nicks.nickreplace("gr0 Foo"))
+        self.char1.nicks.clear()
+        self.assertEqual("gr1 Foo", self.char1.nicks.nickreplace("gr1 Foo"))
+
+    def test_nickreplace_account(self):
+        """
+        Test that Account nicks override those on the object, also after
+        they change.
+
+        """
+        self.char1.account = self.account
+        self.char1.sessions.add(self.session)
+        self.char1.nicks.add("gr $1", "emote grins at $1")
+        self.char1.nicks.add("sm $1", "emote smiles at $1")
+        self.assertEqual("emote grins at Foo", self.char1.nicks.nickreplace("gr Foo"))
+
+        self.account.nicks.add("gr $1", "emote grins widely at $1")
+        self.assertEqual("emote grins widely at Foo", self.char1.nicks.nickreplace("gr Foo"))
+        self.assertEqual(
+            "emote grins at Foo", self.char1.nicks.nickreplace("gr Foo", include_account=False)
+        )
+        self.account.nicks.remove("gr $1")
+        self.assertEqual("emote grins at Foo", self.char1.nicks.nickreplace("gr Foo"))
+        self.char1.nicks.clear()
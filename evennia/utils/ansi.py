@@ -63,6 +63,8 @@ Xterm256 greyscale:
 """
 import functools
 import re
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import OrderedDict
 
 from django.conf import settings
@@ -117,8 +119,10 @@ ANSI_SPACE = " "
 # Escapes
 ANSI_ESCAPES = ("{{", "\\\\", "\|\|")
 
+# LRU cache of parsed strings, keyed on (string, strip_ansi, xterm256, mxp)
 _PARSE_CACHE = OrderedDict()
-_PARSE_CACHE_SIZE = 10000
+_PARSE_CACHE_SIZE = settings.COLOR_PARSE_CACHE_SIZE
+_PARSE_CACHE_STATS = {"hits": 0, "misses": 0, "evictions": 0}
 
 _COLOR_NO_DEFAULT = settings.COLOR_NO_DEFAULT
 
@@ -460,10 +464,15 @@ class ANSIParser(object):
             return ""
 
         # check cached parsings
-        global _PARSE_CACHE
-        cachekey = "%s-%s-%s-%s" % (string, strip_ansi, xterm256, mxp)
-        if cachekey in _PARSE_CACHE:
-            return _PARSE_CACHE[cachekey]
+        cachekey = (string, strip_ansi, xterm256, mxp)
+        try:
+            parsed_string = _PARSE_CACHE[cachekey]
+        except KeyError:
+            _PARSE_CACHE_STATS["misses"] += 1
+        else:
+            _PARSE_CACHE_STATS["hits"] += 1
+            _PARSE_CACHE.move_to_end(cachekey)
+            return parsed_string
 
         # pre-convert bright colors to xterm256 color tags
         string = self.brightbg_sub.sub(self.sub_brightbg, string)
@@ -500,12 +509,13 @@ class ANSIParser(object):
         if strip_ansi:
             # remove all ansi codes (including those manually
             # inserted in string)
-            return self.strip_raw_codes(parsed_string)
+            parsed_string = self.strip_raw_codes(parsed_string)
 
-        # cache and crop old cache
+        # cache and drop the least recently used parsing
         _PARSE_CACHE[cachekey] = parsed_string
         if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
             _PARSE_CACHE.popitem(last=False)
+            _PARSE_CACHE_STATS["evictions"] += 1
 
         return parsed_string
 
@@ -537,6 +547,18 @@ def parse_ansi(string, strip_ansi=False, parser=ANSI_PARSER, xterm256=False, mxp
     return parser.parse_ansi(string, strip_ansi=strip_ansi, xterm256=xterm256, mxp=mxp)
 
 
+def parse_cache_stats():
+    """
+    Get statistics for the cache of parsed ANSI strings.
+
+    Returns:
+        dict: A dict with keys `size`, `max_size`, `hits`, `misses`
+            and `evictions`. The counts are since the server started.
+
+    """
+    return {"size": len(_PARSE_CACHE), "max_size": _PARSE_CACHE_SIZE, **_PARSE_CACHE_STATS}
+
+
 def strip_ansi(string, parser=ANSI_PARSER):
     """
     Strip all ansi from the string. This handles the Evennia-specific
@@ -681,14 +703,10 @@ def _transform(func_name):
 
     def wrapped(self, *args, **kwargs):
         replacement_string = _query_super(func_name)(self, *args, **kwargs)
-        to_string = []
-        char_counter = 0
-        for index in range(0, len(self._raw_string)):
-            if index in self._code_indexes:
-                to_string.append(self._raw_string[index])
-            elif index in self._char_indexes:
-                to_string.append(replacement_string[char_counter])
-                char_counter += 1
+        # code and char indexes together cover the whole raw string
+        to_string = list(self._raw_string)
+        for char_counter, index in enumerate(self._char_indexes):
+            to_string[index] = replacement_string[char_counter]
         return ANSIString(
             "".join(to_string),
             decoded=True,
@@ -788,6 +806,10 @@ class ANSIString(str, metaclass=ANSIMeta):
         code_indexes = kwargs.pop("code_indexes", None)
         char_indexes = kwargs.pop("char_indexes", None)
         clean_string = kwargs.pop("clean_string", None)
+        if code_indexes is not None and not isinstance(code_indexes, array):
+            code_indexes = array("I", code_indexes)
+        if char_indexes is not None and not isinstance(char_indexes, array):
+            char_indexes = array("I", char_indexes)
         # All True, or All False, not just one.
         checks = [x is None for x in [code_indexes, char_indexes, clean_string]]
         if not len(set(checks)) == 1:
@@ -807,8 +829,8 @@ class ANSIString(str, metaclass=ANSIMeta):
         elif hasattr(string, "_clean_string"):
             # It's already an ANSIString
             clean_string = string._clean_string
-            code_indexes = string._code_indexes
-            char_indexes = string._char_indexes
+            code_indexes = string._code_idx
+            char_indexes = string._char_idx
             string = string._raw_string
         else:
             # It's a string that has been pre-ansi decoded.
@@ -820,8 +842,9 @@ class ANSIString(str, metaclass=ANSIMeta):
         ansi_string = super().__new__(ANSIString, to_str(clean_string))
         ansi_string._raw_string = string
         ansi_string._clean_string = clean_string
-        ansi_string._code_indexes = code_indexes
-        ansi_string._char_indexes = char_indexes
+        # index tables are calculated on demand if not given
+        ansi_string._code_idx = code_indexes
+        ansi_string._char_idx = char_indexes
         return ansi_string
 
     def __str__(self):
@@ -893,15 +916,35 @@ class ANSIString(str, metaclass=ANSIMeta):
         The third thing to set is the _clean_string. This is a string that is
         devoid of all ANSI Escapes.
 
-        Finally, _code_indexes and _char_indexes are defined. These are lookup
+        Finally, there are _code_indexes and _char_indexes. These are lookup
         tables for which characters in the raw string are related to ANSI
-        escapes, and which are for the readable text.
+        escapes, and which are for the readable text. They are only
+        calculated when first needed.
 
         """
         self.parser = kwargs.pop("parser", ANSI_PARSER)
         super().__init__()
-        if self._code_indexes is None:
-            self._code_indexes, self._char_indexes = self._get_indexes()
+
+    @property
+    def _code_indexes(self):
+        """
+        Sorted indexes of all characters in the raw string that are part of
+        ANSI escapes.
+
+        """
+        if self._code_idx is None:
+            self._code_idx, self._char_idx = self._get_indexes()
+        return self._code_idx
+
+    @property
+    def _char_indexes(self):
+        """
+        Sorted indexes of all readable characters in the raw string.
+
+        """
+        if self._char_idx is None:
+            self._code_idx, self._char_idx = self._get_indexes()
+        return self._char_idx
 
     @staticmethod
     def _shifter(iterable, offset):
@@ -912,7 +955,22 @@ class ANSIString(str, metaclass=ANSIMeta):
         """
         if not offset:
             return iterable
-        return [i + offset for i in iterable]
+        return array("I", [i + offset for i in iterable])
+
+    def _codes_between(self, start, end):
+        """
+        Get all ANSI escape characters in the raw string between two indexes.
+
+        Args:
+            start (int): The first raw index to include.
+            end (int): The raw index to stop before.
+
+        Returns:
+            array: The raw indexes of the escape characters in the range.
+
+        """
+        code_indexes = self._code_indexes
+        return code_indexes[bisect_left(code_indexes, start) : bisect_left(code_indexes, end)]
 
     @classmethod
     def _adder(cls, first, second):
@@ -923,10 +981,12 @@ class ANSIString(str, metaclass=ANSIMeta):
 
         raw_string = first._raw_string + second._raw_string
         clean_string = first._clean_string + second._clean_string
-        code_indexes = first._code_indexes[:]
-        char_indexes = first._char_indexes[:]
-        code_indexes.extend(cls._shifter(second._code_indexes, len(first._raw_string)))
-        char_indexes.extend(cls._shifter(second._char_indexes, len(first._raw_string)))
+        code_indexes = first._code_indexes + cls._shifter(
+            second._code_indexes, len(first._raw_string)
+        )
+        char_indexes = first._char_indexes + cls._shifter(
+            second._char_indexes, len(first._raw_string)
+        )
         return ANSIString(
             raw_string,
             code_indexes=code_indexes,
@@ -1001,27 +1061,46 @@ class ANSIString(str, metaclass=ANSIMeta):
                     return ANSIString(self._raw_string[char_indexes[-1] + 1 :])
             return ANSIString("")
         try:
-            string = self[slc.start or 0]._raw_string
+            first = char_indexes[slc.start or 0]
         except IndexError:
             return ANSIString("")
+
+        # we know which raw characters are codes and which are text, so we
+        # can build the new index tables directly instead of re-parsing
+        raw_string = self._raw_string
+        string = []
+        code_indexes = array("I")
+        new_char_indexes = array("I")
+
+        def _add_codes(indexes):
+            for index in indexes:
+                code_indexes.append(len(string))
+                string.append(raw_string[index])
+
+        def _add_char(index):
+            new_char_indexes.append(len(string))
+            string.append(raw_string[index])
+
+        # start with the first character with all escapes before it
+        _add_codes(self._codes_between(0, first))
+        _add_char(first)
+        if first == char_indexes[-1]:
+            _add_codes(self._codes_between(first + 1, len(raw_string)))
         last_mark = slice_indexes[0]
         # Check between the slice intervals for escape sequences.
         i = None
         for i in slice_indexes[1:]:
-            for index in range(last_mark, i):
-                if index in self._code_indexes:
-                    string += self._raw_string[index]
+            _add_codes(self._codes_between(last_mark, i))
             last_mark = i
-            try:
-                string += self._raw_string[i]
-            except IndexError:
-                # raw_string not long enough
-                pass
+            _add_char(i)
         if i is not None:
-            append_tail = self._get_interleving(char_indexes.index(i) + 1)
-        else:
-            append_tail = ""
-        return ANSIString(string + append_tail, decoded=True)
+            _add_codes(self._codes_after(bisect_left(char_indexes, i)))
+        return ANSIString(
+            "".join(string),
+            code_indexes=code_indexes,
+            char_indexes=new_char_indexes,
+            clean_string="".join(string[index] for index in new_char_indexes),
+        )
 
     def __getitem__(self, item):
         """
@@ -1034,25 +1113,31 @@ class ANSIString(str, metaclass=ANSIMeta):
         if isinstance(item, slice):
             # Slices must be handled specially.
             return self._slice(item)
+        char_indexes = self._char_indexes
         try:
-            self._char_indexes[item]
+            index = char_indexes[item]
         except IndexError:
             raise IndexError("ANSIString Index out of range")
+        raw_string = self._raw_string
         # Get character codes after the index as well.
-        if self._char_indexes[-1] == self._char_indexes[item]:
+        if char_indexes[-1] == index:
             append_tail = self._get_interleving(item + 1)
         else:
             append_tail = ""
-        item = self._char_indexes[item]
 
-        clean = self._raw_string[item]
-        result = ""
+        clean = raw_string[index]
         # Get the character they're after, and replay all escape sequences
         # previous to it.
-        for index in range(0, item + 1):
-            if index in self._code_indexes:
-                result += self._raw_string[index]
-        return ANSIString(result + clean + append_tail, decoded=True)
+        result = "".join(raw_string[code] for code in self._codes_between(0, index))
+        nresult = len(result)
+        return ANSIString(
+            result + clean + append_tail,
+            code_indexes=array(
+                "I", [*range(nresult), *range(nresult + 1, nresult + 1 + len(append_tail))]
+            ),
+            char_indexes=array("I", [nresult]),
+            clean_string=clean,
+        )
 
     def clean(self):
         """
@@ -1124,14 +1209,16 @@ class ANSIString(str, metaclass=ANSIMeta):
 
         """
 
-        code_indexes = []
+        code_indexes = array("I")
+        char_indexes = array("I")
+        last_end = 0
         for match in self.parser.ansi_regex.finditer(self._raw_string):
-            code_indexes.extend(list(range(match.start(), match.end())))
-        if not code_indexes:
-            # Plain string, no ANSI codes.
-            return code_indexes, list(range(0, len(self._raw_string)))
-        # all indexes not occupied by ansi codes are normal characters
-        char_indexes = [i for i in range(len(self._raw_string)) if i not in code_indexes]
+            start, end = match.span()
+            # all indexes not occupied by ansi codes are normal characters
+            char_indexes.extend(range(last_end, start))
+            code_indexes.extend(range(start, end))
+            last_end = end
+        char_indexes.extend(range(last_end, len(self._raw_string)))
         return code_indexes, char_indexes
 
     def _get_interleving(self, index):
@@ -1141,19 +1228,28 @@ class ANSIString(str, metaclass=ANSIMeta):
 
         """
         try:
-            index = self._char_indexes[index - 1]
+            self._char_indexes[index - 1]
         except IndexError:
             return ""
-        s = ""
-        while True:
-            index += 1
-            if index in self._char_indexes:
-                break
-            elif index in self._code_indexes:
-                s += self._raw_string[index]
-            else:
-                break
-        return s
+        raw_string = self._raw_string
+        return "".join(raw_string[code] for code in self._codes_after(index - 1))
+
+    def _codes_after(self, index):
+        """
+        Get the escape characters between a readable character and the next.
+
+        Args:
+            index (int): The index of the readable character (in the clean string).
+
+        Returns:
+            array: The raw indexes of the escape characters following the character.
+
+        """
+        char_indexes = self._char_indexes
+        start = char_indexes[index] + 1
+        nxt = bisect_right(char_indexes, start - 1)
+        end = char_indexes[nxt] if nxt < len(char_indexes) else len(self._raw_string)
+        return self._codes_between(start, end)
 
     def __mul__(self, other):
         """
@@ -1164,8 +1260,8 @@ class ANSIString(str, metaclass=ANSIMeta):
             return NotImplemented
         raw_string = self._raw_string * other
         clean_string = self._clean_string * other
-        code_indexes = self._code_indexes[:]
-        char_indexes = self._char_indexes[:]
+        code_indexes = array("I")
+        char_indexes = array("I")
         for i in range(other):
             code_indexes.extend(self._shifter(self._code_indexes, i * len(self._raw_string)))
             char_indexes.extend(self._shifter(self._char_indexes, i * len(self._raw_string)))
@@ -1406,16 +1502,31 @@ class ANSIString(str, metaclass=ANSIMeta):
                 ANSIString('up, right, left, down')
 
         """
-        result = ANSIString("")
-        last_item = None
+        parts = []
+        separator = None
         for item in iterable:
-            if last_item is not None:
-                result += self._raw_string
+            if parts:
+                if separator is None:
+                    separator = ANSIString(self._raw_string)
+                parts.append(separator)
             if not isinstance(item, ANSIString):
                 item = ANSIString(item)
-            result += item
-            last_item = item
-        return result
+            parts.append(item)
+
+        # build the index tables in one go rather than adding one part at a time
+        code_indexes = array("I")
+        char_indexes = array("I")
+        offset = 0
+        for part in parts:
+            code_indexes.extend(self._shifter(part._code_indexes, offset))
+            char_indexes.extend(self._shifter(part._char_indexes, offset))
+            offset += len(part._raw_string)
+        return ANSIString(
+            "".join(part._raw_string for part in parts),
+            code_indexes=code_indexes,
+            char_indexes=char_indexes,
+            clean_string="".join(part._clean_string for part in parts),
+        )
 
     def _filler(self, char, amount):
         """
@@ -18,8 +18,10 @@ in-situ, e.g `obj.db.mynestedlist[3][5] = 3` would never be saved and
 be out of sync with the database.
 
 """
+import threading
 from collections import OrderedDict, defaultdict, deque
 from collections.abc import MutableMapping, MutableSequence, MutableSet
+from contextlib import contextmanager
 from functools import update_wrapper
 
 try:
@@ -33,7 +35,16 @@ from django.utils.safestring import SafeString
 from evennia.utils import logger
 from evennia.utils.utils import is_iter, to_bytes, uses_database
 
-__all__ = ("to_pickle", "from_pickle", "do_pickle", "do_unpickle", "dbserialize", "dbunserialize")
+__all__ = (
+    "to_pickle",
+    "from_pickle",
+    "do_pickle",
+    "do_unpickle",
+    "dbserialize",
+    "dbunserialize",
+    "batch_saves",
+    "flush_saves",
+)
 
 PICKLE_PROTOCOL = 2
 
@@ -72,6 +83,14 @@ _FROM_MODEL_MAP = None
 _TO_MODEL_MAP = None
 _IGNORE_DATETIME_MODELS = None
 _SESSION_HANDLER = None
+_MONITOR_HANDLER = None
+
+# coalescing of _Saver* mutable saves
+_COALESCE_SAVES = None
+_PENDING_SAVES = {}
+_PENDING_FLUSH_CALL = None
+_FLUSH_ON_SHUTDOWN = False
+_BATCH_SAVES_DEPTH = 0
 
 
 def _IS_PACKED_DBOBJ(o):
@@ -138,6 +157,127 @@ def _init_globals():
 #
 
 
+def _coalesce_save(db_obj, value):
+    """
+    Store a mutated _Saver* value to be saved to its root object later,
+    if coalescing of saves is active.
+
+    Args:
+        db_obj (Model): The root object (normally an Attribute) to save to.
+        value (_SaverMutable): The root mutable to save.
+
+    Returns:
+        bool: If the save was delayed. If not, the caller must save directly.
+
+    """
+    global _COALESCE_SAVES, _PENDING_FLUSH_CALL, _FLUSH_ON_SHUTDOWN
+    if _COALESCE_SAVES is None:
+        from django.conf import settings
+
+        _COALESCE_SAVES = settings.ATTRIBUTE_COALESCE_SAVES
+
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    if not _BATCH_SAVES_DEPTH:
+        if not _COALESCE_SAVES:
+            return False
+        from twisted.internet import reactor
+
+        if not reactor.running:
+            # no one would flush the queue
+            return False
+        if not _PENDING_FLUSH_CALL:
+            # save at the start of the next reactor iteration
+            _PENDING_FLUSH_CALL = reactor.callLater(0, flush_saves)
+            if not _FLUSH_ON_SHUTDOWN:
+                reactor.addSystemEventTrigger("before", "shutdown", flush_saves)
+                _FLUSH_ON_SHUTDOWN = True
+    _PENDING_SAVES[db_obj] = value
+    return True
+
+
+def discard_pending_save(db_obj):
+    """
+    Forget a delayed save of a mutable to this object. This is used when
+    a new value is assigned directly.
+
+    Args:
+        db_obj (Model): The object (normally an Attribute) to forget
+            delayed saves for.
+
+    """
+    if _PENDING_SAVES and db_obj.pk:
+        _PENDING_SAVES.pop(db_obj, None)
+
+
+def flush_saves():
+    """
+    Save all mutables with delayed saves to the database. This is done with
+    one `bulk_update` per model, so no `save` signals are sent. Monitors of
+    the changed values are triggered as for a normal save.
+
+    """
+    global _MONITOR_HANDLER, _PENDING_FLUSH_CALL
+    if not _MONITOR_HANDLER:
+        from evennia.scripts.monitorhandler import MONITOR_HANDLER as _MONITOR_HANDLER
+
+    if _PENDING_FLUSH_CALL:
+        if _PENDING_FLUSH_CALL.active():
+            _PENDING_FLUSH_CALL.cancel()
+        _PENDING_FLUSH_CALL = None
+    if not _PENDING_SAVES:
+        return
+
+    pending = list(_PENDING_SAVES.items())
+    _PENDING_SAVES.clear()
+    models = defaultdict(list)
+    for db_obj, value in pending:
+        if not db_obj.pk:
+            # deleted since it was changed
+            continue
+        try:
+            db_obj.db_value = to_pickle(value)
+        except Exception:
+            logger.log_trace(f"Could not save {value} to {db_obj}.")
+            continue
+        models[db_obj.__class__].append(db_obj)
+
+    for model, db_objs in models.items():
+        model._default_manager.bulk_update(db_objs, ["db_value"])
+        for db_obj in db_objs:
+            if db_obj._monitored:
+                _MONITOR_HANDLER.at_update(db_obj, "db_value")
+
+
+@contextmanager
+def batch_saves():
+    """
+    Context manager for delaying the saving of changes to mutable
+    Attribute values (like `obj.db.mylist.append(1)`) until the end of the
+    block. All values changed in the block are then saved together.
+
+    Example:
+        ::
+
+            with batch_saves():
+                for buff in buffs:
+                    obj.db.stats[buff.stat] += buff.value
+
+    """
+    global _BATCH_SAVES_DEPTH
+    _BATCH_SAVES_DEPTH += 1
+    try:
+        yield
+    finally:
+        _BATCH_SAVES_DEPTH -= 1
+        if not _BATCH_SAVES_DEPTH:
+            flush_saves()
+
+
+# nested mutables that are converted to Saver* variants on first access
+_LAZY_TYPES = frozenset((list, dict))
+
+
 def _save(method):
     """method decorator that saves data to Attribute"""
 
@@ -184,7 +324,8 @@ class _SaverMutable:
                         cls_name=cls_name, obj=self, non_saver_name=non_saver_name
                     )
                 )
-            self._db_obj.value = self
+            if not _coalesce_save(self._db_obj, self):
+                self._db_obj.value = self
         else:
             logger.log_err("_SaverMutable %s has no root Attribute to save to." % self)
 
@@ -228,7 +369,24 @@ class _SaverMutable:
         return self._data.__iter__()
 
     def __getitem__(self, key):
-        return self._data.__getitem__(key)
+        value = self._data.__getitem__(key)
+        if type(value) in _LAZY_TYPES:
+            value = self._data[key] = self._convert_lazy(value)
+        return value
+
+    def _convert_lazy(self, value):
+        """
+        Convert a nested list or dict to its Saver* variant. These are
+        only converted when first accessed (see `from_pickle`).
+
+        """
+        if type(value) is list:
+            dat = _SaverList(_parent=self)
+            dat._data.extend(value)
+        else:
+            dat = _SaverDict(_parent=self)
+            dat._data.update(value)
+        return dat
 
     def __eq__(self, other):
         return self._data == other
@@ -276,8 +434,26 @@ class _SaverList(_SaverMutable, MutableSequence):
         return self._data
 
     def __add__(self, otherlist):
+        self._convert_all_lazy()
         return list(self._data) + otherlist
 
+    def _convert_all_lazy(self):
+        data = self._data
+        if not _LAZY_TYPES.isdisjoint(map(type, data)):
+            for index, value in enumerate(data):
+                if type(value) in _LAZY_TYPES:
+                    data[index] = self._convert_lazy(value)
+
+    def __iter__(self):
+        self._convert_all_lazy()
+        return self._data.__iter__()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            self._convert_all_lazy()
+            return self._data.__getitem__(key)
+        return super().__getitem__(key)
+
     @_save
     def insert(self, index, value):
         self._data.insert(index, self._convert_mutables(value))
@@ -302,6 +478,7 @@ class _SaverList(_SaverMutable, MutableSequence):
         self._data.sort(key=key, reverse=reverse)
 
     def copy(self):
+        self._convert_all_lazy()
         return self._data.copy()
 
 
@@ -338,7 +515,7 @@ class _SaverDefaultDict(_SaverDict):
             # (important: using `key in self._data` would be always True!)
             default_value = self._data[key]
             self.__setitem__(key, default_value)
-        return self._data[key]
+        return super().__getitem__(key)
 
 
 class _SaverSet(_SaverMutable, MutableSet):
@@ -645,6 +822,371 @@ def unpack_session(item):
     return None
 
 
+# types that are stored as-is
+_PRIMITIVE_TYPES = frozenset((str, int, float, bool, bytes, SafeString, type(None)))
+
+
+def _is_flat(values):
+    """
+    Check if an iterable contains only primitive values (this is much
+    faster than checking them one by one in Python).
+
+    """
+    return _PRIMITIVE_TYPES.issuperset(map(type, values))
+
+
+def _is_flat_mapping(mapping):
+    return _is_flat(mapping.values()) and _is_flat(mapping.keys())
+
+
+# to_pickle converters, by type
+
+
+def _to_pickle_item(item):
+    """Recursive processor and identification of data"""
+    dtype = type(item)
+    if dtype in _PRIMITIVE_TYPES:
+        return item
+    convert = _TO_PICKLE_DISPATCH.get(dtype)
+    if convert:
+        return convert(item)
+    return _to_pickle_other(item)
+
+
+def _to_pickle_tuple(item):
+    if _is_flat(item):
+        return item
+    return tuple(_to_pickle_item(val) for val in item)
+
+
+def _to_pickle_list(item):
+    if _is_flat(item):
+        return list(item)
+    return [_to_pickle_item(val) for val in item]
+
+
+def _to_pickle_dict(item):
+    if _is_flat_mapping(item):
+        return dict(item)
+    return {_to_pickle_item(key): _to_pickle_item(val) for key, val in item.items()}
+
+
+def _to_pickle_defaultdict(item):
+    return defaultdict(
+        item.default_factory,
+        ((_to_pickle_item(key), _to_pickle_item(val)) for key, val in item.items()),
+    )
+
+
+def _to_pickle_set(item):
+    if _is_flat(item):
+        return set(item)
+    return set(_to_pickle_item(val) for val in item)
+
+
+def _to_pickle_ordereddict(item):
+    return OrderedDict((_to_pickle_item(key), _to_pickle_item(val)) for key, val in item.items())
+
+
+def _to_pickle_deque(item):
+    return deque((_to_pickle_item(val) for val in item), maxlen=item.maxlen)
+
+
+def _to_pickle_saver(item):
+    # we read the saver's _data directly to not convert nested mutables
+    data = item._data
+    convert = _TO_PICKLE_DISPATCH.get(type(data))
+    if convert:
+        return convert(data)
+    # a custom iterable class, stored as a normal dict or list
+    if isinstance(item, _SaverDict):
+        return _to_pickle_dict(data)
+    return _to_pickle_list(data)
+
+
+def _to_pickle_other(item):
+    """Handle data not in the dispatch table."""
+    if hasattr(item, "__serialize_dbobjs__"):
+        # Allows custom serialization of any dbobjects embedded in
+        # the item that Evennia will otherwise not find (these would
+        # otherwise lead to an error). Use the dbserialize helper from
+        # this method.
+        try:
+            item.__serialize_dbobjs__()
+        except TypeError as err:
+            # we catch typerrors so we can handle both classes (requiring
+            # classmethods) and instances
+            pass
+
+    if hasattr(item, "__iter__"):
+        try:
+            # we try to conserve the iterable class, if not convert to dict
+            try:
+                return item.__class__(
+                    (_to_pickle_item(key), _to_pickle_item(val)) for key, val in item.items()
+                )
+            except (AttributeError, TypeError):
+                return {_to_pickle_item(key): _to_pickle_item(val) for key, val in item.items()}
+        except Exception:
+            # we try to conserve the iterable class, if not convert to list
+            try:
+                return item.__class__([_to_pickle_item(val) for val in item])
+            except (AttributeError, TypeError):
+                return [_to_pickle_item(val) for val in item]
+    elif hasattr(item, "sessid") and hasattr(item, "conn_time"):
+        return pack_session(item)
+    try:
+        return pack_dbobj(item)
+    except TypeError:
+        return item
+    except Exception:
+        logger.log_err(f"The object {item} of type {type(item)} could not be stored.")
+        raise
+
+
+_TO_PICKLE_DISPATCH = {
+    tuple: _to_pickle_tuple,
+    list: _to_pickle_list,
+    dict: _to_pickle_dict,
+    defaultdict: _to_pickle_defaultdict,
+    deque: _to_pickle_deque,
+    set: _to_pickle_set,
+    OrderedDict: _to_pickle_ordereddict,
+    _SaverList: _to_pickle_saver,
+    _SaverDict: _to_pickle_saver,
+    _SaverDefaultDict: _to_pickle_saver,
+    _SaverDeque: _to_pickle_saver,
+    _SaverSet: _to_pickle_saver,
+    _SaverOrderedDict: _to_pickle_saver,
+}
+
+
+# from_pickle converters, by type
+
+
+def _from_pickle_item(item):
+    """Recursive processor and identification of data"""
+    dtype = type(item)
+    if dtype in _PRIMITIVE_TYPES:
+        return item
+    convert = _FROM_PICKLE_DISPATCH.get(dtype)
+    if convert:
+        return convert(item)
+    return _from_pickle_other(item)
+
+
+def _from_pickle_tuple(item):
+    if _IS_PACKED_DBOBJ(item):
+        return unpack_dbobj(item)
+    elif _IS_PACKED_SESSION(item):
+        return unpack_session(item)
+    elif _is_flat(item):
+        return item
+    return tuple(_from_pickle_item(val) for val in item)
+
+
+def _from_pickle_list(item):
+    if _is_flat(item):
+        return list(item)
+    return [_from_pickle_item(val) for val in item]
+
+
+def _from_pickle_dict(item):
+    if _is_flat_mapping(item):
+        return dict(item)
+    return {_from_pickle_item(key): _from_pickle_item(val) for key, val in item.items()}
+
+
+def _from_pickle_defaultdict(item):
+    return defaultdict(
+        item.default_factory,
+        ((_from_pickle_item(key), _from_pickle_item(val)) for key, val in item.items()),
+    )
+
+
+def _from_pickle_set(item):
+    return set(_from_pickle_item(val) for val in item)
+
+
+def _from_pickle_ordereddict(item):
+    return OrderedDict(
+        (_from_pickle_item(key), _from_pickle_item(val)) for key, val in item.items()
+    )
+
+
+def _from_pickle_deque(item):
+    return deque((_from_pickle_item(val) for val in item), maxlen=item.maxlen)
+
+
+def _deserialize_dbobjs(item):
+    if hasattr(item, "__deserialize_dbobjs__"):
+        # this allows the object to custom-deserialize any embedded dbobjs
+        # that we previously serialized with __serialize_dbobjs__.
+        # use the dbunserialize helper in this module.
+        try:
+            item.__deserialize_dbobjs__()
+        except (TypeError, UnpicklingError):
+            # handle recoveries both of classes (requiring classmethods
+            # or instances. Unpickling errors can happen when re-loading the
+            # data from cache (because the hidden entity was already
+            # deserialized and stored back on the object, unpickling it
+            # again fails). TODO: Maybe one could avoid this retry in a
+            # more graceful way?
+            pass
+    return item
+
+
+def _from_pickle_other(item):
+    """Handle data not in the dispatch table."""
+    if hasattr(item, "__iter__"):
+        try:
+            # we try to conserve the iterable class, if not convert to dict
+            try:
+                return item.__class__(
+                    (_from_pickle_item(key), _from_pickle_item(val)) for key, val in item.items()
+                )
+            except (AttributeError, TypeError):
+                return {_from_pickle_item(key): _from_pickle_item(val) for key, val in item.items()}
+        except Exception:
+            try:
+                # we try to conserve the iterable class if
+                # it accepts an iterator
+                return item.__class__(_from_pickle_item(val) for val in item)
+            except (AttributeError, TypeError):
+                return [_from_pickle_item(val) for val in item]
+    return _deserialize_dbobjs(item)
+
+
+_FROM_PICKLE_DISPATCH = {
+    tuple: _from_pickle_tuple,
+    list: _from_pickle_list,
+    dict: _from_pickle_dict,
+    defaultdict: _from_pickle_defaultdict,
+    set: _from_pickle_set,
+    OrderedDict: _from_pickle_ordereddict,
+    deque: _from_pickle_deque,
+}
+
+
+# from_pickle converters to _Saver* mutables, by type. These are given either
+# the parent mutable or (for the root of the tree) the db_obj to save to.
+
+
+def _from_pickle_tree(item, parent):
+    """Recursive processor, building a parent-tree from iterable data"""
+    dtype = type(item)
+    if dtype in _PRIMITIVE_TYPES:
+        return item
+    convert = _FROM_PICKLE_TREE_DISPATCH.get(dtype)
+    if convert:
+        return convert(item, parent)
+    if hasattr(item, "__iter__"):
+        return _from_pickle_tree_iterable(item, parent)
+    return _deserialize_dbobjs(item)
+
+
+def _from_pickle_tree_tuple(item, parent):
+    if _IS_PACKED_DBOBJ(item):
+        return unpack_dbobj(item)
+    elif _is_flat(item):
+        return item
+    return tuple(_from_pickle_tree(val, item) for val in item)
+
+
+def _from_pickle_tree_list(item, parent, db_obj=None):
+    if parent is not None and _is_flat(item):
+        # the _SaverList is created by the parent when first accessed
+        return list(item)
+    dat = _SaverList(_parent=parent, _db_obj=db_obj)
+    if _is_flat(item):
+        dat._data.extend(item)
+    else:
+        dat._data.extend(_from_pickle_tree(val, dat) for val in item)
+    return dat
+
+
+def _from_pickle_tree_dict(item, parent, db_obj=None):
+    flat = _is_flat_mapping(item)
+    if parent is not None and flat:
+        # the _SaverDict is created by the parent when first accessed
+        return dict(item)
+    dat = _SaverDict(_parent=parent, _db_obj=db_obj)
+    if flat:
+        dat._data.update(item)
+    else:
+        dat._data.update(
+            (_from_pickle_item(key), _from_pickle_tree(val, dat)) for key, val in item.items()
+        )
+    return dat
+
+
+def _from_pickle_tree_defaultdict(item, parent, db_obj=None):
+    dat = _SaverDefaultDict(item.default_factory, _parent=parent, _db_obj=db_obj)
+    dat._data.update(
+        (_from_pickle_item(key), _from_pickle_tree(val, dat)) for key, val in item.items()
+    )
+    return dat
+
+
+def _from_pickle_tree_set(item, parent, db_obj=None):
+    dat = _SaverSet(_parent=parent, _db_obj=db_obj)
+    dat._data.update(_from_pickle_tree(val, dat) for val in item)
+    return dat
+
+
+def _from_pickle_tree_ordereddict(item, parent, db_obj=None):
+    dat = _SaverOrderedDict(_parent=parent, _db_obj=db_obj)
+    dat._data.update(
+        (_from_pickle_item(key), _from_pickle_tree(val, dat)) for key, val in item.items()
+    )
+    return dat
+
+
+def _from_pickle_tree_deque(item, parent, db_obj=None):
+    dat = _SaverDeque(_parent=parent, _db_obj=db_obj, maxlen=item.maxlen)
+    dat._data.extend(_from_pickle_item(val) for val in item)
+    return dat
+
+
+def _from_pickle_tree_iterable(item, parent, db_obj=None):
+    try:
+        # we try to conserve the iterable class, if not convert to dict
+        try:
+            dat = _SaverDict(_parent=parent, _db_obj=db_obj, _class=item.__class__)
+            dat._data.update(
+                (_from_pickle_item(key), _from_pickle_tree(val, dat)) for key, val in item.items()
+            )
+            return dat
+        except (AttributeError, TypeError):
+            dat = _SaverDict(_parent=parent, _db_obj=db_obj)
+            dat._data.update(
+                (_from_pickle_item(key), _from_pickle_tree(val, dat)) for key, val in item.items()
+            )
+            return dat
+    except Exception:
+        try:
+            # we try to conserve the iterable class if it
+            # accepts an iterator
+            dat = _SaverList(_parent=parent, _db_obj=db_obj, _class=item.__class__)
+            dat._data.extend(_from_pickle_tree(val, dat) for val in item)
+            return dat
+        except (AttributeError, TypeError):
+            dat = _SaverList(_parent=parent, _db_obj=db_obj)
+            dat._data.extend(_from_pickle_tree(val, dat) for val in item)
+            return dat
+
+
+_FROM_PICKLE_TREE_DISPATCH = {
+    tuple: _from_pickle_tree_tuple,
+    list: _from_pickle_tree_list,
+    dict: _from_pickle_tree_dict,
+    defaultdict: _from_pickle_tree_defaultdict,
+    set: _from_pickle_tree_set,
+    OrderedDict: _from_pickle_tree_ordereddict,
+    deque: _from_pickle_tree_deque,
+}
+
+
 #
 # Access methods
 
@@ -664,73 +1206,7 @@ def to_pickle(data):
         data (any): Pickled data.
 
     """
-
-    def process_item(item):
-        """Recursive processor and identification of data"""
-
-        dtype = type(item)
-
-        if dtype in (str, int, float, bool, bytes, SafeString):
-            return item
-        elif dtype == tuple:
-            return tuple(process_item(val) for val in item)
-        elif dtype in (list, _SaverList):
-            return [process_item(val) for val in item]
-        elif dtype in (dict, _SaverDict):
-            return dict((process_item(key), process_item(val)) for key, val in item.items())
-        elif dtype in (defaultdict, _SaverDefaultDict):
-            return defaultdict(
-                item.default_factory,
-                ((process_item(key), process_item(val)) for key, val in item.items()),
-            )
-        elif dtype in (deque, _SaverDeque):
-            return deque((process_item(val) for val in item), maxlen=item.maxlen)
-        elif dtype in (set, _SaverSet):
-            return set(process_item(val) for val in item)
-        elif dtype in (OrderedDict, _SaverOrderedDict):
-            return OrderedDict((process_item(key), process_item(val)) for key, val in item.items())
-        elif dtype in (deque, _SaverDeque):
-            return deque(process_item(val) for val in item)
-
-        # not one of the base types
-        if hasattr(item, "__serialize_dbobjs__"):
-            # Allows custom serialization of any dbobjects embedded in
-            # the item that Evennia will otherwise not find (these would
-            # otherwise lead to an error). Use the dbserialize helper from
-            # this method.
-            try:
-                item.__serialize_dbobjs__()
-            except TypeError as err:
-                # we catch typerrors so we can handle both classes (requiring
-                # classmethods) and instances
-                pass
-
-        if hasattr(item, "__iter__"):
-            try:
-                # we try to conserve the iterable class, if not convert to dict
-                try:
-                    return item.__class__(
-                        (process_item(key), process_item(val)) for key, val in item.items()
-                    )
-                except (AttributeError, TypeError):
-                    return {process_item(key): process_item(val) for key, val in item.items()}
-            except Exception:
-                # we try to conserve the iterable class, if not convert to list
-                try:
-                    return item.__class__([process_item(val) for val in item])
-                except (AttributeError, TypeError):
-                    return [process_item(val) for val in item]
-        elif hasattr(item, "sessid") and hasattr(item, "conn_time"):
-            return pack_session(item)
-        try:
-            return pack_dbobj(item)
-        except TypeError:
-            return item
-        except Exception:
-            logger.log_err(f"The object {item} of type {type(item)} could not be stored.")
-            raise
-
-    return process_item(data)
+    return _to_pickle_item(data)
 
 
 # @transaction.autocommit
@@ -754,209 +1230,27 @@ def from_pickle(data, db_obj=None):
     Returns:
         data (any): Unpickled data.
 
-    """
-
-    def process_item(item):
-        """Recursive processor and identification of data"""
-        # breakpoint()
-        dtype = type(item)
-        if dtype in (str, int, float, bool, bytes, SafeString):
-            return item
-        elif _IS_PACKED_DBOBJ(item):
-            # this must be checked before tuple
-            return unpack_dbobj(item)
-        elif _IS_PACKED_SESSION(item):
-            return unpack_session(item)
-        elif dtype == tuple:
-            return tuple(process_item(val) for val in item)
-        elif dtype == dict:
-            return dict((process_item(key), process_item(val)) for key, val in item.items())
-        elif dtype == defaultdict:
-            return defaultdict(
-                item.default_factory,
-                ((process_item(key), process_item(val)) for key, val in item.items()),
-            )
-        elif dtype == set:
-            return set(process_item(val) for val in item)
-        elif dtype == OrderedDict:
-            return OrderedDict((process_item(key), process_item(val)) for key, val in item.items())
-        elif dtype == deque:
-            return deque((process_item(val) for val in item), maxlen=item.maxlen)
-        elif hasattr(item, "__iter__"):
-            try:
-                # we try to conserve the iterable class, if not convert to dict
-                try:
-                    return item.__class__(
-                        (process_item(key), process_item(val)) for key, val in item.items()
-                    )
-                except (AttributeError, TypeError):
-                    return {process_item(key): process_item(val) for key, val in item.items()}
-            except Exception:
-                try:
-                    # we try to conserve the iterable class if
-                    # it accepts an iterator
-                    return item.__class__(process_item(val) for val in item)
-                except (AttributeError, TypeError):
-                    return [process_item(val) for val in item]
-
-        if hasattr(item, "__deserialize_dbobjs__"):
-            # this allows the object to custom-deserialize any embedded dbobjs
-            # that we previously serialized with __serialize_dbobjs__.
-            # use the dbunserialize helper in this module.
-            try:
-                item.__deserialize_dbobjs__()
-            except (TypeError, UnpicklingError):
-                # handle recoveries both of classes (requiring classmethods
-                # or instances. Unpickling errors can happen when re-loading the
-                # data from cache (because the hidden entity was already
-                # deserialized and stored back on the object, unpickling it
-                # again fails). TODO: Maybe one could avoid this retry in a
-                # more graceful way?
-                pass
-
-        return item
+    Notes:
+        Nested lists and dicts containing only primitive values (like
+        strings and numbers) are not converted to their _Saver* counterparts
+        until they are first accessed.
 
-    def process_tree(item, parent):
-        """Recursive processor, building a parent-tree from iterable data"""
-        # breakpoint()
-        dtype = type(item)
-        if dtype in (str, int, float, bool, bytes, SafeString):
-            return item
-        elif _IS_PACKED_DBOBJ(item):
-            # this must be checked before tuple
-            return unpack_dbobj(item)
-        elif dtype == tuple:
-            return tuple(process_tree(val, item) for val in item)
-        elif dtype == list:
-            dat = _SaverList(_parent=parent)
-            dat._data.extend(process_tree(val, dat) for val in item)
-            return dat
-        elif dtype == dict:
-            dat = _SaverDict(_parent=parent)
-            dat._data.update(
-                (process_item(key), process_tree(val, dat)) for key, val in item.items()
-            )
-            return dat
-        elif dtype == defaultdict:
-            dat = _SaverDefaultDict(item.default_factory, _parent=parent)
-            dat._data.update(
-                (process_item(key), process_tree(val, dat)) for key, val in item.items()
-            )
-            return dat
-        elif dtype == set:
-            dat = _SaverSet(_parent=parent)
-            dat._data.update(set(process_tree(val, dat) for val in item))
-            return dat
-        elif dtype == OrderedDict:
-            dat = _SaverOrderedDict(_parent=parent)
-            dat._data.update(
-                (process_item(key), process_tree(val, dat)) for key, val in item.items()
-            )
-            return dat
-        elif dtype == deque:
-            dat = _SaverDeque(_parent=parent, maxlen=item.maxlen)
-            dat._data.extend(process_item(val) for val in item)
-            return dat
-        elif hasattr(item, "__iter__"):
-            try:
-                # we try to conserve the iterable class, if not convert to dict
-                try:
-                    dat = _SaverDict(_parent=parent, _class=item.__class__)
-                    dat._data.update(
-                        (process_item(key), process_tree(val, dat)) for key, val in item.items()
-                    )
-                    return dat
-                except (AttributeError, TypeError):
-                    dat = _SaverDict(_parent=parent)
-                    dat._data.update(
-                        (process_item(key), process_tree(val, dat)) for key, val in item.items()
-                    )
-                    return dat
-            except Exception:
-                try:
-                    # we try to conserve the iterable class if it
-                    # accepts an iterator
-                    dat = _SaverList(_parent=parent, _class=item.__class__)
-                    dat._data.extend(process_tree(val, dat) for val in item)
-                    return dat
-                except (AttributeError, TypeError):
-                    dat = _SaverList(_parent=parent)
-                    dat._data.extend(process_tree(val, dat) for val in item)
-                    return dat
-
-        if hasattr(item, "__deserialize_dbobjs__"):
-            try:
-                item.__deserialize_dbobjs__()
-            except (TypeError, UnpicklingError):
-                pass
-
-        return item
+    """
+    if _PENDING_SAVES and db_obj is not None and db_obj.pk and db_obj in _PENDING_SAVES:
+        # changed but not yet saved to db_obj
+        return _PENDING_SAVES[db_obj]
 
     if db_obj:
         # convert lists, dicts and sets to their Saved* counterparts. It
         # is only relevant if the "root" is an iterable of the right type.
         dtype = type(data)
-        if dtype in (str, int, float, bool, bytes, SafeString, tuple):
-            return process_item(data)
-        elif dtype == list:
-            dat = _SaverList(_db_obj=db_obj)
-            dat._data.extend(process_tree(val, dat) for val in data)
-            return dat
-        elif dtype == dict:
-            dat = _SaverDict(_db_obj=db_obj)
-            dat._data.update(
-                (process_item(key), process_tree(val, dat)) for key, val in data.items()
-            )
-            return dat
-        elif dtype == defaultdict:
-            dat = _SaverDefaultDict(data.default_factory, _db_obj=db_obj)
-            dat._data.update(
-                (process_item(key), process_tree(val, dat)) for key, val in data.items()
-            )
-            return dat
-        elif dtype == set:
-            dat = _SaverSet(_db_obj=db_obj)
-            dat._data.update(process_tree(val, dat) for val in data)
-            return dat
-        elif dtype == OrderedDict:
-            dat = _SaverOrderedDict(_db_obj=db_obj)
-            dat._data.update(
-                (process_item(key), process_tree(val, dat)) for key, val in data.items()
-            )
-            return dat
-        elif dtype == deque:
-            dat = _SaverDeque(_db_obj=db_obj, maxlen=data.maxlen)
-            dat._data.extend(process_item(val) for val in data)
-            return dat
-        elif hasattr(data, "__iter__"):
-            try:
-                # we try to conserve the iterable class, if not convert to dict
-                try:
-                    dat = _SaverDict(_db_obj=db_obj, _class=data.__class__)
-                    dat._data.update(
-                        (process_item(key), process_tree(val, dat)) for key, val in data.items()
-                    )
-                    return dat
-                except (AttributeError, TypeError):
-                    dat = _SaverDict(_db_obj=db_obj)
-                    dat._data.update(
-                        (process_item(key), process_tree(val, dat)) for key, val in data.items()
-                    )
-                    return dat
-            except Exception:
-                try:
-                    # we try to conserve the iterable class if it
-                    # accepts an iterator
-                    dat = _SaverList(_db_obj=db_obj, _class=data.__class__)
-                    dat._data.extend(process_tree(val, dat) for val in data)
-                    return dat
-
-                except (AttributeError, TypeError):
-                    dat = _SaverList(_db_obj=db_obj)
-                    dat._data.extend(process_tree(val, dat) for val in data)
-                    return dat
-
-    return process_item(data)
+        convert = _FROM_PICKLE_TREE_DISPATCH.get(dtype)
+        if convert and dtype is not tuple:
+            return convert(data, None, db_obj=db_obj)
+        elif not convert and dtype not in _PRIMITIVE_TYPES and hasattr(data, "__iter__"):
+            return _from_pickle_tree_iterable(data, None, db_obj=db_obj)
+
+    return _from_pickle_item(data)
 
 
 def do_pickle(data):
@@ -46,6 +46,8 @@ The `FuncParser` also accepts a direct dict mapping of `{'name': callable, ...}`
 import dataclasses
 import inspect
 import random
+import re
+from collections import OrderedDict
 
 from django.conf import settings
 from evennia.utils import logger, search
@@ -68,6 +70,12 @@ _CLIENT_DEFAULT_WIDTH = settings.CLIENT_DEFAULT_WIDTH
 _MAX_NESTING = settings.FUNCPARSER_MAX_NESTING
 _START_CHAR = settings.FUNCPARSER_START_CHAR
 _ESCAPE_CHAR = settings.FUNCPARSER_ESCAPE_CHAR
+_COMPILE_CACHE_SIZE = settings.FUNCPARSER_COMPILE_CACHE_SIZE
+# LRU cache of compiled strings, shared by all parsers
+_COMPILE_CACHE = OrderedDict()
+# marks the position of function calls in a compiled string
+_COMPILE_MARKER = "\x00%i\x00"
+_RE_COMPILE_MARKER = re.compile(r"\x00(\d+)\x00")
 
 
 @dataclasses.dataclass
@@ -91,6 +99,8 @@ class _ParsedFunc:
     open_lparens: int = 0
     open_lsquate: int = 0
     open_lcurly: int = 0
+    # how many funcdefs this is nested inside
+    depth: int = 0
     exec_return = ""
 
     def get(self):
@@ -108,6 +118,105 @@ class ParsingError(RuntimeError):
     pass
 
 
+class CompiledString:
+    """
+    A string pre-parsed by `FuncParser.compile`. This stores the string's
+    plain text parts and parsed function calls so the string can be parsed
+    repeatedly (for example once per receiver of a message) without
+    re-tokenizing it every time.
+
+    """
+
+    def __init__(self, parser, string, parts=None, calls=None):
+        """
+        Args:
+            parser (FuncParser): The parser that compiled the string.
+            string (str): The original string.
+            parts (list, optional): A list of text-parts (str) and indices (int)
+                into `calls`, in order. If `None`, the string could not be
+                compiled and will be fully parsed every time.
+            calls (list, optional): The `_ParsedFunc`s found in the string.
+
+        """
+        self.parser = parser
+        self.string = string
+        self.parts = parts
+        self.calls = calls or []
+
+    def __str__(self):
+        return self.string
+
+    def __repr__(self):
+        return f"<CompiledString {self.string!r}>"
+
+    def parse(
+        self,
+        raise_errors=False,
+        escape=False,
+        strip=False,
+        return_str=True,
+        memo=None,
+        memoize=None,
+        **reserved_kwargs,
+    ):
+        """
+        Parse the compiled string. This gives the same result as
+        `FuncParser.parse` would for the original string.
+
+        Args:
+            raise_errors (bool, optional): Raise errors instead of leaving
+                failing functions unparsed.
+            escape (bool, optional): Escape all functions instead of calling them.
+            strip (bool, optional): Remove all functions instead of calling them.
+            return_str (bool, optional): If unset and the string consists of a
+                single function call, return the result of the call as-is.
+            memo (dict, optional): If given, results of function calls are stored
+                in (and re-used from) this dict. Only share a memo between parses
+                for which the memoized calls are known to give the same result.
+            memoize (iterable, optional): Names of the functions whose results
+                should be stored in `memo`. If not given, all calls are memoized.
+            **reserved_kwargs: Passed into every callable, as for `FuncParser.parse`.
+
+        Returns:
+            str or any: The parsed string (or the result of a single call if
+                `return_str` is unset).
+
+        """
+        parts, calls = self.parts, self.calls
+        if parts is None or (not return_str and len(calls) > 1):
+            # not possible to use compiled form
+            return self.parser._parse(
+                self.string,
+                self.parser.execute,
+                raise_errors=raise_errors,
+                escape=escape,
+                strip=strip,
+                return_str=return_str,
+                **reserved_kwargs,
+            )
+
+        results = []
+        for icall, parsedfunc in enumerate(calls):
+            if strip:
+                result = ""
+            elif escape:
+                result = self.parser.escape_char + parsedfunc.fullstr
+            elif memo is not None and icall in memo:
+                result = memo[icall]
+            else:
+                result = self.parser.execute(
+                    parsedfunc, raise_errors=raise_errors, **reserved_kwargs
+                )
+                if memo is not None and (memoize is None or parsedfunc.funcname in memoize):
+                    memo[icall] = result
+            results.append(result)
+
+        if not return_str and parts == [0]:
+            # a lone function call returns its result as-is
+            return results[0]
+        return "".join(part if isinstance(part, str) else str(results[part]) for part in parts)
+
+
 class FuncParser:
     """
     Sets up a parser for strings containing `$funcname(*args, **kwargs)`
@@ -176,6 +285,12 @@ class FuncParser:
         self.escape_char = escape_char
         self.start_char = start_char
         self.default_kwargs = default_kwargs
+        # identifies compiled strings valid for this parser in the cache
+        self._cache_key = (
+            start_char,
+            escape_char,
+            frozenset((funcname, id(clble)) for funcname, clble in loaded_callables.items()),
+        )
 
     def validate_callables(self, callables):
         """
@@ -283,7 +398,9 @@ class FuncParser:
         used to initiate the parser will be eligible for parsing.
 
         Args:
-            string (str): The string to parse.
+            string (str or CompiledString): The string to parse. Strings are
+                compiled (see `.compile`) and cached, so re-parsing the same
+                string will not need to tokenize it again.
             raise_errors (bool, optional): By default, a failing parse just
                 means not parsing the string but leaving it as-is. If this is
                 `True`, errors (like not closing brackets) will lead to an
@@ -309,6 +426,50 @@ class FuncParser:
         Raises:
             ParsingError: If a problem is encountered and `raise_errors` is True.
 
+        """
+        if isinstance(string, str):
+            if self.start_char not in string and self.escape_char not in string:
+                # nothing to parse
+                return string
+            string = self.compile(string)
+        if isinstance(string, CompiledString):
+            return string.parse(
+                raise_errors=raise_errors,
+                escape=escape,
+                strip=strip,
+                return_str=return_str,
+                **reserved_kwargs,
+            )
+        return self._parse(
+            string,
+            self.execute,
+            raise_errors=raise_errors,
+            escape=escape,
+            strip=strip,
+            return_str=return_str,
+            **reserved_kwargs,
+        )
+
+    def _parse(
+        self,
+        string,
+        execute,
+        raise_errors=False,
+        escape=False,
+        strip=False,
+        return_str=True,
+        **reserved_kwargs,
+    ):
+        """
+        Helper doing the actual parsing for `parse` and `compile`.
+
+        Args:
+            string (str): The string to parse.
+            execute (callable): Called as `execute(parsedfunc, raise_errors, **reserved_kwargs)`
+                to execute each parsed function.
+
+        Other args are the same as for `parse`.
+
         """
         start_char = self.start_char
         escape_char = self.escape_char
@@ -383,7 +544,7 @@ class FuncParser:
                         callstack.append(curr_func)
 
                 # start a new func
-                curr_func = _ParsedFunc(prefix=char, fullstr=char)
+                curr_func = _ParsedFunc(prefix=char, fullstr=char, depth=len(callstack))
                 continue
 
             if not curr_func:
@@ -520,7 +681,7 @@ class FuncParser:
                     else:
                         # execute the function - the result may be a string or
                         # something else
-                        exec_return = self.execute(
+                        exec_return = execute(
                             curr_func, raise_errors=raise_errors, **reserved_kwargs
                         )
 
@@ -576,6 +737,81 @@ class FuncParser:
 
         return fullstr
 
+    def compile(self, string):
+        """
+        Pre-parse a string into a `CompiledString`. This can then be parsed
+        any number of times (with different kwargs) without having to
+        re-tokenize the string. This is useful when the same string is parsed
+        many times, like when sending a message to every object in a room.
+
+        Args:
+            string (str): The string to compile.
+
+        Returns:
+            CompiledString: The pre-parsed string. Use its `.parse()` method
+                (or pass it to `FuncParser.parse`) to get the result.
+
+        Notes:
+            Strings with nested function calls cannot be compiled (since how
+            they parse can depend on the results of the inner calls). The
+            returned `CompiledString` will then fall back to fully parsing the
+            string every time.
+
+            The most recently compiled strings are cached (see the
+            `FUNCPARSER_COMPILE_CACHE_SIZE` setting), so calling this
+            repeatedly with the same string is cheap. This cache is also
+            used by `.parse`.
+
+        """
+        if isinstance(string, CompiledString):
+            return string
+        if not _COMPILE_CACHE_SIZE:
+            return self._compile(string)
+
+        key = (string, self._cache_key)
+        try:
+            parts, calls = _COMPILE_CACHE[key]
+        except KeyError:
+            compiled = self._compile(string)
+            _COMPILE_CACHE[key] = (compiled.parts, compiled.calls)
+            if len(_COMPILE_CACHE) > _COMPILE_CACHE_SIZE:
+                _COMPILE_CACHE.popitem(last=False)
+            return compiled
+        _COMPILE_CACHE.move_to_end(key)
+        return CompiledString(self, string, parts=parts, calls=calls)
+
+    def _compile(self, string):
+        """
+        Compile a string without using the cache. See `compile`.
+
+        """
+        calls = []
+        nested = False
+
+        def _record(parsedfunc, raise_errors=False, **reserved_kwargs):
+            nonlocal nested
+            nested = nested or parsedfunc.depth > 0
+            calls.append(parsedfunc)
+            return _COMPILE_MARKER % (len(calls) - 1)
+
+        if _COMPILE_MARKER[0] not in string:
+            try:
+                # this only raises on too-deep nesting, which is not compiled anyway
+                fullstr = self._parse(string, _record, raise_errors=True)
+            except ParsingError:
+                nested = True
+            if not nested:
+                parts = [
+                    int(part) if ipart % 2 else part
+                    for ipart, part in enumerate(_RE_COMPILE_MARKER.split(fullstr))
+                ]
+                if [part for part in parts if isinstance(part, int)] == list(range(len(calls))):
+                    return CompiledString(
+                        self, string, parts=[part for part in parts if part != ""], calls=calls
+                    )
+        # we can't safely compile this string
+        return CompiledString(self, string)
+
     def parse_to_any(
         self, string, raise_errors=False, escape=False, strip=False, **reserved_kwargs
     ):
@@ -4,13 +4,16 @@ Django ID mapper
 Modified for Evennia by making sure that no model references
 leave caching unexpectedly (no use of WeakRefs).
 
-Also adds `cache_size()` for monitoring the size of the cache.
+Also adds `cache_size()` for monitoring the size of the cache and
+`evict_cache()` for trimming it by removing the least recently used
+instances.
 """
 
 import gc
 import os
 import threading
 import time
+from itertools import count
 from weakref import WeakValueDictionary
 
 from django.core.exceptions import FieldError, ObjectDoesNotExist
@@ -26,12 +29,16 @@ from evennia.utils.utils import dbref, get_evennia_pids, to_str
 from .manager import SharedMemoryManager
 
 AUTO_FLUSH_MIN_INTERVAL = 60.0 * 5  # at least 5 mins between cache flushes
+AUTO_FLUSH_EVICT_FRACTION = 0.25  # how much of the cache to evict when memory is low
 
 _GA = object.__getattribute__
 _SA = object.__setattr__
 _DA = object.__delattr__
 _MONITOR_HANDLER = None
 
+# ticks up on every cache access, to find the least recently used instances
+_CACHE_ACCESS_COUNTER = count(1)
+
 # References to db-updated objects are stored here so the
 # main process can be informed to re-cache itself.
 PROC_MODIFIED_COUNT = 0
@@ -252,6 +259,13 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
 
     objects = SharedMemoryManager()
 
+    # set by the MonitorHandler on instances with monitored fields. Saving
+    # an instance without this set skips the MonitorHandler entirely.
+    _monitored = False
+
+    # when this instance was last gotten from the cache (see evict_instance_cache)
+    _idmapper_last_used = 0
+
     class Meta(object):
         abstract = True
 
@@ -299,7 +313,12 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
         done even when instance caching is disabled.
 
         """
-        return cls.__dbclass__.__instance_cache__.get(id)
+        instance = cls.__dbclass__.__instance_cache__.get(id)
+        if instance is not None:
+            # mark as recently used. This is not done by reordering the cache,
+            # since it may be read from other threads while being iterated over.
+            instance._idmapper_last_used = next(_CACHE_ACCESS_COUNTER)
+        return instance
 
     @classmethod
     def cache_instance(cls, instance, new=False):
@@ -316,6 +335,7 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
         pk = instance._get_pk_val()
         if pk is not None:
             new = new or pk not in cls.__dbclass__.__instance_cache__
+            instance._idmapper_last_used = next(_CACHE_ACCESS_COUNTER)
             cls.__dbclass__.__instance_cache__[pk] = instance
             if new:
                 try:
@@ -375,11 +395,56 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
             cls.__dbclass__.__instance_cache__ = dict(
                 (key, obj)
                 for key, obj in cls.__dbclass__.__instance_cache__.items()
-                if not obj.at_idmapper_flush()
+                if obj._monitored or not obj.at_idmapper_flush()
             )
 
     # flush_instance_cache = classmethod(flush_instance_cache)
 
+    @classmethod
+    def get_eviction_candidates(cls, num):
+        """
+        Get the least recently used instances that may be evicted from the
+        cache. Instances refusing eviction (see `at_idmapper_evict`) or being
+        monitored (see `MonitorHandler`) are not included.
+
+        Args:
+            num (int): How many candidates to get at most.
+
+        Returns:
+            list: `(key, instance)` tuples, least recently used first.
+
+        """
+        if num <= 0:
+            return []
+        candidates = []
+        for key, instance in sorted(
+            list(cls.__dbclass__.__instance_cache__.items()),
+            key=lambda item: item[1]._idmapper_last_used,
+        ):
+            if len(candidates) >= num:
+                break
+            if not instance._monitored and instance.at_idmapper_evict():
+                candidates.append((key, instance))
+        return candidates
+
+    @classmethod
+    def evict_instance_cache(cls, num):
+        """
+        Evict the least recently used instances from the cache. Instances
+        refusing eviction (see `at_idmapper_evict`) or being monitored (see
+        `MonitorHandler`) are kept. So are the instances that any instance
+        staying in the cache has loaded foreign keys to, so these don't end
+        up duplicated when loaded again.
+
+        Args:
+            num (int): How many instances to evict at most.
+
+        Returns:
+            int: The number of instances actually evicted.
+
+        """
+        return _evict_instances({cls.__dbclass__: cls.get_eviction_candidates(num)})
+
     # per-instance methods
 
     def __eq__(self, other):
@@ -401,6 +466,19 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
         """
         return True
 
+    def at_idmapper_evict(self):
+        """
+        This is called when the idmapper is about to evict this instance
+        from the cache to save memory. By default this is the same as
+        `at_idmapper_flush`.
+
+        Returns:
+            do_evict (bool): If True, evict this object. If False, keep
+                it in the cache.
+
+        """
+        return self.at_idmapper_flush()
+
     def flush_from_cache(self, force=False):
         """
         Flush this instance from the instance cache. Use
@@ -409,7 +487,7 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
         """
         pk = self._get_pk_val()
         if pk:
-            if force or self.at_idmapper_flush():
+            if force or (not self._monitored and self.at_idmapper_flush()):
                 self.__class__.__dbclass__.__instance_cache__.pop(pk, None)
 
     def delete(self, *args, **kwargs):
@@ -482,10 +560,12 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
             # meta.fields are already field objects; get them all
             new = True
             update_fields = self._meta.fields
+        monitored = self._monitored
         for field in update_fields:
             fieldname = field.name
             # trigger eventual monitors
-            _MONITOR_HANDLER.at_update(self, fieldname)
+            if monitored:
+                _MONITOR_HANDLER.at_update(self, fieldname)
             # if a hook is defined it must be named exactly on this form
             hookname = "at_%s_postsave" % fieldname
             if hasattr(self, hookname) and callable(_GA(self, hookname)):
@@ -519,6 +599,24 @@ class WeakSharedMemoryModel(SharedMemoryModel, metaclass=WeakSharedMemoryModelBa
     class Meta(object):
         abstract = True
 
+    @classmethod
+    def get_cached_instance(cls, id):
+        """
+        Method to retrieve a cached instance by pk value. The weak cache
+        does not track recent use.
+
+        """
+        return cls.__dbclass__.__instance_cache__.get(id)
+
+    @classmethod
+    def get_eviction_candidates(cls, num):
+        """
+        Instances are removed from the weak cache as soon as they are not
+        used, so there is nothing to evict.
+
+        """
+        return []
+
 
 def flush_cache(**kwargs):
     """
@@ -546,6 +644,98 @@ def flush_cache(**kwargs):
     return gc.collect()
 
 
+def _get_dbmodels():
+    """
+    Get all db models with an idmapper cache. Proxies share the cache
+    of their db model, so each is only included once.
+
+    Returns:
+        list: The db models.
+
+    """
+    dbmodels = {}
+    for submodel in SharedMemoryModel.__subclasses__():
+        stack = [submodel]
+        while stack:
+            model = stack.pop()
+            if not model._meta.abstract:
+                dbmodels[model.__dbclass__] = True
+            stack.extend(model.__subclasses__())
+    return list(dbmodels)
+
+
+def _evict_instances(candidates):
+    """
+    Evict instances from the idmapper cache, except those that instances
+    staying in any cache have loaded foreign keys to (directly or through
+    other kept instances).
+
+    Args:
+        candidates (dict): `{dbmodel: [(key, instance), ...]}` to evict.
+
+    Returns:
+        int: The number of instances evicted.
+
+    """
+    evicting = {
+        id(instance) for model_candidates in candidates.values() for _, instance in model_candidates
+    }
+    if not evicting:
+        return 0
+    staying = [
+        instance
+        for dbmodel in _get_dbmodels()
+        for instance in list(dbmodel.__instance_cache__.values())
+        if id(instance) not in evicting
+    ]
+    keep = set()
+    while staying:
+        instance = staying.pop()
+        for related in instance._state.fields_cache.values():
+            if related is not None and id(related) in evicting and id(related) not in keep:
+                keep.add(id(related))
+                staying.append(related)
+
+    nevicted = 0
+    for dbmodel, model_candidates in candidates.items():
+        cache = dbmodel.__instance_cache__
+        for key, instance in model_candidates:
+            if id(instance) not in keep and cache.get(key) is instance:
+                del cache[key]
+                nevicted += 1
+    return nevicted
+
+
+def evict_cache(max_size):
+    """
+    Evict the least recently used instances from the idmapper cache until
+    it holds at most `max_size` instances (if possible). Each model's
+    cache is reduced by the same fraction. Unlike `flush_cache`, recently
+    used instances are kept, so the server doesn't have to reload them all
+    from the database.
+
+    Args:
+        max_size (int): The total number of instances to keep.
+
+    Returns:
+        int: The number of instances evicted.
+
+    """
+    dbmodels = {dbmodel: len(dbmodel.__instance_cache__) for dbmodel in _get_dbmodels()}
+    total = sum(dbmodels.values())
+    if total <= max_size:
+        return 0
+    fraction = 1.0 - max_size / total
+    nevicted = _evict_instances(
+        {
+            dbmodel: dbmodel.get_eviction_candidates(int(size * fraction + 0.5))
+            for dbmodel, size in dbmodels.items()
+        }
+    )
+    gc.collect()
+    return nevicted
+
+
 # request_finished.connect(flush_cache)
 post_migrate.connect(flush_cache)
 
@@ -580,9 +770,29 @@ post_save.connect(update_cached_instance)
 LAST_FLUSH = None
 
 
+def get_rss():
+    """
+    Get the resident memory used by this process.
+
+    Returns:
+        float or None: The resident memory in MB, or `None` if it
+            could not be determined on this platform.
+
+    """
+    try:
+        # Linux - the second value is the current resident size in pages
+        with open("/proc/self/statm") as fil:
+            return int(fil.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError, AttributeError):
+        # no /proc (e.g. macOS/Windows); getrusage only reports the peak
+        # memory, which never shrinks and would have us evict forever
+        return None
+
+
 def conditional_flush(max_rmem, force=False):
     """
-    Flush the cache if the estimated memory usage exceeds `max_rmem`.
+    Evict the least recently used part of the cache if the memory
+    usage exceeds `max_rmem`.
 
     The flusher has a timeout to avoid flushing over and over
     in particular situations (this means that for some setups
@@ -590,32 +800,14 @@ def conditional_flush(max_rmem, force=False):
     more memory is probably required for the given game).
 
     Args:
-        max_rmem (int): memory-usage estimation-treshold after which
-            cache is flushed.
+        max_rmem (int): memory-usage treshold (in MB) after which
+            the cache is trimmed.
         force (bool, optional): forces a flush, regardless of timeout.
             Defaults to `False`.
 
     """
     global LAST_FLUSH
 
-    def mem2cachesize(desired_rmem):
-        """
-        Estimate the size of the idmapper cache based on the memory
-        desired. This is used to optionally cap the cache size.
-
-        desired_rmem - memory in MB (minimum 50MB)
-
-        The formula is empirically estimated from usage tests (Linux)
-        and is
-            Ncache = RMEM - 35.0 / 0.0157
-        where RMEM is given in MB and Ncache is the size of the cache
-        for this memory usage. VMEM tends to be about 100MB higher
-        than RMEM for large memory usage.
-        """
-        vmem = max(desired_rmem, 50.0)
-        Ncache = int(abs(float(vmem) - 35.0) / 0.0157)
-        return Ncache
-
     if not max_rmem:
         # auto-flush is disabled
         return
@@ -634,21 +826,15 @@ def conditional_flush(max_rmem, force=False):
         )
         return
 
-    if os.name == "nt":
-        # we can't look for mem info in Windows at the moment
+    actual_rmem = get_rss()
+    if actual_rmem is None:
+        # we can't get memory info on this platform
         return
 
-    # check actual memory usage
-    Ncache_max = mem2cachesize(max_rmem)
-    Ncache, _ = cache_size()
-    actual_rmem = (
-        float(os.popen("ps -p %d -o %s | tail -1" % (os.getpid(), "rss")).read()) / 1000.0
-    )  # resident memory
-
-    if Ncache >= Ncache_max and actual_rmem > max_rmem * 0.9:
-        # flush cache when number of objects in cache is big enough and our
-        # actual memory use is within 10% of our set max
-        flush_cache()
+    if actual_rmem > max_rmem * 0.9:
+        # trim the cache when our actual memory use is within 10% of our set max
+        Ncache, _ = cache_size()
+        evict_cache(int(Ncache * (1.0 - AUTO_FLUSH_EVICT_FRACTION)))
         LAST_FLUSH = now
 
 
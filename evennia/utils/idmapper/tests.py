@@ -1,6 +1,9 @@
+from unittest import mock
+
 from django.db import models
 from django.test import TestCase
 
+from . import models as idmapper
 from .models import SharedMemoryModel
 
 
@@ -76,3 +79,53 @@ class SharedMemorysTest(TestCase):
         pk = article.pk
         article.delete()
         self.assertEqual(pk not in Article.__instance_cache__, True)
+
+    def testEviction(self):
+        articles = list(Article.objects.order_by("pk"))
+        # touch the first article so it's recently used
+        self.assertEqual(Article.get_cached_instance(articles[0].pk), articles[0])
+
+        self.assertEqual(Article.evict_instance_cache(3), 3)
+        self.assertEqual(
+            set(Article.__instance_cache__),
+            {article.pk for article in articles[4:] + articles[:1]},
+        )
+
+    def testEvictionKeepsRelated(self):
+        articles = list(Article.objects.all().select_related("category"))
+        category = articles[0].category
+        # the category is the least recently used, but articles staying in
+        # the cache still reference it
+        for article in articles:
+            Article.get_cached_instance(article.pk)
+        self.assertEqual(Category.evict_instance_cache(1), 0)
+        self.assertIs(Category.get_cached_instance(category.pk), category)
+        with mock.patch.object(Article, "at_idmapper_evict", lambda self: False):
+            idmapper.evict_cache(0)
+        self.assertIs(Category.get_cached_instance(category.pk), category)
+        idmapper.evict_cache(0)
+        self.assertIsNone(Category.get_cached_instance(category.pk))
+
+    def testEvictionPinned(self):
+        articles = list(Article.objects.order_by("pk"))
+        with mock.patch.object(
+            Article, "at_idmapper_evict", lambda self: self.pk != articles[1].pk
+        ):
+            self.assertEqual(Article.evict_instance_cache(2), 2)
+        self.assertNotIn(articles[0].pk, Article.__instance_cache__)
+        self.assertIn(articles[1].pk, Article.__instance_cache__)
+        self.assertNotIn(articles[2].pk, Article.__instance_cache__)
+
+    def testEvictCache(self):
+        list(Article.objects.all())
+        total, _ = idmapper.cache_size()
+        self.assertEqual(idmapper.evict_cache(total), 0)
+        # other tests may leave instances refusing eviction in the cache
+        self.assertGreaterEqual(idmapper.evict_cache(0), 10)
+        self.assertFalse(Article.__instance_cache__)
+
+    def testGetRss(self):
+        rss = idmapper.get_rss()
+        self.assertGreater(rss, 1)
+        with mock.patch("builtins.open", side_effect=OSError):
+            self.assertIsNone(idmapper.get_rss())
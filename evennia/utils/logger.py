@@ -6,7 +6,8 @@ are all directed either to stdout (if Evennia is running in
 interactive mode) or to $GAME_DIR/server/logs.
 
 The log_file() function uses its own threading system to log to
-arbitrary files in $GAME_DIR/server/logs.
+arbitrary files in $GAME_DIR/server/logs. Lines are queued in memory
+and written in batches, to avoid a thread job per line.
 
 Note: All logging functions have two aliases, log_type() and
 log_typemsg(). This is for historical, back-compatible reasons.
@@ -15,6 +16,7 @@ log_typemsg(). This is for historical, back-compatible reasons.
 
 
 import os
+import threading
 import time
 from datetime import datetime
 from traceback import format_exc
@@ -33,6 +35,13 @@ _CHANNEL_LOG_NUM_TAIL_LINES = None
 
 _TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# log_file() writes a file's queued lines when they reach this size (in characters)
+# or have waited this many seconds, whichever comes first
+_LOG_FILE_BUFFER_SIZE = 64 * 1024
+_LOG_FILE_FLUSH_INTERVAL = 1.0
+# block size for reading log files backwards
+_LOG_FILE_TAIL_BLOCK_SIZE = 8192
+
 
 def _log(msg, logfunc, prefix="", **kwargs):
     try:
@@ -398,11 +407,23 @@ class EvenniaLogFile(logfile.LogFile):
         if not append_tail:
             logfile.LogFile.rotate(self)
             return
-        lines = tail_log_file(self.path, 0, self.num_lines_to_append)
+        lines = _tail_file(self, 0, append_tail)
         super().rotate()
         for line in lines:
             self.write(line)
 
+    def read(self, *args, **kwargs):
+        """
+        Convenience method for accessing our _file attribute's read method,
+        which is used in tail_log_function.
+
+        Args:
+            *args: Same args as file.read
+            **kwargs: Same kwargs as file.read
+
+        """
+        return self._file.read(*args, **kwargs)
+
     def seek(self, *args, **kwargs):
         """
         Convenience method for accessing our _file attribute's seek method,
@@ -486,9 +507,145 @@ def _open_log_file(filename):
     return None
 
 
+class _LogFileWriter:
+    """
+    Queues up lines to write to one log file, and writes them in batches
+    in a thread. Batches are written in the order they were queued, also
+    when some are written directly, so lines stay in order.
+
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.queue = []
+        self.queued_size = 0
+        # batches taken from the queue but not yet written, in order
+        self.pending = []
+        # guards the pending batches and the file handle, which are used from
+        # several threads
+        self.lock = threading.Lock()
+        self.flush_call = None
+        self.writing = False
+
+    def add(self, line):
+        """
+        Queue a line for writing.
+
+        Args:
+            line (str): The line to write.
+
+        """
+        self.queue.append(line)
+        self.queued_size += len(line)
+        self._schedule()
+
+    def _schedule(self):
+        """
+        Write the queue if it's big enough, otherwise make sure it will be
+        written after a short while.
+
+        """
+        if self.writing:
+            # the queue is handled when the current write is done
+            return
+        if self.queued_size >= _LOG_FILE_BUFFER_SIZE:
+            self.flush()
+        elif not (self.flush_call and self.flush_call.active()):
+            from twisted.internet import reactor
+
+            self.flush_call = reactor.callLater(_LOG_FILE_FLUSH_INTERVAL, self.flush)
+
+    def _write(self, filehandle):
+        """
+        Write all pending batches to the file and flush the result (may run
+        in a thread). If a direct write already wrote them, this does nothing.
+
+        """
+        with self.lock:
+            if not self.pending:
+                return
+            data = "".join(self.pending)
+            self.pending = []
+            filehandle.write(data)
+            # since we don't close the handle, we need to flush
+            # manually or log file won't be written to until the
+            # write buffer is full.
+            filehandle.flush()
+
+    def _write_done(self, _):
+        self.writing = False
+        if self.queue:
+            self._schedule()
+
+    def flush(self, sync=False):
+        """
+        Write all queued lines.
+
+        Args:
+            sync (bool, optional): Write directly instead of in a thread. This
+                also writes any batch still waiting for its thread, so all
+                lines are written in order.
+
+        """
+        if self.flush_call:
+            if self.flush_call.active():
+                self.flush_call.cancel()
+            self.flush_call = None
+        if self.queue and (sync or not self.writing):
+            data = "".join(self.queue)
+            self.queue = []
+            self.queued_size = 0
+            with self.lock:
+                self.pending.append(data)
+        elif not (sync and self.pending):
+            return
+        # save to server/logs/ directory
+        filehandle = _open_log_file(self.filename)
+        if not filehandle:
+            return
+        if sync:
+            self._write(filehandle)
+        else:
+
+            def errback(failure):
+                """Catching errors to normal log"""
+                log_trace()
+
+            self.writing = True
+            deferToThread(self._write, filehandle).addErrback(errback).addBoth(self._write_done)
+
+
+_LOG_FILE_WRITERS = {}
+
+
+def _flush_log_files():
+    """
+    Write all queued log_file lines directly. Called at shutdown.
+
+    """
+    for writer in _LOG_FILE_WRITERS.values():
+        writer.flush(sync=True)
+
+
+def _get_log_file_writer(filename):
+    """
+    Get the writer for a log file, creating it if needed.
+
+    """
+    writer = _LOG_FILE_WRITERS.get(filename)
+    if not writer:
+        if not _LOG_FILE_WRITERS:
+            from twisted.internet import reactor
+
+            reactor.addSystemEventTrigger("before", "shutdown", _flush_log_files)
+        writer = _LOG_FILE_WRITERS[filename] = _LogFileWriter(filename)
+    return writer
+
+
 def log_file(msg, filename="game.log"):
     """
-    Arbitrary file logger using threads.
+    Arbitrary file logger using threads. Lines are queued and
+    written in batches.
 
     Args:
         msg (str): String to append to logfile.
@@ -497,24 +654,18 @@ def log_file(msg, filename="game.log"):
             on new lines following datetime info.
 
     """
+    _get_log_file_writer(filename).add("\n%s [-] %s" % (timeformat(), msg.strip()))
 
-    def callback(filehandle, msg):
-        """Writing to file and flushing result"""
-        msg = "\n%s [-] %s" % (timeformat(), msg.strip())
-        filehandle.write(msg)
-        # since we don't close the handle, we need to flush
-        # manually or log file won't be written to until the
-        # write buffer is full.
-        filehandle.flush()
 
-    def errback(failure):
-        """Catching errors to normal log"""
-        log_trace()
+def log_file_queues():
+    """
+    Get the number of lines waiting to be written by `log_file`.
 
-    # save to server/logs/ directory
-    filehandle = _open_log_file(filename)
-    if filehandle:
-        deferToThread(callback, filehandle, msg).addErrback(errback)
+    Returns:
+        dict: A mapping `{filename: num_lines, ...}`.
+
+    """
+    return {filename: len(writer.queue) for filename, writer in _LOG_FILE_WRITERS.items()}
 
 
 def log_file_exists(filename="game.log"):
@@ -550,9 +701,12 @@ def rotate_log_file(filename="game.log", num_lines_to_append=None):
 
     """
     if log_file_exists(filename):
+        writer = _get_log_file_writer(filename)
+        writer.flush(sync=True)
         file_handle = _open_log_file(filename)
         if file_handle:
-            file_handle.rotate(num_lines_to_append=num_lines_to_append)
+            with writer.lock:
+                file_handle.rotate(num_lines_to_append=num_lines_to_append)
 
 
 def delete_log_file(filename):
@@ -573,6 +727,49 @@ def delete_log_file(filename):
         os.remove(filename)
 
 
+def _tail_file(filehandle, offset, nlines):
+    """
+    Read lines from the end of an open log file. The file is read backwards in
+    blocks until enough lines are found, so only the end of the file is read.
+
+    Args:
+        filehandle (EvenniaLogFile): The log file.
+        offset (int): The line offset from the end of the file.
+        nlines (int): How many lines to return, counting backwards from the offset.
+
+    Returns:
+        list: The lines found.
+
+    """
+    nwanted = offset + nlines
+    end = filehandle.seek(0, os.SEEK_END)
+    if end:
+        filehandle.seek(end - 1)
+        if filehandle.read(1) == b"\n":
+            # a final newline doesn't start a new line
+            end -= 1
+    # find where the lines we want start, by counting newlines from the end
+    start = 0
+    pos = end
+    while pos > 0 and nwanted > 0:
+        size = min(_LOG_FILE_TAIL_BLOCK_SIZE, pos)
+        pos -= size
+        filehandle.seek(pos)
+        block = filehandle.read(size)
+        ind = size
+        while nwanted > 0:
+            ind = block.rfind(b"\n", 0, ind)
+            if ind < 0:
+                break
+            nwanted -= 1
+            if not nwanted:
+                start = pos + ind + 1
+    filehandle.seek(start)
+    lines = filehandle.readlines()
+    # return the right number of lines
+    return lines[-nlines - offset : -offset if offset else None]
+
+
 def tail_log_file(filename, offset, nlines, callback=None):
     """
     Return the tail of the log file.
@@ -596,23 +793,9 @@ def tail_log_file(filename, offset, nlines, callback=None):
     """
 
     def seek_file(filehandle, offset, nlines, callback):
-        """step backwards in chunks and stop only when we have enough lines"""
-        lines_found = []
-        buffer_size = 4098
-        block_count = -1
-        while len(lines_found) < (offset + nlines):
-            try:
-                # scan backwards in file, starting from the end
-                filehandle.seek(block_count * buffer_size, os.SEEK_END)
-            except IOError:
-                # file too small for this seek, take what we've got
-                filehandle.seek(0)
-                lines_found = filehandle.readlines()
-                break
-            lines_found = filehandle.readlines()
-            block_count -= 1
-        # return the right number of lines
-        lines_found = lines_found[-nlines - offset : -offset if offset else None]
+        """read the lines from the end of the file"""
+        with writer.lock:
+            lines_found = _tail_file(filehandle, offset, nlines)
         if callback:
             callback(lines_found)
             return None
@@ -623,6 +806,9 @@ def tail_log_file(filename, offset, nlines, callback=None):
         """Catching errors to normal log"""
         log_trace()
 
+    # make sure recently logged lines are included
+    writer = _get_log_file_writer(filename)
+    writer.flush(sync=True)
     filehandle = _open_log_file(filename)
     if filehandle:
         if callback:
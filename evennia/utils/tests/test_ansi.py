@@ -6,8 +6,12 @@ Test of the ANSI parsing and ANSIStrings.
 
 """
 
+from collections import OrderedDict
+from unittest.mock import patch
+
 from django.test import TestCase
 
+from evennia.utils import ansi
 from evennia.utils.ansi import ANSIString as AN
 
 
@@ -52,3 +56,61 @@ class TestANSIString(TestCase):
         self.assertEqual(split2, split3, "Split 2 and 3 differ")
         self.assertEqual(split1, split2, "Split 1 and 2 differ")
         self.assertEqual(split1, split3, "Split 1 and 3 differ")
+
+    def test_lazy_indexes(self):
+        """Index tables are only calculated when needed, and kept by slices"""
+        anstr = AN("|rHello |gworld|n")
+        self.assertIsNone(anstr._char_idx)
+        self.assertEqual(list(range(9, 15)) + list(range(24, 29)), list(anstr._char_indexes))
+        self.assertEqual("I", anstr._code_indexes.typecode)
+
+        sliced = anstr[3:8]
+        self.assertIsNotNone(sliced._char_idx)
+        self.assertEqual("lo wo", sliced.clean())
+        self.assertEqual(sliced._char_indexes, AN(sliced.raw(), decoded=True)._char_indexes)
+
+    def test_mul(self):
+        anstr = AN("|rab") * 3
+        self.assertEqual("ababab", anstr.clean())
+        self.assertEqual([9, 10, 20, 21, 31, 32], list(anstr._char_indexes))
+        self.assertEqual(27, len(anstr._code_indexes))
+
+
+class TestParseCache(TestCase):
+    """
+    Test the LRU cache of parsed ansi strings.
+
+    """
+
+    def setUp(self):
+        self.cache = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.patches = [
+            patch.object(ansi, "_PARSE_CACHE", self.cache),
+            patch.object(ansi, "_PARSE_CACHE_STATS", self.stats),
+            patch.object(ansi, "_PARSE_CACHE_SIZE", 2),
+        ]
+        for patcher in self.patches:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patches:
+            patcher.stop()
+
+    def test_lru(self):
+        ansi.parse_ansi("|rfoo")
+        ansi.parse_ansi("|rbar")
+        ansi.parse_ansi("|rfoo")
+        ansi.parse_ansi("|rbaz")
+        self.assertEqual(["|rfoo", "|rbaz"], [key[0] for key in self.cache])
+        self.assertEqual(
+            {"size": 2, "max_size": 2, "hits": 1, "misses": 3, "evictions": 1},
+            ansi.parse_cache_stats(),
+        )
+
+    def test_profiles(self):
+        self.assertEqual("\x1b[1m\x1b[31mfoo", ansi.parse_ansi("|rfoo"))
+        self.assertEqual("foo", ansi.strip_ansi("|rfoo"))
+        self.assertEqual("\x1b[1m\x1b[31mfoo", ansi.parse_ansi("|rfoo"))
+        self.assertEqual("foo", ansi.strip_ansi("|rfoo"))
+        self.assertEqual(2, self.stats["hits"])
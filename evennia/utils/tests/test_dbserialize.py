@@ -3,9 +3,11 @@ Tests for dbserialize module
 """
 
 from collections import defaultdict, deque
+from unittest.mock import patch
 
 from django.test import TestCase
 from evennia.objects.objects import DefaultObject
+from evennia.typeclasses.attributes import Attribute
 from evennia.utils import dbserialize
 from parameterized import parameterized
 
@@ -127,6 +129,86 @@ class TestDbSerialize(TestCase):
         self.obj.db.test.append(2)
         self.assertEqual(list(self.obj.db.test), [2])
 
+    def test_lazy_nested_savers(self):
+        self.obj.db.test = {"a": [1, 2], "b": {"c": 1}, "d": [[1], [2]]}
+        value = self.obj.attributes.get("test", return_obj=True).value
+        # flat nested mutables are converted on first access
+        self.assertIs(list, type(value._data["a"]))
+        self.assertEqual({"a": [1, 2], "b": {"c": 1}, "d": [[1], [2]]}, value)
+
+        value["a"].append(3)
+        self.assertIsInstance(value._data["a"], dbserialize._SaverList)
+        value["b"]["c"] += 1
+        self.assertIsInstance(value._data["b"], dbserialize._SaverDict)
+        for lst in value["d"]:
+            lst.append(0)
+        self.assertEqual({"a": [1, 2, 3], "b": {"c": 2}, "d": [[1, 0], [2, 0]]}, self.obj.db.test)
+        self.obj.db.test["d"][1:][0].append(3)
+        self.assertEqual([2, 0, 3], self.obj.db.test["d"][1])
+        self.assertEqual([[1, 0], [2, 0, 3]], self.obj.db.test["d"].deserialize())
+
+    def test_to_from_pickle(self):
+        data = {"a": [1, 2], "b": (1, "2"), "c": {"d": [self.obj, None]}, "e": {1.0, True}}
+        pickled = dbserialize.to_pickle(data)
+        self.assertEqual(data["a"], pickled["a"])
+        self.assertIsNot(data["a"], pickled["a"])
+        self.assertEqual(("__packed_dbobj__", ("objects", "objectdb")), pickled["c"]["d"][0][:2])
+        unpickled = dbserialize.from_pickle(pickled)
+        self.assertEqual(data, unpickled)
+        self.assertIsNot(pickled["a"], unpickled["a"])
+
+    def _db_value(self, key):
+        # the value stored in the database, bypassing the idmapper cache
+        attr = self.obj.attributes.get(key, return_obj=True)
+        return Attribute.objects.filter(id=attr.id).values_list("db_value", flat=True)[0]
+
+    def test_batch_saves(self):
+        self.obj.db.test = {"a": [1], "b": 2}
+        self.obj.db.test2 = [1]
+        with dbserialize.batch_saves():
+            with self.assertNumQueries(0):
+                self.obj.db.test["a"].append(2)
+                self.obj.db.test["b"] += 1
+                self.obj.db.test2.append(2)
+                self.assertEqual(self.obj.db.test, {"a": [1, 2], "b": 3})
+            self.assertEqual({"a": [1], "b": 2}, self._db_value("test"))
+            with dbserialize.batch_saves():
+                self.obj.db.test2.append(3)
+            self.assertEqual([1], self._db_value("test2"))
+            # one update for all Attributes
+            with self.assertNumQueries(1):
+                dbserialize.flush_saves()
+
+        self.assertEqual({"a": [1, 2], "b": 3}, self._db_value("test"))
+        self.assertEqual([1, 2, 3], self._db_value("test2"))
+
+    def test_batch_saves_assign(self):
+        self.obj.db.test = [1]
+        with dbserialize.batch_saves():
+            self.obj.db.test.append(2)
+            self.obj.db.test = [3]
+            self.assertEqual([3], self._db_value("test"))
+            self.obj.db.test.append(4)
+            self.obj.attributes.remove("test")
+        self.assertEqual(None, self.obj.db.test)
+
+    @patch("twisted.internet.reactor.addSystemEventTrigger")
+    @patch("twisted.internet.reactor.callLater")
+    @patch("twisted.internet.reactor.running", True, create=True)
+    @patch("evennia.utils.dbserialize._COALESCE_SAVES", True)
+    @patch("evennia.utils.dbserialize._PENDING_FLUSH_CALL", None)
+    @patch("evennia.utils.dbserialize._FLUSH_ON_SHUTDOWN", False)
+    def test_coalesce_saves(self, mock_calllater, mock_trigger):
+        self.obj.db.test = []
+        for inum in range(10):
+            self.obj.db.test.append(inum)
+        mock_calllater.assert_called_once_with(0, dbserialize.flush_saves)
+        self.assertEqual(list(range(10)), self.obj.db.test)
+        self.assertEqual([], self._db_value("test"))
+
+        dbserialize.flush_saves()
+        self.assertEqual(list(range(10)), self._db_value("test"))
+
 
 class _InvalidContainer:
     """Container not saveable in Attribute (if obj is dbobj, it 'hides' it)"""
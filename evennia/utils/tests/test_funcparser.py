@@ -393,6 +393,69 @@ class TestFuncParser(TestCase):
         ret = parser.parse("This is a $foo(foo=moo) string", foo="bar")
         self.assertEqual("This is a _test(test=foo, foo=bar) string", ret)
 
+    @parameterized.expand(
+        [
+            ("Test normal string",),
+            ("Test noargs4 $foo(), $bar() and $foo",),
+            ("$foo() Test noargs5",),
+            (r'Test kwarg1 $bar(foo=1, bar="foo", too=ere)',),
+            ("Test nest2 $foo(bar,$repl(a),$repl()=$repl(),a=b) etc",),
+            ("Test escape1 \\$repl(foo)",),
+            ("Test escape4 $$foo() and $$bar(a,b), $repl()",),
+            ("Test malformed2 This is $foo( and  $bar()",),
+            ("Test malformed5 This is $foo(a=b, and $repl()",),
+            ("Test nonstr 4x2 = $double(4)",),
+            ("Test missing $foobar(1, x) $foo()",),
+            ("Test null \x00 char $foo()",),
+            ("$double(4)",),
+            ("$lit([1,2,3])",),
+            ("$foo()$bar()",),
+        ]
+    )
+    def test_compile(self, string):
+        """
+        Test so a compiled string parses the same as the raw string.
+
+        """
+        compiled = self.parser.compile(string)
+        for kwargs in (
+            {},
+            {"escape": True},
+            {"strip": True},
+            {"return_str": False},
+            {"test": "bar"},
+        ):
+            self.assertEqual(self.parser.parse(string, **kwargs), compiled.parse(**kwargs))
+            self.assertEqual(
+                self.parser.parse(string, **kwargs), self.parser.parse(compiled, **kwargs)
+            )
+
+    def test_compile_nested_fallback(self):
+        """
+        Nested calls can't be compiled but should still parse.
+
+        """
+        compiled = self.parser.compile("Test $foo($bar(a)) $repl()")
+        self.assertIsNone(compiled.parts)
+        self.assertEqual("Test _test(_test(a)) rr", compiled.parse())
+
+        compiled = self.parser.compile("Test $foo(a) $repl()")
+        self.assertEqual(["Test ", 0, " ", 1], compiled.parts)
+
+    def test_compile_memo(self):
+        """
+        Test re-using results of calls between parses.
+
+        """
+        callables = {"count": MagicMock(return_value="a"), "other": MagicMock(return_value="b")}
+        parser = funcparser.FuncParser(callables)
+        compiled = parser.compile("$count() $other() $count()")
+        memo = {}
+        for _ in range(3):
+            self.assertEqual("a b a", compiled.parse(memo=memo, memoize=("count",)))
+        self.assertEqual(2, callables["count"].call_count)
+        self.assertEqual(3, callables["other"].call_count)
+
 
 class _DummyObj:
     def __init__(self, name):
@@ -507,6 +570,54 @@ class TestDefaultCallables(TestCase):
         ret = self.parser.parse(string, caller=self.obj1, capitalize=True, raise_errors=True)
         self.assertEqual("Char1 smiles at It", ret)
 
+    def test_compile_cache(self):
+        """
+        Re-parsing typical actor-stance strings should only tokenize them
+        once and give the same result as parsing them from scratch.
+
+        """
+        strings = (
+            "$You() $conj(smile) at $you(char2) and $pron(your) friend.",
+            "$You() $conj(pick) up the sword and $conj(wield) it in $pron(your,m) hand.",
+            "The door slams shut behind $you().",
+        )
+        kwargs = {
+            "caller": self.obj1,
+            "receiver": self.obj2,
+            "mapping": {"char2": self.obj2},
+            "raise_errors": True,
+        }
+
+        with patch.object(funcparser, "_COMPILE_CACHE", funcparser.OrderedDict()), patch.object(
+            self.parser, "_compile", wraps=self.parser._compile
+        ) as mock_compile:
+            for _ in range(3):
+                for string in strings:
+                    self.assertEqual(
+                        self.parser._parse(string, self.parser.execute, **kwargs),
+                        self.parser.parse(string, **kwargs),
+                    )
+            self.assertEqual(mock_compile.call_count, len(strings))
+
+    def test_compile_cache_lru(self):
+        """
+        Test the compile-cache drops the least recently used strings.
+
+        """
+        cache = funcparser.OrderedDict()
+        with patch.object(funcparser, "_COMPILE_CACHE", cache), patch.object(
+            funcparser, "_COMPILE_CACHE_SIZE", 2
+        ):
+            self.parser.parse("$You() 1", caller=self.obj1, receiver=self.obj1)
+            self.parser.parse("$You() 2", caller=self.obj1, receiver=self.obj1)
+            self.parser.parse("$You() 1", caller=self.obj1, receiver=self.obj1)
+            self.parser.parse("$You() 3", caller=self.obj1, receiver=self.obj1)
+            self.assertEqual(["$You() 1", "$You() 3"], [key[0] for key in cache])
+            # a parser with other callables does not share cached strings
+            funcparser.FuncParser(funcparser.FUNCPARSER_CALLABLES).parse("$You() 3")
+            self.assertEqual(2, len(cache))
+            self.assertEqual(["$You() 3", "$You() 3"], [key[0] for key in cache])
+
     @parameterized.expand(
         [
             ("Test $pad(Hello, 20, c, -) there", "Test -------Hello-------- there"),
@@ -0,0 +1,103 @@
+"""
+Unit tests for the file logging of the evennia.utils.logger module.
+"""
+
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from evennia.utils import logger
+
+
+class TestLogFile(TestCase):
+    def setUp(self):
+        self.logdir = tempfile.mkdtemp()
+        self.patcher = patch.multiple(
+            logger,
+            _LOGDIR=self.logdir,
+            _LOG_ROTATE_SIZE=1000000,
+            _LOG_FILE_HANDLES={},
+            _LOG_FILE_HANDLE_COUNTS={},
+            _LOG_FILE_WRITERS={},
+        )
+        self.patcher.start()
+
+    def tearDown(self):
+        for filehandle in logger._LOG_FILE_HANDLES.values():
+            filehandle.close()
+        self.patcher.stop()
+        shutil.rmtree(self.logdir)
+
+    def _write(self, filename, text):
+        with open(f"{self.logdir}/{filename}", "w") as fil:
+            fil.write(text)
+
+    @patch("twisted.internet.reactor.addSystemEventTrigger")
+    @patch("twisted.internet.reactor.callLater")
+    def test_log_file_queue(self, mock_calllater, mock_trigger):
+        logger.log_file("line 1", "test.log")
+        logger.log_file("line 2 ", "test.log")
+        self.assertEqual({"test.log": 2}, logger.log_file_queues())
+        # one delayed write for the whole queue
+        mock_calllater.assert_called_once()
+        mock_trigger.assert_called_once()
+
+        logger._flush_log_files()
+        self.assertEqual({"test.log": 0}, logger.log_file_queues())
+        lines = logger.tail_log_file("test.log", 0, 10)
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[1].endswith(" [-] line 1\n"))
+        self.assertTrue(lines[2].endswith(" [-] line 2"))
+
+    @patch("twisted.internet.reactor.addSystemEventTrigger")
+    @patch("evennia.utils.logger.deferToThread")
+    def test_log_file_buffer_size(self, mock_defer, mock_trigger):
+        with patch.object(logger, "_LOG_FILE_BUFFER_SIZE", 50):
+            for i in range(5):
+                logger.log_file(f"line {i}", "test.log")
+        # the queue is written in one go when it's big enough
+        mock_defer.assert_called_once()
+        self.assertEqual({"test.log": 3}, logger.log_file_queues())
+
+    @patch("twisted.internet.reactor.addSystemEventTrigger")
+    @patch("twisted.internet.reactor.callLater")
+    @patch("evennia.utils.logger.deferToThread")
+    def test_log_file_sync_flush_order(self, mock_defer, mock_calllater, mock_trigger):
+        logger.log_file("line 1", "test.log")
+        logger._get_log_file_writer("test.log").flush()
+        # the threaded write of line 1 has not happened yet
+        mock_defer.assert_called_once()
+        logger.log_file("line 2", "test.log")
+        lines = logger.tail_log_file("test.log", 0, 10)
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[1].endswith(" [-] line 1\n"))
+        self.assertTrue(lines[2].endswith(" [-] line 2"))
+        # the delayed thread-write finds nothing left to write
+        write, *args = mock_defer.call_args[0]
+        write(*args)
+        self.assertEqual(lines, logger.tail_log_file("test.log", 0, 10))
+
+    @patch("twisted.internet.reactor.addSystemEventTrigger")
+    def test_tail_log_file(self, mock_trigger):
+        lines = [f"line {i}\n" for i in range(2000)]
+        self._write("test.log", "".join(lines))
+        with patch.object(logger, "_LOG_FILE_TAIL_BLOCK_SIZE", 64):
+            self.assertEqual(lines[-5:], logger.tail_log_file("test.log", 0, 5))
+            self.assertEqual(lines[-15:-10], logger.tail_log_file("test.log", 10, 5))
+            self.assertEqual(lines[:3], logger.tail_log_file("test.log", 1997, 5))
+            self.assertEqual(lines, logger.tail_log_file("test.log", 0, 5000))
+
+    @patch("twisted.internet.reactor.addSystemEventTrigger")
+    def test_tail_log_file_no_final_newline(self, mock_trigger):
+        self._write("test.log", "\nfirst\nsecond\nthird")
+        self.assertEqual(["second\n", "third"], logger.tail_log_file("test.log", 0, 2))
+        self.assertEqual(["\n", "first\n"], logger.tail_log_file("test.log", 2, 2))
+        self._write("empty.log", "")
+        self.assertEqual([], logger.tail_log_file("empty.log", 0, 2))
+
+    @patch("twisted.internet.reactor.addSystemEventTrigger")
+    def test_rotate_log_file(self, mock_trigger):
+        self._write("test.log", "\nfirst\nsecond\nthird")
+        logger.rotate_log_file("test.log", num_lines_to_append=2)
+        self.assertEqual(["second\n", "third"], logger.tail_log_file("test.log", 0, 5))
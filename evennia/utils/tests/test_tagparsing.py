@@ -24,8 +24,8 @@ class ANSIStringTestCase(TestCase):
         """
         Verifies the indexes in an ANSIString match what they should.
         """
-        self.assertEqual(ansi._char_indexes, char)
-        self.assertEqual(ansi._code_indexes, code)
+        self.assertEqual(list(ansi._char_indexes), char)
+        self.assertEqual(list(ansi._code_indexes), code)
 
     def test_instance(self):
         """
@@ -704,6 +704,63 @@ class TestDelay(BaseEvenniaTest):
         )  # Clock must advance to trigger, even if past timedelay
         self.assertEqual(self.char1.ndb.dummy_var, "dummy_func ran")
 
+    def test_task_order(self):
+        # all tasks share one timer and are called in order
+        called = []
+        delays = list(range(1, 101))
+        random.shuffle(delays)
+        tasks = [utils.delay(delay, called.append, delay) for delay in delays]
+        tasks[0].cancel()
+        self.assertEqual(len(_TASK_HANDLER.clock.getDelayedCalls()), 1)
+        _TASK_HANDLER.clock.advance(50)
+        self.assertEqual(called, [delay for delay in range(1, 51) if delay != delays[0]])
+        _TASK_HANDLER.clock.advance(50)
+        self.assertEqual(len(called), 99)
+        self.assertFalse(_TASK_HANDLER.clock.getDelayedCalls())
+
+    def test_persistent_rows(self):
+        # each persistent task is stored in its own row
+        from evennia.server.models import ServerConfig
+
+        def _stored():
+            return set(
+                ServerConfig.objects.filter(db_key__startswith="delayed_task_").values_list(
+                    "db_key", flat=True
+                )
+            )
+
+        t1 = utils.delay(self.timedelay, dummy_func, self.char1.dbref, persistent=True)
+        t2 = utils.delay(self.timedelay * 2, dummy_func, self.char1.dbref, persistent=True)
+        utils.delay(self.timedelay, dummy_func, self.char1.dbref)
+        self.assertFalse(_stored())
+        _TASK_HANDLER.clock.advance(0)
+        self.assertEqual(_stored(), {f"delayed_task_{t1.get_id()}", f"delayed_task_{t2.get_id()}"})
+        _TASK_HANDLER.clock.advance(self.timedelay)
+        self.assertEqual(_stored(), {f"delayed_task_{t2.get_id()}"})
+        t2.remove()
+        _TASK_HANDLER.save()
+        self.assertFalse(_stored())
+
+    def test_canceled_tasks_leave_heap(self):
+        # the heap is rebuilt once half of it is canceled tasks
+        _TASK_HANDLER.clear(save=False)
+        called = []
+        tasks = [utils.delay(delay, called.append, delay) for delay in range(1, 11)]
+        for t in tasks[:5]:
+            t.cancel()
+        self.assertEqual(len(_TASK_HANDLER._heap), 10)
+        tasks[5].cancel()
+        self.assertEqual(len(_TASK_HANDLER._heap), 4)
+        _TASK_HANDLER.clock.advance(10)
+        self.assertEqual(called, [7, 8, 9, 10])
+        self.assertFalse(_TASK_HANDLER._heap)
+
+    def test_clear_cancels_save(self):
+        utils.delay(self.timedelay, dummy_func, self.char1.dbref, persistent=True)
+        self.assertEqual(len(_TASK_HANDLER.clock.getDelayedCalls()), 2)
+        _TASK_HANDLER.clear()
+        self.assertFalse(_TASK_HANDLER.clock.getDelayedCalls())
+
 
 class TestIntConversions(TestCase):
     def test_int2str(self):